@@ -8,13 +8,69 @@ wide variety of small projects.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import inspect
-from typing import Any, Callable, Dict, Iterable, List
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Set,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+DispatchMode = Literal["gather", "queue"]
+OverflowPolicy = Literal["block", "drop_oldest", "reject"]
+
+
+class _TopicNode:
+    """Single level of the topic trie used by :class:`EventBus`."""
+
+    __slots__ = ("children", "subs")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TopicNode] = {}
+        self.subs: List[_Subscription] = []
+
+
+class _Subscription:
+    """Subscriber registered for a topic ``pattern``."""
+
+    __slots__ = ("pattern", "fn", "seq")
+
+    def __init__(self, pattern: str, fn: Callable[[dict], Any], seq: int) -> None:
+        self.pattern = pattern
+        self.fn = fn
+        self.seq = seq
 
 
 class EventBus:
     """Very small in-memory pub/sub bus.
 
+    Topics are dot separated (``Project.MaterialsNeeded.Resolved``) and
+    subscriptions may use two wildcards: ``*`` matches exactly one segment
+    while ``#`` matches zero or more segments. ``Project.*`` therefore receives
+    ``Project.MaterialsNeeded`` and ``Project.#`` additionally receives
+    ``Project`` and ``Project.MaterialsNeeded.Resolved``.
+
+    Subscriptions are stored in a trie and the resolved subscriber list for
+    every published topic is cached until the next :meth:`subscribe` or
+    :meth:`unsubscribe` call, so publishing stays cheap regardless of how many
+    patterns are registered. Subscribers are always called in the order they
+    subscribed.
+
     Example
     -------
     >>> bus = EventBus()
@@ -25,32 +81,367 @@ class EventBus:
     [{'msg': 'hi'}]
     """
 
+    #: Maximum number of distinct topics kept in the resolution cache.
+    cache_size = 4096
+
     def __init__(self) -> None:
-        self._subs: Dict[str, List[Callable[[dict], Any]]] = {}
+        self._root = _TopicNode()
+        self._seq = 0
+        self._cache: Dict[str, Tuple[_Subscription, ...]] = {}
 
     def subscribe(self, topic: str, fn: Callable[[dict], Any]) -> None:
-        """Register ``fn`` to be called when ``topic`` is published."""
-        self._subs.setdefault(topic, []).append(fn)
+        """Register ``fn`` to be called when ``topic`` is published.
+
+        ``topic`` may contain ``*`` and ``#`` wildcard segments.
+        """
+        node = self._root
+        for part in topic.split("."):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _TopicNode()
+            node = child
+        self._seq += 1
+        node.subs.append(_Subscription(topic, fn, self._seq))
+        self._cache.clear()
+
+    def unsubscribe(self, topic: str, fn: Callable[[dict], Any]) -> bool:
+        """Remove ``fn`` from ``topic``.
+
+        ``topic`` must be the exact pattern passed to :meth:`subscribe`.
+        Returns ``True`` if a subscription was removed.
+        """
+        return self._remove(topic, fn) is not None
+
+    def _remove(self, topic: str, fn: Callable[[dict], Any]) -> _Subscription | None:
+        """Detach and return the subscription of ``fn`` on ``topic``."""
+        path = [self._root]
+        for part in topic.split("."):
+            child = path[-1].children.get(part)
+            if child is None:
+                return None
+            path.append(child)
+        node = path[-1]
+        for idx, sub in enumerate(node.subs):
+            if sub.fn == fn:
+                del node.subs[idx]
+                break
+        else:
+            return None
+        self._cache.clear()
+        # prune empty branches so the trie does not grow without bound
+        parts = topic.split(".")
+        for depth in range(len(parts), 0, -1):
+            child = path[depth]
+            if child.subs or child.children:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+        return sub
+
+    def _match(
+        self, node: _TopicNode, parts: List[str], idx: int, out: List[_Subscription]
+    ) -> None:
+        """Collect subscriptions below ``node`` matching ``parts[idx:]``."""
+        multi = node.children.get("#")
+        if multi is not None:
+            # ``#`` may swallow any number of the remaining segments
+            for start in range(idx, len(parts) + 1):
+                self._match(multi, parts, start, out)
+        if idx == len(parts):
+            out.extend(node.subs)
+            return
+        exact = node.children.get(parts[idx])
+        if exact is not None:
+            self._match(exact, parts, idx + 1, out)
+        single = node.children.get("*")
+        if single is not None:
+            self._match(single, parts, idx + 1, out)
+
+    def _resolve(self, topic: str) -> Tuple[_Subscription, ...]:
+        """Return subscriptions matching ``topic`` in subscription order."""
+        subs = self._cache.get(topic)
+        if subs is None:
+            found: List[_Subscription] = []
+            self._match(self._root, topic.split("."), 0, found)
+            # a subscription reachable via several ``#`` expansions is only
+            # delivered once
+            unique = {sub.seq: sub for sub in found}
+            subs = tuple(unique[seq] for seq in sorted(unique))
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[topic] = subs
+        return subs
+
+    def subscribers(self, topic: str) -> List[Callable[[dict], Any]]:
+        """Return the callables that would receive an event on ``topic``."""
+        return [sub.fn for sub in self._resolve(topic)]
 
     def publish(self, topic: str, payload: dict) -> None:
         """Synchronously notify all subscribers of ``topic``."""
-        for fn in self._subs.get(topic, []):
-            fn(payload)
+        for sub in self._resolve(topic):
+            sub.fn(payload)
+
+
+class _Mailbox:
+    """Bounded queue and worker tasks serving one subscription.
+
+    Queued items are ``(payload, done)`` pairs. ``done`` is ``None`` or a
+    future the worker resolves once the subscriber has handled ``payload``.
+    """
+
+    __slots__ = ("queue", "workers")
+
+    def __init__(self, queue: asyncio.Queue, workers: List[asyncio.Task]) -> None:
+        self.queue = queue
+        self.workers = workers
 
 
 class AsyncEventBus(EventBus):
-    """Asynchronous variant of :class:`EventBus` using ``asyncio``."""
+    """Asynchronous variant of :class:`EventBus` using ``asyncio``.
+
+    Parameters
+    ----------
+    mode:
+        ``"gather"`` (default) runs every subscriber as its own task and
+        :meth:`publish` waits for all of them. ``"queue"`` gives each
+        subscription a bounded :class:`asyncio.Queue` served by ``workers``
+        long-lived tasks; :meth:`publish` only enqueues the payload so the
+        number of in-flight handler calls stays fixed under bursts.
+    queue_size:
+        Capacity of each subscription queue in ``"queue"`` mode.
+    workers:
+        Worker tasks per subscription in ``"queue"`` mode.
+    overflow:
+        What :meth:`publish` does when a subscription queue is full:
+        ``"block"`` waits for space, ``"drop_oldest"`` discards the oldest
+        queued payload and ``"reject"`` raises :class:`asyncio.QueueFull`
+        without enqueuing the payload for any subscriber.
+    max_threads:
+        Size of the dedicated thread pool used for synchronous handlers.
+    partition_key:
+        Payload field used as ordering key by :meth:`emit` when no explicit
+        ``key`` is given, e.g. ``"tenant_id"`` or ``"deal_id"``.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: DispatchMode = "gather",
+        queue_size: int = 1000,
+        workers: int = 1,
+        overflow: OverflowPolicy = "block",
+        max_threads: int | None = None,
+        partition_key: str | None = None,
+    ) -> None:
+        super().__init__()
+        if mode not in {"gather", "queue"}:
+            raise ValueError(f"unknown dispatch mode: {mode}")
+        if overflow not in {"block", "drop_oldest", "reject"}:
+            raise ValueError(f"unknown overflow policy: {overflow}")
+        if queue_size < 1 or workers < 1:
+            raise ValueError("queue_size and workers must be positive")
+        self.mode = mode
+        self.queue_size = queue_size
+        self.workers = workers
+        self.overflow = overflow
+        self.max_threads = max_threads
+        self.partition_key = partition_key
+        self._executor: ThreadPoolExecutor | None = None
+        self._mailboxes: Dict[int, _Mailbox] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lanes: Dict[Hashable, Deque[Tuple[str, dict]]] = {}
+        self._pending: Set[asyncio.Task] = set()
+
+    def unsubscribe(self, topic: str, fn: Callable[[dict], Any]) -> bool:
+        """Remove ``fn`` from ``topic`` and stop its queue workers."""
+        sub = self._remove(topic, fn)
+        if sub is None:
+            return False
+        box = self._mailboxes.pop(sub.seq, None)
+        if box is not None:
+            for task in box.workers:
+                task.cancel()
+            # Nothing will handle the remaining payloads; release their waiters.
+            while not box.queue.empty():
+                _, done = box.queue.get_nowait()
+                box.queue.task_done()
+                _resolve(done)
+        return True
 
     async def publish(self, topic: str, payload: dict) -> None:
-        """Dispatch ``payload`` to subscribers as asyncio tasks."""
-        tasks = []
-        for fn in self._subs.get(topic, []):
-            if inspect.iscoroutinefunction(fn):
-                tasks.append(asyncio.create_task(fn(payload)))
-            else:
-                tasks.append(asyncio.create_task(asyncio.to_thread(fn, payload)))
-        if tasks:
-            await asyncio.gather(*tasks)
+        """Dispatch ``payload`` to the subscribers of ``topic``.
+
+        In ``"gather"`` mode this waits for every subscriber to finish. In
+        ``"queue"`` mode it returns once the payload is enqueued, applying the
+        configured overflow policy.
+        """
+        await self._dispatch(topic, payload)
+
+    async def _dispatch(self, topic: str, payload: dict, *, wait: bool = False) -> None:
+        """Implement :meth:`publish`.
+
+        With ``wait`` set, ``"queue"`` mode also waits until the queue workers
+        have handled (or dropped) the payload, as ``"gather"`` mode always
+        does. Keyed emits rely on this to deliver one event at a time.
+        """
+        subs = self._resolve(topic)
+        if not subs:
+            return
+        if self.mode == "gather":
+            await asyncio.gather(*(self._call(sub.fn, payload) for sub in subs))
+            return
+
+        boxes = [self._mailbox(sub) for sub in subs]
+        if self.overflow == "reject":
+            for sub, box in zip(subs, boxes):
+                if box.queue.full():
+                    raise asyncio.QueueFull(
+                        f"subscriber queue full for {sub.pattern!r}"
+                    )
+        loop = asyncio.get_running_loop()
+        waiters: List[asyncio.Future] = []
+        for sub, box in zip(subs, boxes):
+            done = loop.create_future() if wait else None
+            if done is not None:
+                waiters.append(done)
+            queue = box.queue
+            if self.overflow == "block":
+                await queue.put((payload, done))
+                continue
+            if queue.full():
+                _, dropped = queue.get_nowait()
+                queue.task_done()
+                _resolve(dropped)
+                logger.warning(f"Dropped oldest event queued for {sub.pattern!r}")
+            queue.put_nowait((payload, done))
+        if waiters:
+            await asyncio.gather(*waiters)
+
+    def emit(self, topic: str, payload: dict, *, key: Hashable = None) -> None:
+        """Schedule delivery of ``payload`` on ``topic`` and return immediately.
+
+        Events sharing the same ``key`` (or the value of the configured
+        ``partition_key`` field) are delivered one after another in emit
+        order while different keys are processed concurrently. Events without
+        a key are delivered independently. Failures are logged instead of
+        propagating to the emitter. Must be called from a running event loop;
+        use :meth:`drain` to wait for outstanding deliveries.
+        """
+        if key is None and self.partition_key is not None:
+            key = payload.get(self.partition_key)
+        loop = asyncio.get_running_loop()
+        if key is None:
+            self._track(loop.create_task(self._deliver(topic, payload)))
+            return
+        lane = self._lanes.get(key)
+        if lane is not None:
+            lane.append((topic, payload))
+            return
+        lane = self._lanes[key] = deque([(topic, payload)])
+        self._track(loop.create_task(self._run_lane(key, lane)))
+
+    publish_nowait = emit
+
+    async def drain(self) -> None:
+        """Wait until every emitted and queued event has been delivered.
+
+        Events emitted by subscribers while draining are waited for as well.
+        """
+        while True:
+            if self._pending:
+                await asyncio.gather(*list(self._pending), return_exceptions=True)
+                continue
+            boxes = list(self._mailboxes.values())
+            if boxes and self._loop is asyncio.get_running_loop():
+                await asyncio.gather(*(box.queue.join() for box in boxes))
+            if not self._pending:
+                return
+
+    async def aclose(self) -> None:
+        """Drain pending events, stop workers and release the thread pool."""
+        await self.drain()
+        boxes = list(self._mailboxes.values())
+        tasks = [task for box in boxes for task in box.workers]
+        for task in tasks:
+            task.cancel()
+        if tasks and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._mailboxes.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _call(self, fn: Callable[[dict], Any], payload: dict) -> Awaitable[Any]:
+        """Return an awaitable running ``fn`` without blocking the loop."""
+        if inspect.iscoroutinefunction(fn):
+            return fn(payload)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_threads, thread_name_prefix="eventbus"
+            )
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, fn, payload)
+
+    def _mailbox(self, sub: _Subscription) -> _Mailbox:
+        """Return the mailbox for ``sub`` creating queue and workers lazily."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # queues and tasks are bound to the loop that created them
+            self._mailboxes.clear()
+            self._loop = loop
+        box = self._mailboxes.get(sub.seq)
+        if box is None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            tasks = [
+                loop.create_task(self._worker(sub, queue)) for _ in range(self.workers)
+            ]
+            box = self._mailboxes[sub.seq] = _Mailbox(queue, tasks)
+        return box
+
+    def _track(self, task: asyncio.Task) -> None:
+        """Keep a reference to ``task`` until it completes."""
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _deliver(self, topic: str, payload: dict, *, wait: bool = False) -> None:
+        """Publish ``payload`` logging instead of raising failures."""
+        try:
+            await self._dispatch(topic, payload, wait=wait)
+        except Exception:
+            logger.exception(f"Delivery of emitted event {topic!r} failed")
+
+    async def _run_lane(self, key: Hashable, lane: Deque[Tuple[str, dict]]) -> None:
+        """Deliver the events queued for ``key`` in order.
+
+        Each event is handled completely before the next one is dispatched,
+        also when several queue workers serve a subscription.
+        """
+        try:
+            while lane:
+                topic, payload = lane.popleft()
+                await self._deliver(topic, payload, wait=True)
+        finally:
+            self._lanes.pop(key, None)
+
+    async def _worker(self, sub: _Subscription, queue: asyncio.Queue) -> None:
+        """Deliver payloads from ``queue`` to ``sub`` until cancelled."""
+        while True:
+            payload, done = await queue.get()
+            try:
+                await self._call(sub.fn, payload)
+            except Exception:
+                logger.exception(f"Subscriber for {sub.pattern!r} failed")
+            finally:
+                queue.task_done()
+                _resolve(done)
+
+
+def _resolve(done: asyncio.Future | None) -> None:
+    """Mark a queued payload as handled for anyone waiting on it."""
+    if done is not None and not done.done():
+        done.set_result(None)
 
 
 class MemoryService:
@@ -136,6 +527,123 @@ async def run_maybe_async(fn: Callable[..., Any], *args: Any, **kwargs: Any) ->
     return result
 
 
-def run_sync(awaitable: Any) -> Any:
-    """Execute ``awaitable`` synchronously using ``asyncio.run``."""
-    return asyncio.run(awaitable)
+class LoopRuntime:
+    """Event loop running forever in a background thread.
+
+    Synchronous code hands coroutines to the loop with :meth:`submit` (from
+    any thread) or blocks on them with :meth:`run`. Reusing one loop avoids
+    creating and closing a loop per call and keeps loop-bound resources such
+    as pooled ``httpx.AsyncClient`` connections usable across calls.
+
+    The thread is started on first use and restarted after a fork.
+    """
+
+    def __init__(self, name: str = "agentic-runtime") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, starting the thread if necessary."""
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the background thread unless it is already running."""
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_serve, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return loop
+
+    def in_runtime_thread(self) -> bool:
+        """Return ``True`` when called from the runtime's own thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, awaitable: Awaitable[Any]) -> Future:
+        """Schedule ``awaitable`` on the loop and return a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(_as_coroutine(awaitable), self.loop)
+
+    def run(self, awaitable: Awaitable[Any], timeout: float | None = None) -> Any:
+        """Block until ``awaitable`` finished on the loop and return its result.
+
+        Raises
+        ------
+        RuntimeError
+            If called from a coroutine running on the runtime loop itself,
+            which would deadlock; such code must ``await`` instead.
+        """
+        if self.in_runtime_thread():
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError(
+                "run_sync() cannot block the runtime loop; await the coroutine"
+            )
+        future = self.submit(awaitable)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel pending tasks, stop the loop and join the thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._pid = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def _cancel_pending() -> None:
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+        except Exception:  # pragma: no cover - best effort on shutdown
+            logger.warning("Timed out cancelling runtime tasks on shutdown")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+async def _as_coroutine(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+
+_runtime = LoopRuntime()
+atexit.register(_runtime.shutdown)
+
+
+def get_runtime() -> LoopRuntime:
+    """Return the process-wide :class:`LoopRuntime` used by :func:`run_sync`."""
+    return _runtime
+
+
+def run_sync(awaitable: Any, *, timeout: float | None = None) -> Any:
+    """Execute ``awaitable`` synchronously on the shared background loop.
+
+    Safe to call from any thread, including threads that run their own event
+    loop, but not from coroutines running on the shared loop itself.
+    """
+    return _runtime.run(awaitable, timeout)
@@ -0,0 +1,72 @@
+"""Throughput of :class:`agentic_core.AsyncEventBus` under bursty load.
+
+Each burst publishes ``N`` ``Customer.Message`` events concurrently (one task
+per incoming request, as the API does) to a handful of synchronous and
+asynchronous subscribers. ``gather`` mode spawns a task and a thread hop per
+subscriber per event; ``queue`` mode feeds bounded per-subscriber queues
+served by a fixed number of workers. Throughput is reported per burst size so
+the point where ``gather`` starts to degrade is visible.
+
+Run with ``python benchmarks/bench_async_event_bus.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agentic_core import AsyncEventBus  # noqa: E402
+
+
+def _sync_handler(payload: dict) -> None:
+    sum(range(50))
+
+
+async def _async_handler(payload: dict) -> None:
+    await asyncio.sleep(0)
+
+
+async def _burst(bus: AsyncEventBus, events: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(bus.publish("Customer.Message", {"n": n}) for n in range(events))
+    )
+    if bus.mode == "queue":
+        await asyncio.gather(*(box.queue.join() for box in bus._mailboxes.values()))
+    return events / (time.perf_counter() - start)
+
+
+async def _run(mode: str, sizes: list[int], workers: int) -> list[float]:
+    bus = AsyncEventBus(mode=mode, queue_size=1024, workers=workers, max_threads=8)
+    for _ in range(2):
+        bus.subscribe("Customer.Message", _sync_handler)
+        bus.subscribe("Customer.*", _async_handler)
+    rates = [await _burst(bus, size) for size in sizes]
+    await bus.aclose()
+    return rates
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000]
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    print("burst".rjust(8) + "".join(m.rjust(16) for m in ("gather", "queue")))
+    results = {
+        m: asyncio.run(_run(m, args.sizes, args.workers)) for m in ("gather", "queue")
+    }
+    for idx, size in enumerate(args.sizes):
+        row = "".join(f"{results[m][idx]:>12,.0f} ev/s" for m in ("gather", "queue"))
+        print(f"{size:>8}{row}")
+
+
+if __name__ == "__main__":
+    main()
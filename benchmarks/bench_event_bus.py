@@ -0,0 +1,80 @@
+"""Microbenchmark for :class:`agentic_core.EventBus` topic routing.
+
+Registers ``--subscribers`` handlers (10k by default) spread across distinct
+topics and compares publishing to an exact subscription with publishing to a
+topic that is only reachable through ``*``/``#`` wildcard patterns. The cold
+numbers clear the resolution cache before every publish and therefore show
+the raw trie walk.
+
+Run with ``python benchmarks/bench_event_bus.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agentic_core import EventBus  # noqa: E402
+
+
+def _noop(payload: dict) -> None:
+    pass
+
+
+def build_exact(count: int) -> EventBus:
+    """Return a bus with ``count`` exact subscriptions."""
+    bus = EventBus()
+    for i in range(count):
+        bus.subscribe(f"Tenant{i}.Project.MaterialsNeeded", _noop)
+    return bus
+
+
+def build_wildcard(count: int) -> EventBus:
+    """Return a bus with ``count`` subscriptions using wildcard patterns."""
+    bus = EventBus()
+    for i in range(count):
+        pattern = f"Tenant{i}.Project.*" if i % 2 else f"Tenant{i}.#"
+        bus.subscribe(pattern, _noop)
+    return bus
+
+
+def _measure(bus: EventBus, topic: str, number: int, cold: bool) -> float:
+    payload = {"deal_id": "d1"}
+    if cold:
+
+        def stmt() -> None:
+            bus._cache.clear()
+            bus.publish(topic, payload)
+
+    else:
+
+        def stmt() -> None:
+            bus.publish(topic, payload)
+
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    topic = f"Tenant{args.subscribers // 2 + 1}.Project.MaterialsNeeded"
+    exact = build_exact(args.subscribers)
+    wildcard = build_wildcard(args.subscribers)
+
+    print(f"{args.subscribers} subscribers, publishing to {topic!r}")
+    for name, bus in (("exact", exact), ("wildcard", wildcard)):
+        warm = _measure(bus, topic, args.number, cold=False)
+        cold = _measure(bus, topic, args.number, cold=True)
+        print(f"{name:>9}: {warm:7.3f} us/publish cached, {cold:7.3f} us cold")
+
+
+if __name__ == "__main__":
+    main()
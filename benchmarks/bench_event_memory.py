@@ -0,0 +1,86 @@
+"""Per-event memory of queued events: plain dicts vs. slotted envelopes.
+
+Builds ``--events`` (1M by default) ``lead_capture`` events the way they sit
+in a backlog between the API and the agents and reports the traced memory per
+event:
+
+``legacy``
+    The request payload, the ``{"type", "payload"}`` copy produced by
+    ``Event.dict()`` and a regular (``__dict__`` based) dataclass built with
+    ``schema(**payload)``.
+``envelope``
+    The request payload wrapped by :class:`src.events.EventEnvelope` and the
+    frozen, slotted :class:`src.events.LeadCaptureEvent` built by the compiled
+    validator. Both reference the original payload instead of copying it.
+
+Run with ``python benchmarks/bench_event_memory.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.events import EventEnvelope, LeadCaptureEvent  # noqa: E402
+from src.schema_compiler import compile_schema  # noqa: E402
+
+LegacyLeadCaptureEvent = dataclasses.make_dataclass(
+    "LegacyLeadCaptureEvent",
+    [("form_data", Dict[str, Any]), ("source", str)],
+)
+
+
+def _payload(n: int) -> dict:
+    return {"form_data": {"email": f"user{n}@example.com"}, "source": "web"}
+
+
+def _legacy(n: int) -> tuple:
+    payload = _payload(n)
+    event = {"type": "lead_capture", "payload": copy.deepcopy(payload)}
+    return event, LegacyLeadCaptureEvent(**event["payload"])
+
+
+_validate = compile_schema(LeadCaptureEvent)
+
+
+def _envelope(n: int) -> tuple:
+    event = EventEnvelope("lead_capture", _payload(n))
+    return event, _validate(event.raw_payload())
+
+
+def _measure(build: Callable[[int], tuple], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    queue: deque = deque(build(n) for n in range(count))
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return current / count
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    payload = _measure(lambda n: (_payload(n),), args.events)
+    print(f"{args.events:,} queued events (payload alone: {payload:.0f} bytes)")
+    for name, build in (("legacy", _legacy), ("envelope", _envelope)):
+        total = _measure(build, args.events)
+        print(
+            f"{name:>8}: {total:6.0f} bytes/event, {total - payload:6.0f} overhead, "
+            f"{total * args.events / 2**20:8,.0f} MiB total"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-event-type cost of turning payloads into event objects.
+
+Compares the previous ``schema(**payload)`` construction used by
+:meth:`BaseOrchestrator._validate` with the validators generated by
+:func:`src.schema_compiler.compile_schema`. The compiled validators also
+type-check every field and, unless compiled with ``check_items=False``, every
+element of typed lists, which the legacy path never did.
+
+Run with ``python benchmarks/bench_event_validation.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.events import (  # noqa: E402
+    ChatbotEvent,
+    CRMPipelineEvent,
+    IntegrationRequest,
+    LeadCaptureEvent,
+    SegmentationEvent,
+)
+from src.schema_compiler import compile_schema  # noqa: E402
+
+PAYLOADS = {
+    LeadCaptureEvent: {
+        "form_data": {"email": "lead@example.com", "name": "Ada"},
+        "source": "web",
+    },
+    ChatbotEvent: {
+        "messages": [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "pricing?"},
+        ]
+    },
+    CRMPipelineEvent: {
+        "deal_id": "d-1",
+        "calendar_id": "c-1",
+        "followup_template": {"summary": "Kickoff"},
+    },
+    SegmentationEvent: {
+        "segments": [{"name": "students"}, {"name": "retirees"}],
+        "budget_per_segment": 300,
+    },
+    IntegrationRequest: {"name": "hubspot"},
+}
+
+
+def _rate(stmt: str, env: dict, number: int) -> float:
+    best = min(timeit.repeat(stmt, globals=env, number=number, repeat=5))
+    return number / best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    columns = ("schema(**p)", "compiled", "no item checks")
+    print(f"{'event':<20}" + "".join(f"{col:>18}" for col in columns))
+    for cls, payload in PAYLOADS.items():
+        env = {
+            "cls": cls,
+            "payload": payload,
+            "checked": compile_schema(cls),
+            "unchecked": compile_schema(cls, check_items=False),
+        }
+        legacy = _rate("cls(**payload)", env, args.number)
+        row = f"{cls.__name__:<20}{legacy:>14,.0f} /s"
+        for name in ("checked", "unchecked"):
+            rate = _rate(f"{name}(payload)", env, args.number)
+            row += f"{rate:>11,.0f} ({rate / legacy:.2f}x)"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Fetch latency of :class:`FileMemoryService` on a multi-GB log.
+
+Writes a JSONL log of about ``--size-gb`` gigabytes with records of roughly
+``--record-size`` bytes spread over ``--keys`` keys and reports:
+
+``build``
+    Opening the log without a sidecar index, which scans the log once.
+``load``
+    Opening it again in a fresh process state, which reads the sidecar.
+``fetch``
+    Median and p99 latency of ``fetch(key, top_k)`` for random keys.
+``tail``
+    Median latency of ``fetch`` with ``index=False`` for keys written among
+    the last ``--recent`` records, which scans the log backwards.
+``legacy``
+    The previous implementation, which parsed every line of the log per
+    fetch (timed ``--legacy-runs`` times).
+``append``
+    Median latency of ``store`` including the sidecar update.
+
+Run with ``python benchmarks/bench_file_memory_fetch.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory_service import file as file_module  # noqa: E402
+from src.memory_service.file import FileMemoryService, tail_fetch  # noqa: E402
+
+
+def _write_log(path: Path, size: int, record_size: int, keys: int) -> int:
+    rng = random.Random(11)
+    filler = "x" * max(record_size - 80, 0)
+    count = 0
+    written = 0
+    with path.open("w", encoding="utf-8") as fh:
+        while written < size:
+            chunk = []
+            for _ in range(10_000):
+                key = f"user-{rng.randrange(keys)}"
+                record = {"key": key, "data": {"n": count, "text": filler}}
+                chunk.append(json.dumps(record) + "\n")
+                count += 1
+            text = "".join(chunk)
+            fh.write(text)
+            written += len(text)
+    return count
+
+
+def _legacy_fetch(path: Path, key: str, top_k: int) -> list:
+    results = []
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if rec.get("key") == key:
+                results.append(rec.get("data", {}))
+    return results[-top_k:]
+
+
+def _open(path: Path) -> tuple[FileMemoryService, float]:
+    file_module._indexes.clear()
+    began = time.perf_counter()
+    svc = FileMemoryService(path)
+    return svc, time.perf_counter() - began
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--record-size", type=int, default=1_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--fetches", type=int, default=2_000)
+    parser.add_argument("--recent", type=int, default=1_000)
+    parser.add_argument("--legacy-runs", type=int, default=1)
+    parser.add_argument("--dir", help="Directory for the log (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = Path(tmp) / "memory.jsonl"
+        began = time.perf_counter()
+        records = _write_log(
+            path, int(args.size_gb * 2**30), args.record_size, args.keys
+        )
+        size = path.stat().st_size / 2**30
+        print(
+            f"log: {size:.2f} GiB, {records:,} records, {args.keys:,} keys "
+            f"(written in {time.perf_counter() - began:.1f}s)"
+        )
+
+        _, build = _open(path)
+        svc, load = _open(path)
+        print(f"build index: {build:8.2f}s")
+        print(f"load index:  {load:8.2f}s")
+
+        rng = random.Random(5)
+        costs = []
+        for _ in range(args.fetches):
+            key = f"user-{rng.randrange(args.keys)}"
+            began = time.perf_counter()
+            svc.fetch(key, top_k=args.top_k)
+            costs.append(time.perf_counter() - began)
+        costs.sort()
+        print(
+            f"fetch:       {statistics.median(costs) * 1e6:8.1f}us p50 "
+            f"{costs[int(len(costs) * 0.99)] * 1e6:8.1f}us p99"
+        )
+
+        tail = FileMemoryService(path, index=False)
+        recent = [f"user-{idx}" for idx in range(args.recent)]
+        for key in recent:
+            tail.store(key, {"n": key})
+        costs = []
+        for key in recent:
+            began = time.perf_counter()
+            tail.fetch(key, top_k=1)
+            costs.append(time.perf_counter() - began)
+        print(f"tail fetch:  {statistics.median(costs) * 1e6:8.1f}us p50")
+
+        key = "user-1"
+        assert tail_fetch(path, key, args.top_k) == _legacy_fetch(path, key, args.top_k)
+        assert svc.fetch(key, args.top_k) == _legacy_fetch(path, key, args.top_k)
+        for _ in range(args.legacy_runs):
+            began = time.perf_counter()
+            _legacy_fetch(path, key, args.top_k)
+            print(f"legacy:      {time.perf_counter() - began:8.2f}s per fetch")
+
+        costs = []
+        for idx in range(1_000):
+            began = time.perf_counter()
+            svc.store(f"user-{idx}", {"n": idx})
+            costs.append(time.perf_counter() - began)
+        print(f"append:      {statistics.median(costs) * 1e6:8.1f}us p50")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Scheduling overhead of :class:`GraphWorkflowEngine` on large graphs.
+
+Generates workflows of ``--nodes`` no-op nodes and measures construction plus
+a full sequential run, so the timings contain only the engine's own
+bookkeeping. Three shapes are measured: a chain, a random DAG where every node
+depends on up to ``--fan-in`` earlier nodes, and a wide fan-out from a single
+start node. The legacy column replays the previous scheduler, which rescanned
+every edge after each node and popped from the front of a list.
+
+Run with ``python benchmarks/bench_graph_scheduling.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.workflows.graph import (  # noqa: E402
+    EdgeDefinition,
+    GraphWorkflowDefinition,
+    GraphWorkflowEngine,
+    NodeDefinition,
+)
+
+
+def _nodes(count: int) -> list[NodeDefinition]:
+    return [
+        NodeDefinition(id=f"n{idx}", type="agent", label=f"n{idx}")
+        for idx in range(count)
+    ]
+
+
+def chain(count: int, fan_in: int, rng: random.Random) -> GraphWorkflowDefinition:
+    edges = [
+        EdgeDefinition(source=f"n{idx}", target=f"n{idx + 1}")
+        for idx in range(count - 1)
+    ]
+    return GraphWorkflowDefinition(name="chain", nodes=_nodes(count), edges=edges)
+
+
+def random_dag(count: int, fan_in: int, rng: random.Random) -> GraphWorkflowDefinition:
+    edges = []
+    for idx in range(1, count):
+        for src in set(rng.randrange(idx) for _ in range(rng.randint(1, fan_in))):
+            edges.append(EdgeDefinition(source=f"n{src}", target=f"n{idx}"))
+    return GraphWorkflowDefinition(name="random", nodes=_nodes(count), edges=edges)
+
+
+def fan_out(count: int, fan_in: int, rng: random.Random) -> GraphWorkflowDefinition:
+    edges = [EdgeDefinition(source="n0", target=f"n{idx}") for idx in range(1, count)]
+    return GraphWorkflowDefinition(name="fan_out", nodes=_nodes(count), edges=edges)
+
+
+def _legacy_run(definition: GraphWorkflowDefinition) -> int:
+    """Previous scheduler: full edge scan per node and ``list.pop(0)``."""
+
+    incoming = {n.id: 0 for n in definition.nodes}
+    for edge in definition.edges:
+        incoming[edge.target] += 1
+    queue = [n for n, deg in incoming.items() if deg == 0]
+    executed = 0
+    while queue:
+        node_id = queue.pop(0)
+        executed += 1
+        for edge in definition.edges:
+            if edge.source == node_id:
+                incoming[edge.target] -= 1
+                if incoming[edge.target] == 0:
+                    queue.append(edge.target)
+    return executed
+
+
+def _engine_run(definition: GraphWorkflowDefinition) -> int:
+    return len(GraphWorkflowEngine(definition).run(None)["results"])
+
+
+def _time(func: Callable[[GraphWorkflowDefinition], int], definition) -> float:
+    start = time.perf_counter()
+    executed = func(definition)
+    elapsed = time.perf_counter() - start
+    assert executed == len(definition.nodes)
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--fan-in", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="only time the current engine"
+    )
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'graph':<10} {'edges':>8} {'engine':>10} {'legacy':>10}")
+    for build in (chain, random_dag, fan_out):
+        definition = build(args.nodes, args.fan_in, rng)
+        current = _time(_engine_run, definition)
+        legacy = "-" if args.skip_legacy else f"{_time(_legacy_run, definition):.3f}s"
+        print(
+            f"{definition.name:<10} {len(definition.edges):>8} "
+            f"{current:>9.3f}s {legacy:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
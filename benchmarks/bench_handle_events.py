@@ -0,0 +1,79 @@
+"""Per-event vs. batched throughput of :class:`BaseOrchestrator`.
+
+Simulates a webhook burst of ``--events`` ``lead_capture`` events persisted to
+a :class:`FileMemoryService` and handled by an agent that awaits a short I/O
+delay. The per-event path awaits :meth:`BaseOrchestrator.handle_event` for
+each event; the batched path hands the whole burst to
+:meth:`BaseOrchestrator.handle_events`.
+
+Run with ``python benchmarks/bench_handle_events.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.base_orchestrator import BaseOrchestrator  # noqa: E402
+from src.memory_service.file import FileMemoryService  # noqa: E402
+
+
+class _IOAgent:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    async def run(self, payload: object) -> dict:
+        await asyncio.sleep(self.delay)
+        return {"ok": True}
+
+
+def _events(count: int) -> list[dict]:
+    return [
+        {
+            "type": "lead_capture",
+            "payload": {"form_data": {"email": f"u{n}@example.com"}, "source": "web"},
+        }
+        for n in range(count)
+    ]
+
+
+async def _per_event(orch: BaseOrchestrator, events: list[dict]) -> None:
+    for event in events:
+        await orch.handle_event(event)
+
+
+def _run(batched: bool, args: argparse.Namespace, tmp: Path) -> float:
+    memory = FileMemoryService(tmp / f"{'batch' if batched else 'single'}.jsonl")
+    orch = BaseOrchestrator(memory=memory)
+    orch.agents = {"lead_capture": _IOAgent(args.delay)}
+    events = _events(args.events)
+    start = time.perf_counter()
+    if batched:
+        asyncio.run(orch.handle_events(events, concurrency=args.concurrency))
+    else:
+        asyncio.run(_per_event(orch, events))
+    return args.events / (time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.001)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = _run(False, args, Path(tmp))
+        batch = _run(True, args, Path(tmp))
+    print(f"per-event: {single:10,.0f} events/s")
+    print(f"  batched: {batch:10,.0f} events/s ({batch / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
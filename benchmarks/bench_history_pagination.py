@@ -0,0 +1,125 @@
+"""Latency of deep ``/history`` pages with offsets and with cursors.
+
+Fills a history table with ``--rows`` events spread over ``--teams`` teams and
+fetches pages of ``--limit`` records at increasing depths, overall and for a
+single team. ``offset`` pages have to step over every skipped row, so their
+cost grows with the depth; ``cursor`` pages seek into the ``ts`` indexes and
+cost the same at any depth. The "legacy" column runs the previous query,
+which sorted by ``datetime(timestamp)`` and could not use an index at all.
+
+Run with ``python benchmarks/bench_history_pagination.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db  # noqa: E402
+from src.config import settings  # noqa: E402
+
+EPOCH = datetime(1970, 1, 1)
+LEGACY_SQL = (
+    "SELECT id, team, event_type, payload, result, timestamp FROM event_history"
+    " {where} ORDER BY datetime(timestamp) DESC LIMIT ? OFFSET ?"
+)
+
+
+def _fill(rows: int, teams: int) -> None:
+    conn = db.get_connection()
+    base = db.encode_event("team0", "lead", {"name": "x"}, {"ok": True})
+    batch = []
+    for idx in range(rows):
+        ts = base[5] + idx
+        stamp = (EPOCH + timedelta(microseconds=ts)).isoformat()
+        batch.append((f"team{idx % teams}", "lead", base[2], base[3], stamp, ts, 1.0))
+        if len(batch) == 50_000:
+            with conn:
+                db.write_events(conn, batch)
+            batch.clear()
+    with conn:
+        db.write_events(conn, batch)
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+
+def _cursor_at(depth: int, where: str, params: list) -> str | None:
+    """Return the cursor of the page starting ``depth`` records in."""
+
+    if depth == 0:
+        return None
+    row = (
+        db.get_connection()
+        .execute(
+            f"SELECT ts, id FROM event_history {where}"
+            " ORDER BY ts DESC, id DESC LIMIT 1 OFFSET ?",
+            [*params, depth - 1],
+        )
+        .fetchone()
+    )
+    return db.encode_cursor(row["ts"], row["id"])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.DB_CONNECTION_STRING = f"sqlite:///{tmp}/history.db"
+        db.init_db()
+        began = time.perf_counter()
+        _fill(args.rows, args.teams)
+        print(f"inserted {args.rows} rows in {time.perf_counter() - began:.1f}s")
+        conn = db.get_connection()
+
+        print(
+            f"{'filter':<8} {'depth':>9} {'legacy':>10} {'offset':>10} "
+            f"{'cursor':>10}"
+        )
+        for team in (None, "team3"):
+            total = args.rows // args.teams if team else args.rows
+            where, params = ("WHERE team = ?", [team]) if team else ("", [])
+            for depth in (0, total // 100, total // 10, total // 2, total - 1):
+                depth -= depth % args.limit
+                cursor = _cursor_at(depth, where, params)
+                legacy = _timed(
+                    lambda: conn.execute(
+                        LEGACY_SQL.format(where=where),
+                        [*params, args.limit, depth],
+                    ).fetchall(),
+                    args.repeat,
+                )
+                offset = _timed(
+                    lambda: db.fetch_history(args.limit, depth, team=team),
+                    args.repeat,
+                )
+                keyset = _timed(
+                    lambda: db.fetch_history(args.limit, cursor=cursor, team=team),
+                    args.repeat,
+                )
+                print(
+                    f"{team or 'all':<8} {depth:>9} {legacy:>8.2f}ms "
+                    f"{offset:>8.2f}ms {keyset:>8.2f}ms"
+                )
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Cost of hourly history charts with and without rollup tables.
+
+Inserts ``--rows`` events spread over ``--days`` days across ``--teams`` teams
+and ``--types`` event types in batches of ``--batch`` rows, once with a plain
+``executemany`` and once through :func:`src.db.write_events`, which also
+maintains the minute, hour and day rollups. It then times the per-team,
+per-type, per-team and total hourly counts and latency of the last 24 hours
+and of the whole period computed from raw rows with ``GROUP BY`` against
+:func:`src.db.fetch_stats`.
+
+Run with ``python benchmarks/bench_history_stats.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db  # noqa: E402
+from src.config import settings  # noqa: E402
+
+RAW_SQL = (
+    "SELECT ts - ts % 3600000000 AS start{keys}, COUNT(*), AVG(duration_ms),"
+    " MIN(duration_ms), MAX(duration_ms) FROM event_history"
+    " WHERE ts >= ? GROUP BY start{keys} ORDER BY start{keys}"
+)
+GROUPINGS = (("team", "event_type"), ("team",), ())
+
+
+def _rows(args) -> list[tuple]:
+    rng = random.Random(3)
+    end = db.encode_event("t", "x", {}, {})[5]
+    span = args.days * 86_400_000_000
+    template = db.encode_event("t", "x", {"name": "lead"}, {"ok": True})
+    rows = []
+    for ts in sorted(end - rng.randrange(span) for _ in range(args.rows)):
+        rows.append(
+            (
+                f"team{rng.randrange(args.teams)}",
+                f"type{rng.randrange(args.types)}",
+                template[2],
+                template[3],
+                template[4],
+                ts,
+                rng.expovariate(1 / 40),
+            )
+        )
+    return rows
+
+
+def _load(path: Path, rows: list[tuple], batch: int, rollups: bool) -> float:
+    settings.DB_CONNECTION_STRING = f"sqlite:///{path}"
+    db.init_db()
+    conn = db.get_connection()
+    began = time.perf_counter()
+    for idx in range(0, len(rows), batch):
+        chunk = rows[idx : idx + batch]
+        with conn:
+            if rollups:
+                db.write_events(conn, chunk)
+            else:
+                conn.executemany(db.INSERT_EVENT_SQL, chunk)
+    return time.perf_counter() - began
+
+
+def _timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--types", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    rows = _rows(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = _load(Path(tmp) / "plain.db", rows, args.batch, rollups=False)
+        rolled = _load(Path(tmp) / "rollup.db", rows, args.batch, rollups=True)
+        print(
+            f"insert {args.rows} rows: {args.rows / plain:,.0f}/s plain, "
+            f"{args.rows / rolled:,.0f}/s with rollups"
+        )
+
+        conn = db.get_connection()
+        now = datetime.utcnow()
+        print(f"{'window':<6} {'group by':<18} {'raw GROUP BY':>14} {'rollups':>10}")
+        for label, window in (("24h", timedelta(days=1)), ("all", None)):
+            since = now - (window or timedelta(days=args.days + 1))
+            since_ts = (since - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+            for group in GROUPINGS:
+                sql = RAW_SQL.format(keys="".join(f", {key}" for key in group))
+                raw = _timed(lambda: conn.execute(sql, (since_ts,)).fetchall())
+                rolled_ms = _timed(
+                    lambda: db.fetch_stats("hour", since=since, group_by=group)
+                )
+                print(
+                    f"{label:<6} {','.join(group) or '(total)':<18} "
+                    f"{raw:>12.1f}ms {rolled_ms:>8.1f}ms"
+                )
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
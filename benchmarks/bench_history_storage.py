@@ -0,0 +1,98 @@
+"""Disk usage and list-view latency of compressed history rows.
+
+Writes ``--rows`` events with payloads of roughly ``--payload-size`` bytes of
+JSON once per storage codec (plain text, zlib and, when the ``zstandard``
+package is installed, zstd) and reports the database size, the time to fetch
+``--pages`` pages of ``--limit`` full records, and the time for the same pages
+projected to the ``id,team,event_type,timestamp`` columns a list view shows.
+
+Run with ``python benchmarks/bench_history_storage.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db  # noqa: E402
+from src.config import settings  # noqa: E402
+
+LIST_FIELDS = ("id", "team", "event_type", "timestamp")
+WORDS = "lead email phone budget interested follow up demo price quote".split()
+
+
+def _payload(rng: random.Random, size: int) -> dict:
+    notes = " ".join(rng.choice(WORDS) for _ in range(size // 6))
+    return {
+        "name": f"Lead {rng.randrange(10**6)}",
+        "email": f"user{rng.randrange(10**6)}@example.com",
+        "score": rng.random(),
+        "notes": notes,
+    }
+
+
+def _pages(args, fields) -> float:
+    began = time.perf_counter()
+    cursor = None
+    for _ in range(args.pages):
+        _, cursor = db.fetch_history_page(args.limit, cursor=cursor, fields=fields)
+    return (time.perf_counter() - began) * 1000 / args.pages
+
+
+def _run(codec: str | None, args, tmp: str) -> None:
+    path = Path(tmp) / f"{codec or 'plain'}.db"
+    settings.DB_CONNECTION_STRING = f"sqlite:///{path}"
+    settings.HISTORY_COMPRESSION = codec
+    db.init_db()
+    rng = random.Random(7)
+    conn = db.get_connection()
+    began = time.perf_counter()
+    rows = [
+        db.encode_event(
+            f"team{i % 5}", "lead", _payload(rng, args.payload_size), {"ok": True}
+        )
+        for i in range(args.rows)
+    ]
+    encode = (time.perf_counter() - began) * 1e6 / args.rows
+    with conn:
+        db.write_events(conn, rows)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    size = path.stat().st_size / 2**20
+    full = _pages(args, None)
+    listed = _pages(args, LIST_FIELDS)
+    print(
+        f"{codec or 'plain':<6} {size:>8.1f}MiB {encode:>9.1f}us "
+        f"{full:>9.2f}ms {listed:>9.2f}ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--payload-size", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    codecs: list[str | None] = [None, "zlib"]
+    if db.zstandard is not None:
+        codecs.append("zstd")
+    print(
+        f"{'codec':<6} {'size':>11} {'encode':>11} "
+        f"{'full page':>11} {'list page':>11}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in codecs:
+            _run(codec, args, tmp)
+        db.close_connections()
+    settings.HISTORY_COMPRESSION = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Event-loop blocking of history persistence at a target event rate.
+
+Feeds ``--rate`` events per second for ``--seconds`` seconds from an asyncio
+loop, as :class:`SolutionOrchestrator` does, and reports how long the loop is
+blocked per event. ``insert_event`` opens a connection and commits each row
+(the previous behaviour); the write-behind :class:`HistoryWriter` only queues
+the row and commits batches on its own thread. The "lag" column is the time
+needed after the last event until every row is committed.
+
+Run with ``python benchmarks/bench_history_writer.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.history_writer import HistoryWriter  # noqa: E402
+
+
+async def _drive(record, rate: int, seconds: float) -> tuple[list[float], float]:
+    """Call ``record(i)`` at ``rate``/s and return per-call times and duration."""
+
+    total = int(rate * seconds)
+    interval = 1.0 / rate
+    costs: list[float] = []
+    start = time.perf_counter()
+    for idx in range(total):
+        due = start + idx * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        began = time.perf_counter()
+        record(idx)
+        costs.append(time.perf_counter() - began)
+    return costs, time.perf_counter() - start
+
+
+def _report(name: str, costs: list[float], elapsed: float, lag: float) -> None:
+    costs = sorted(costs)
+    p50 = statistics.median(costs) * 1e6
+    p99 = costs[int(len(costs) * 0.99)] * 1e6
+    achieved = len(costs) / elapsed
+    print(
+        f"{name:<14} {achieved:>8.0f}/s {p50:>9.1f}us {p99:>9.1f}us "
+        f"{sum(costs):>8.2f}s {lag * 1000:>8.1f}ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    payload = {"email": "alice@example.com", "source": "webinar", "score": 42}
+    result = {"status": "success", "result": {"lead_id": "l-1"}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(
+            f"{'mode':<14} {'achieved':>10} {'p50':>11} {'p99':>11} "
+            f"{'blocked':>9} {'lag':>10}"
+        )
+
+        settings.DB_CONNECTION_STRING = f"sqlite:///{tmp}/sync.db"
+        db.init_db()
+        costs, elapsed = asyncio.run(
+            _drive(
+                lambda i: db.insert_event("demo", "lead", payload, result),
+                args.rate,
+                args.seconds,
+            )
+        )
+        _report("insert_event", costs, elapsed, 0.0)
+
+        writer = HistoryWriter(Path(tmp) / "behind.db")
+
+        def _submit(idx: int) -> None:
+            writer.submit(db.encode_event("demo", "lead", payload, result))
+
+        costs, elapsed = asyncio.run(_drive(_submit, args.rate, args.seconds))
+        began = time.perf_counter()
+        writer.flush()
+        lag = time.perf_counter() - began
+        _report("write-behind", costs, elapsed, lag)
+        print(f"write-behind committed {writer.batches} batches")
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Per-call overhead of :func:`agentic_core.run_sync`.
+
+Compares running a trivial coroutine with ``asyncio.run`` (a new event loop
+per call, the previous behaviour of ``run_sync``) against submitting it to
+the shared background loop runtime, from one thread and from several.
+
+Run with ``python benchmarks/bench_run_sync.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agentic_core import run_sync  # noqa: E402
+
+
+async def _noop() -> int:
+    await asyncio.sleep(0)
+    return 1
+
+
+def _per_call(func, calls: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            func(_noop())
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: func(_noop()), range(calls)))
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    run_sync(_noop())  # start the runtime thread outside the measurement
+    print(f"{'mode':<24} {'1 thread':>10} {f'{args.threads} threads':>12}")
+    modes = (("asyncio.run per call", asyncio.run), ("shared runtime", run_sync))
+    for name, func in modes:
+        single = _per_call(func, args.calls, 1)
+        multi = _per_call(func, args.calls, args.threads)
+        print(f"{name:<24} {single:>8.1f}us {multi:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
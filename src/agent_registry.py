@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+"""Agent registry with an inverted skill index and load-aware selection."""
+
+from typing import Any, Dict, List, Literal, Mapping, Tuple
+
+SkillPolicy = Literal["first", "round_robin", "least_in_flight", "lowest_latency"]
+
+_MISSING = object()
+
+
+class AgentRegistry(Dict[str, Any]):
+    """Mapping of agent names to instances that indexes advertised skills.
+
+    The registry behaves like a plain ``dict`` but keeps a ``skill -> names``
+    index up to date whenever agents are added, replaced or removed, so
+    looking up the agents offering a skill does not scan the whole team.
+    Skills are read from the agent's ``skills`` attribute at registration time.
+    """
+
+    def __init__(self, agents: Mapping[str, Any] | None = None) -> None:
+        super().__init__()
+        self._by_skill: Dict[str, List[str]] = {}
+        if agents:
+            self.update(agents)
+
+    def with_skill(self, skill: str) -> List[str]:
+        """Return the names of agents advertising ``skill`` in registration order."""
+        return list(self._by_skill.get(skill, ()))
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _index(self, name: str, agent: Any) -> None:
+        for skill in dict.fromkeys(getattr(agent, "skills", None) or ()):
+            self._by_skill.setdefault(skill, []).append(name)
+
+    def _unindex(self, name: str, agent: Any) -> None:
+        for skill in dict.fromkeys(getattr(agent, "skills", None) or ()):
+            names = self._by_skill.get(skill)
+            if names and name in names:
+                names.remove(name)
+                if not names:
+                    del self._by_skill[skill]
+
+    # ------------------------------------------------------------------
+    # dict API
+    # ------------------------------------------------------------------
+    def __setitem__(self, name: str, agent: Any) -> None:
+        if name in self:
+            self._unindex(name, self[name])
+        super().__setitem__(name, agent)
+        self._index(name, agent)
+
+    def __delitem__(self, name: str) -> None:
+        self._unindex(name, self[name])
+        super().__delitem__(name)
+
+    def __ior__(self, other: Any) -> "AgentRegistry":  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
+        for name, agent in dict(*args, **kwargs).items():
+            self[name] = agent
+
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def pop(self, name: str, default: Any = _MISSING) -> Any:  # type: ignore[override]
+        if name not in self:
+            if default is _MISSING:
+                raise KeyError(name)
+            return default
+        agent = self[name]
+        del self[name]
+        return agent
+
+    def popitem(self) -> Tuple[str, Any]:
+        name, agent = super().popitem()
+        self._unindex(name, agent)
+        return name, agent
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_skill.clear()
+
+
+class SkillSelector:
+    """Choose one of several agents sharing a skill according to ``policy``.
+
+    ``"first"`` keeps the historical behaviour of always returning the first
+    registered agent. ``"round_robin"`` rotates through the candidates,
+    ``"least_in_flight"`` prefers the agent with the fewest running calls and
+    ``"lowest_latency"`` the one with the lowest exponentially weighted
+    average call duration. Ties are broken in round-robin order so idle
+    agents share the load.
+    """
+
+    def __init__(self, policy: SkillPolicy = "first", *, alpha: float = 0.2) -> None:
+        if policy not in {"first", "round_robin", "least_in_flight", "lowest_latency"}:
+            raise ValueError(f"unknown skill selection policy: {policy}")
+        self.policy = policy
+        self.alpha = alpha
+        self.in_flight: Dict[str, int] = {}
+        self.latency: Dict[str, float] = {}
+        self._cursor: Dict[str, int] = {}
+
+    def choose(self, skill: str, candidates: List[str]) -> str | None:
+        """Return the name of the agent that should handle ``skill``."""
+        if not candidates:
+            return None
+        if self.policy == "first" or len(candidates) == 1:
+            return candidates[0]
+
+        start = self._cursor.get(skill, 0) % len(candidates)
+        self._cursor[skill] = start + 1
+        rotated = candidates[start:] + candidates[:start]
+        if self.policy == "round_robin":
+            return rotated[0]
+        if self.policy == "least_in_flight":
+            return min(rotated, key=lambda name: self.in_flight.get(name, 0))
+        return min(rotated, key=lambda name: self.latency.get(name, 0.0))
+
+    def started(self, name: str) -> None:
+        """Record that a call to ``name`` started."""
+        self.in_flight[name] = self.in_flight.get(name, 0) + 1
+
+    def finished(self, name: str, elapsed: float) -> None:
+        """Record that a call to ``name`` finished after ``elapsed`` seconds."""
+        self.in_flight[name] = max(self.in_flight.get(name, 1) - 1, 0)
+        previous = self.latency.get(name)
+        self.latency[name] = (
+            elapsed
+            if previous is None
+            else previous + self.alpha * (elapsed - previous)
+        )
+
+
+__all__ = ["AgentRegistry", "SkillSelector", "SkillPolicy"]
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, TYPE_CHECKING
 
+from agentic_core import run_sync
+
 from .base_agent import BaseAgent
 import logging
 
@@ -12,6 +15,10 @@ if TYPE_CHECKING:  # pragma: no cover - for type hints only
 
 logger = logging.getLogger(__name__)
 
+#: Stream channel receiving the progress of every plan, in addition to the
+#: stream of the team executing the step.
+PLANNER_CHANNEL = "planner"
+
 
 class PlannerAgent(BaseAgent):
     """Sequence events across teams to accomplish high level goals.
@@ -22,9 +29,15 @@ class PlannerAgent(BaseAgent):
         :class:`~src.solution_orchestrator.SolutionOrchestrator` used to dispatch
         events.
     plans:
-        Mapping of goal names to ordered lists of tasks. Each task must include a
-        ``team`` key identifying the target team and an ``event`` dictionary
-        compatible with :meth:`SolutionOrchestrator.handle_event_sync`.
+        Mapping of goal names to ordered lists of steps. A step is either a
+        task with a ``team`` key identifying the target team and an ``event``
+        dictionary compatible with :meth:`SolutionOrchestrator.handle_event`,
+        or ``{"parallel": [task, ...]}`` to run a group of tasks concurrently.
+        The next step starts once every task of the group has finished.
+
+    Progress of each task (``started``, ``completed`` or ``failed``) is
+    published as a ``plan_progress`` message to the subscribers of the task's
+    team and of the :data:`PLANNER_CHANNEL`.
     """
 
     def __init__(
@@ -36,22 +49,74 @@ class PlannerAgent(BaseAgent):
         self.plans = plans
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the task sequence for ``payload['goal']``.
+        """Execute the plan for ``payload['goal']`` synchronously.
+
+        Blocking wrapper around :meth:`arun`; use :meth:`arun` from code that
+        already runs inside an event loop.
+        """
+        return run_sync(self.arun(payload))
 
-        Returns a dictionary with the results of each task. If the goal is not
-        known ``{"status": "unknown_goal"}`` is returned.
+    async def arun(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the plan for ``payload['goal']`` on the running loop.
+
+        Returns a dictionary with one result entry per step; parallel groups
+        produce ``{"parallel": [...]}`` entries in task order. If the goal is
+        not known ``{"status": "unknown_goal"}`` is returned.
         """
         goal = str(payload.get("goal", ""))
-        tasks = self.plans.get(goal)
-        if not tasks:
+        steps = self.plans.get(goal)
+        if not steps:
             logger.warning("Planner received unknown goal '%s'", goal)
             return {"status": "unknown_goal"}
 
-        results = []
-        for idx, task in enumerate(tasks):
-            team = task.get("team")
-            event = task.get("event", {})
-            logger.info("Planner executing step %s for team %s", idx + 1, team)
-            res = self.orchestrator.handle_event_sync(team, event)
-            results.append({"team": team, "result": res})
+        results: List[Dict[str, Any]] = []
+        for idx, step in enumerate(steps, start=1):
+            group = step.get("parallel")
+            if group is None:
+                results.append(await self._run_task(goal, idx, step))
+                continue
+            logger.info(
+                "Planner executing step %s as %s parallel tasks", idx, len(group)
+            )
+            tasks = [
+                asyncio.ensure_future(self._run_task(goal, idx, task, branch))
+                for branch, task in enumerate(group)
+            ]
+            try:
+                entries = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            results.append({"parallel": list(entries)})
         return {"status": "complete", "results": results}
+
+    async def _run_task(
+        self,
+        goal: str,
+        step: int,
+        task: Dict[str, Any],
+        branch: int | None = None,
+    ) -> Dict[str, Any]:
+        """Dispatch one task and publish its progress."""
+        team = task.get("team")
+        event = task.get("event", {})
+        progress = {"type": "plan_progress", "goal": goal, "step": step, "team": team}
+        if branch is not None:
+            progress["branch"] = branch
+
+        logger.info("Planner executing step %s for team %s", step, team)
+        self._publish(team, {**progress, "status": "started"})
+        try:
+            res = await self.orchestrator.handle_event(team, event)
+        except Exception as exc:
+            self._publish(team, {**progress, "status": "failed", "error": repr(exc)})
+            raise
+        self._publish(team, {**progress, "status": "completed", "result": res})
+        return {"team": team, "result": res}
+
+    def _publish(self, team: str | None, message: Dict[str, Any]) -> None:
+        if team:
+            self.orchestrator._publish(team, message)
+        self.orchestrator._publish(PLANNER_CHANNEL, message)
@@ -26,19 +26,23 @@ import asyncio
 import types
 
 from fastapi import Depends, FastAPI, Header, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from starlette.middleware.base import BaseHTTPMiddleware
 
-
 logger = logging.getLogger(__name__)
 
 from .tools.metrics_tools.prometheus_tool import PrometheusPusher
+from .tools.metrics_tools import metrics_registry
 
 
 class MetricsMiddleware(BaseHTTPMiddleware):
-    """Record request metrics via ``PrometheusPusher``."""
+    """Record request metrics via ``PrometheusPusher``.
+
+    Recording only updates the in-process registry; the request never waits
+    for the Pushgateway.
+    """
 
     def __init__(self, app: FastAPI, job: str = "api") -> None:  # type: ignore[override]
         super().__init__(app)
@@ -50,12 +54,12 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         duration = time.perf_counter() - start
         labels = {"path": request.url.path, "method": request.method}
         try:
-            self.pusher.push_metric("api_request_count", 1, labels)
-            self.pusher.push_metric("api_request_latency_seconds", duration, labels)
+            self.pusher.inc("api_request_count", 1, labels)
+            self.pusher.observe("api_request_latency_seconds", duration, labels)
         except (
             Exception
-        ):  # pragma: no cover - pushing metrics should not break requests
-            logger.exception("Failed to push Prometheus metrics")
+        ):  # pragma: no cover - recording metrics should not break requests
+            logger.exception("Failed to record Prometheus metrics")
         return response
 
 
@@ -87,10 +91,16 @@ def validate_workflow(data: Dict[str, Any]) -> None:
 
 
 class Event(BaseModel):
-    """Schema for incoming events."""
+    """Schema for incoming events.
+
+    ``task_id`` or ``correlation_id`` scope the agent budgets charged for the
+    event.
+    """
 
     type: str
     payload: Dict[str, Any] = {}
+    task_id: str | None = None
+    correlation_id: str | None = None
 
 
 class NodeModel(BaseModel):
@@ -120,9 +130,13 @@ class WorkflowModel(BaseModel):
 
 
 from .solution_orchestrator import SolutionOrchestrator
+from .events import EventEnvelope, json_default
 from .config import settings
 from . import db
 
+#: Longest a ``flush=true`` history read waits for queued rows, in seconds.
+HISTORY_FLUSH_TIMEOUT = 1.0
+
 
 def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
     """Return a configured :class:`FastAPI` app bound to ``orchestrator``.
@@ -148,6 +162,7 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
     @app.on_event("shutdown")
     async def _shutdown() -> None:
         await orch.__aexit__(None, None, None)
+        await asyncio.to_thread(metrics_registry.flush_all)
 
     origins = (
         [o.strip() for o in settings.ALLOWED_ORIGINS.split(",")]
@@ -160,7 +175,7 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    if settings.PROMETHEUS_PUSHGATEWAY:
+    if settings.PROMETHEUS_PUSHGATEWAY or settings.PROMETHEUS_METRICS_ENDPOINT:
         app.add_middleware(MetricsMiddleware, job="api")
     workflow_dir = Path(__file__).resolve().parent / "workflows" / "saved"
 
@@ -175,7 +190,13 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
     @app.post("/teams/{name}/event")
     async def handle_event(name: str, event: Event, _=Depends(_auth)) -> Dict[str, Any]:
         """Dispatch ``event`` to ``name`` via the orchestrator."""
-        result = await orch.handle_event(name, event.dict())
+        envelope = EventEnvelope(
+            event.type,
+            event.payload,
+            task_id=event.task_id,
+            correlation_id=event.correlation_id,
+        )
+        result = await orch.handle_event(name, envelope)
         if result.get("status") == "unknown_team":
             raise HTTPException(status_code=404, detail="unknown team")
         orch.report_status(name, "handled")
@@ -189,6 +210,14 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
             raise HTTPException(status_code=404, detail="unknown team")
         return {"team": name, "status": status}
 
+    @app.get("/teams/{name}/budgets")
+    def get_budgets(name: str, _=Depends(_auth)) -> Dict[str, Any]:
+        """Return the windowed budget usage of ``name``'s agents."""
+        team = orch.teams.get(name)
+        if team is None:
+            raise HTTPException(status_code=404, detail="unknown team")
+        return {"team": name, "budgets": team.budget_state()}
+
     @app.get("/teams/{name}/stream")
     async def stream(name: str, request: Request, _=Depends(_auth)):
         """Server-Sent Events stream of status and activity messages."""
@@ -208,12 +237,33 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
                         msg = await asyncio.wait_for(queue.get(), 1.0)
                     except asyncio.TimeoutError:
                         continue
-                    yield f"event: {msg['type']}\ndata: {json.dumps(msg)}\n\n"
+                    data = json.dumps(msg, default=json_default)
+                    yield f"event: {msg['type']}\ndata: {data}\n\n"
             finally:
                 orch.unsubscribe(name, queue)
 
         return StreamingResponse(event_generator(), media_type="text/event-stream")
 
+    if settings.PROMETHEUS_METRICS_ENDPOINT:
+
+        @app.get("/metrics", response_class=PlainTextResponse)
+        def get_metrics(_=Depends(_auth)) -> PlainTextResponse:
+            """Expose recorded metrics in the Prometheus text format."""
+            return PlainTextResponse(
+                metrics_registry.render_all(),
+                media_type=metrics_registry.CONTENT_TYPE,
+            )
+
+    @app.post("/goals/{goal}")
+    async def execute_goal(goal: str, _=Depends(_auth)) -> Dict[str, Any]:
+        """Run the planner for ``goal``; progress is streamed to subscribers."""
+        if orch.planner is None:
+            raise HTTPException(status_code=404, detail="planner not configured")
+        result = await orch.aexecute_goal(goal)
+        if result.get("status") == "unknown_goal":
+            raise HTTPException(status_code=404, detail="unknown goal")
+        return result
+
     @app.get("/activity")
     def get_activity(limit: int = 10, _=Depends(_auth)) -> Dict[str, Any]:
         """Return recent orchestrator activity."""
@@ -225,20 +275,73 @@ def create_app(orchestrator: SolutionOrchestrator | None = None) -> FastAPI:
         offset: int = 0,
         team: str | None = None,
         event_type: str | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+        flush: bool = False,
         _=Depends(_auth),
     ) -> Dict[str, Any]:
         """Return persisted event history from the database.
 
         The results can be filtered by ``team`` and ``event_type``. When
-        omitted all events are returned ordered by timestamp.
+        omitted all events are returned ordered by timestamp. ``next_cursor``
+        is passed back as ``cursor`` to fetch the following page; it is
+        ``null`` on the last page. ``fields`` is a comma separated list of
+        columns to return, e.g. ``id,team,event_type,timestamp`` for list
+        views that do not need the payload and result.
+
+        Events still queued for the history writer appear once it commits
+        them, normally within milliseconds. ``flush=true`` waits for them
+        first (up to :data:`HISTORY_FLUSH_TIMEOUT` seconds), for clients that
+        need to read their own writes; polling clients should not set it.
         """
-        items = db.fetch_history(
-            limit=limit,
-            offset=offset,
-            team=team,
-            event_type=event_type,
-        )
-        return {"history": items}
+        if flush:
+            orch.flush_history(timeout=HISTORY_FLUSH_TIMEOUT)
+        try:
+            items, next_cursor = db.fetch_history_page(
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                team=team,
+                event_type=event_type,
+                fields=fields.split(",") if fields else None,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"history": items, "next_cursor": next_cursor}
+
+    @app.get("/history/stats")
+    def get_history_stats(
+        bucket: str = "hour",
+        since: str | None = None,
+        until: str | None = None,
+        team: str | None = None,
+        event_type: str | None = None,
+        group_by: str = "team,event_type",
+        flush: bool = False,
+        _=Depends(_auth),
+    ) -> Dict[str, Any]:
+        """Return event counts and latency per ``minute``, ``hour`` or ``day``.
+
+        Served from rollup tables maintained as events are recorded, so the
+        cost does not depend on the size of the history. ``since`` and
+        ``until`` are ISO timestamps in UTC; ``group_by`` is a comma separated
+        subset of ``team`` and ``event_type`` (empty for totals per bucket).
+        ``flush`` behaves as for ``/history``.
+        """
+        if flush:
+            orch.flush_history(timeout=HISTORY_FLUSH_TIMEOUT)
+        try:
+            stats = db.fetch_stats(
+                bucket,
+                since=since,
+                until=until,
+                team=team,
+                event_type=event_type,
+                group_by=[name for name in group_by.split(",") if name],
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"bucket": bucket, "stats": stats}
 
     @app.post("/workflows", status_code=201)
     def save_workflow(workflow: Dict[str, Any], _=Depends(_auth)) -> Dict[str, Any]:
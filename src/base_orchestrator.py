@@ -2,13 +2,20 @@ from __future__ import annotations
 
 """Common orchestrator base class used across examples."""
 
-from typing import Any, Dict, Type
+from typing import Any, Dict, Hashable, Iterable, List, Type
+import asyncio
 import inspect
+import time
 
 from agentic_core import EventBus, AsyncEventBus, run_sync, run_maybe_async
+from .agent_registry import AgentRegistry, SkillPolicy, SkillSelector
+from .budgets import BudgetTracker
+from .schema_compiler import EventValidationError, get_validator
+from .token_estimator import TokenEstimator, default_estimator
 from .tools.metrics_tools.prometheus_tool import PrometheusPusher
 from .config import settings
 from .events import (
+    EventEnvelope,
     LeadCaptureEvent,
     ChatbotEvent,
     CRMPipelineEvent,
@@ -20,7 +27,6 @@ from .memory_service.base import BaseMemoryService
 from .memory_service.async_base import AsyncBaseMemoryService
 import logging
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -33,15 +39,20 @@ class BaseOrchestrator:
         memory: BaseMemoryService | None = None,
         *,
         metrics_job: str = "orchestrator",
+        skill_policy: SkillPolicy = "first",
+        token_estimator: TokenEstimator | None = None,
+        budget_window: float = 3600.0,
+        budget_ttl: float | None = None,
     ) -> None:
         self.bus = bus or AsyncEventBus()
         self.memory = memory
-        self.agents: Dict[str, Any] = {}
-        self.token_usage: Dict[str, int] = {}
-        self.loop_counts: Dict[str, int] = {}
+        self.agents = AgentRegistry()
+        self.skill_selector = SkillSelector(skill_policy)
+        self.token_estimator = token_estimator or default_estimator
+        self.budgets = BudgetTracker(budget_window, ttl=budget_ttl)
         self.pusher = (
             PrometheusPusher(job=metrics_job)
-            if settings.PROMETHEUS_PUSHGATEWAY
+            if settings.PROMETHEUS_PUSHGATEWAY or settings.PROMETHEUS_METRICS_ENDPOINT
             else None
         )
         self.event_schemas: Dict[str, Type[Any]] = {
@@ -51,25 +62,49 @@ class BaseOrchestrator:
             "segmentation": SegmentationEvent,
             "integration_request": IntegrationRequest,
         }
+        for schema in self.event_schemas.values():
+            get_validator(schema)
+
+    @property
+    def agents(self) -> AgentRegistry:
+        """Registered agents keyed by name or event type."""
+
+        return self._agents
+
+    @agents.setter
+    def agents(self, value: Dict[str, Any]) -> None:
+        self._agents = (
+            value if isinstance(value, AgentRegistry) else AgentRegistry(value)
+        )
+
+    def _select_by_skill(self, skill: str) -> tuple[str, Any] | None:
+        """Return ``(name, agent)`` chosen for ``skill`` by the selection policy."""
+
+        name = self.skill_selector.choose(skill, self.agents.with_skill(skill))
+        if name is None:
+            return None
+        return name, self.agents[name]
 
     def get_agent_by_skill(self, skill: str):
-        """Return the first agent advertising ``skill`` or ``None``."""
+        """Return an agent advertising ``skill`` or ``None``.
+
+        Candidates come from the registry's skill index. With the default
+        ``"first"`` policy the first registered agent is returned; other
+        policies spread calls across all agents sharing the skill.
+        """
 
-        for agent in self.agents.values():
-            if skill in getattr(agent, "skills", []):
-                return agent
-        return None
+        selected = self._select_by_skill(skill)
+        return selected[1] if selected else None
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _estimate_tokens(self, payload: Any) -> int:
-        """Return a rough token estimate for ``payload``.
+        """Return a token estimate for ``payload``.
 
-        Agents may override this by implementing ``estimate_tokens``. In the
-        absence of a custom implementation the fallback simply measures the
-        length of the string representation which keeps the code free of heavy
-        dependencies while providing deterministic budgets for tests.
+        Payloads may provide their own ``estimate_tokens`` method. Otherwise
+        :attr:`token_estimator` is used, which defaults to the shared
+        :class:`~src.token_estimator.BPEApproxEstimator`.
         """
 
         if hasattr(payload, "estimate_tokens"):
@@ -77,115 +112,272 @@ class BaseOrchestrator:
                 return int(payload.estimate_tokens())
             except Exception:
                 pass
-        return len(str(payload))
+        return self.token_estimator.estimate(payload)
 
-    async def handle_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Persist ``event`` if a memory service is available and dispatch it."""
-        event_type = event.get("type")
-        payload = event.get("payload", {})
-        logger.info(f"Handling event type={event_type}")
+    async def _persist(self, key: str, payloads: List[Dict[str, Any]]) -> None:
+        """Store ``payloads`` under ``key`` using the configured memory."""
 
-        if self.memory:
-            if isinstance(self.memory, AsyncBaseMemoryService):
-                await self.memory.store(event_type or "unknown", payload)
-            else:
-                self.memory.store(event_type or "unknown", payload)
+        if not self.memory:
+            return
+        if len(payloads) == 1:
+            result = self.memory.store(key, payloads[0])
+        else:
+            result = self.memory.store_many(key, payloads)
+        if inspect.isawaitable(result):
+            await result
 
-        agent = self.agents.get(event_type)
-        if not agent:
-            logger.warning(f"Unknown event type: {event_type}")
-            return {"status": "ignored"}
+    def _validate(self, event_type: str | None, event: EventEnvelope) -> Any:
+        """Return the payload of ``event`` converted to the schema for ``event_type``.
 
-        schema = self.event_schemas.get(event_type)
-        if schema:
-            try:
-                payload_obj = schema(**payload)
-            except TypeError as exc:
-                logger.warning(f"Invalid payload for {event_type}: {exc}")
-                return {"status": "invalid"}
-        else:
-            payload_obj = payload
+        Event types without a schema receive the payload itself, so agents
+        returning it keep producing JSON serializable results.
 
-        agent_name = getattr(agent, "__class__").__name__
-        self.loop_counts[agent_name] = self.loop_counts.get(agent_name, 0) + 1
-        loops = self.loop_counts[agent_name]
+        Dataclass schemas are validated by functions generated once by
+        :func:`~src.schema_compiler.compile_schema`, which coerce scalar
+        fields and report every invalid field.
 
-        tokens = self._estimate_tokens(payload_obj)
-        self.token_usage[agent_name] = self.token_usage.get(agent_name, 0) + tokens
+        Raises
+        ------
+        TypeError
+            If ``payload`` does not match the schema. Compiled schemas raise
+            :class:`~src.schema_compiler.EventValidationError`.
+        """
+
+        schema = self.event_schemas.get(event_type) if event_type else None
+        if schema is None:
+            return event.raw_payload()
+        return get_validator(schema)(event.raw_payload())
+
+    @staticmethod
+    def _invalid(event_type: str | None, exc: TypeError) -> Dict[str, Any]:
+        """Log ``exc`` and return the response for an invalid payload."""
+
+        logger.warning(f"Invalid payload for {event_type}: {exc}")
+        if isinstance(exc, EventValidationError):
+            return {"status": "invalid", "errors": exc.as_dicts()}
+        return {"status": "invalid"}
+
+    def _charge(
+        self, agent: Any, payload: Any, scope: Hashable = None
+    ) -> tuple[Dict[str, Any] | None, int, int]:
+        """Account one invocation of ``agent`` within ``scope`` against its budgets.
+
+        Usage is counted over a sliding window of ``budget_window`` seconds
+        (or the agent's own ``budget_window`` attribute) separately for every
+        task or correlation ``scope``. Returns a termination response if a
+        budget is exceeded (or ``None``), the estimated token count of
+        ``payload`` and the number of loops in the current window.
+        """
+
+        agent_name = getattr(agent, "__class__").__name__
+        tokens = self._estimate_tokens(payload)
+        loops, used = self.budgets.charge(
+            agent_name,
+            scope,
+            tokens=tokens,
+            window=getattr(agent, "budget_window", None),
+        )
 
-        # Check budgets if defined
         loop_budget = getattr(agent, "loop_budget", None)
         token_budget = getattr(agent, "token_budget", None)
         if loop_budget is not None and loops > loop_budget:
             logger.warning(f"Loop budget exceeded for {agent_name}")
-            return {"status": "terminated", "reason": "loop_budget_exceeded"}
-        if token_budget is not None and self.token_usage[agent_name] > token_budget:
+            terminated = {"status": "terminated", "reason": "loop_budget_exceeded"}
+            return terminated, tokens, round(loops)
+        if token_budget is not None and used > token_budget:
             logger.warning(f"Token budget exceeded for {agent_name}")
-            return {"status": "terminated", "reason": "token_budget_exceeded"}
+            terminated = {"status": "terminated", "reason": "token_budget_exceeded"}
+            return terminated, tokens, round(loops)
+        return None, tokens, round(loops)
 
-        if self.pusher:
-            labels = {"agent": agent_name}
-            try:  # pragma: no cover - metric push failures
-                self.pusher.push_metric("agent_tokens_used", tokens, labels)
-                self.pusher.push_metric("agent_loop_count", loops, labels)
-            except Exception:
-                logger.exception("Failed to push Prometheus metrics")
+    @staticmethod
+    def _scope_of(event: EventEnvelope) -> Hashable:
+        """Return the budget scope (task or correlation ID) of ``event``."""
+
+        return event.task_id or event.correlation_id
+
+    def budget_state(self) -> List[Dict[str, Any]]:
+        """Return windowed usage of every active agent scope for monitoring."""
 
-        result = agent.run(payload_obj)
+        return self.budgets.snapshot()
+
+    def _push_usage(self, agent_name: str, tokens: int, loops: int) -> None:
+        """Record token and loop usage for ``agent_name`` if metrics are enabled.
+
+        Only the in-memory registry is updated; it is pushed to the
+        Pushgateway by a background flusher.
+        """
+
+        if not self.pusher:
+            return
+        labels = {"agent": agent_name}
+        try:  # pragma: no cover - metric recording failures
+            self.pusher.inc("agent_tokens_used", tokens, labels)
+            self.pusher.push_metric("agent_loop_count", loops, labels)
+        except Exception:
+            logger.exception("Failed to record Prometheus metrics")
+
+    async def _run_agent(self, agent: Any, payload: Any) -> Dict[str, Any]:
+        """Execute ``agent`` with ``payload`` and wrap the result."""
+
+        start = time.perf_counter()
+        result = agent.run(payload)
         if inspect.isawaitable(result):
             result = await result
+        if self.pusher:
+            labels = {"agent": type(agent).__name__}
+            try:  # pragma: no cover - metric recording failures
+                self.pusher.observe(
+                    "agent_run_seconds", time.perf_counter() - start, labels
+                )
+            except Exception:
+                logger.exception("Failed to record Prometheus metrics")
         return {"status": "done", "result": result}
 
-    async def delegate_by_skill(
-        self, skill: str, payload: Dict[str, Any]
+    async def handle_event(
+        self, event: EventEnvelope | Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Dispatch ``payload`` to the first agent advertising ``skill``."""
+        """Persist ``event`` if a memory service is available and dispatch it.
 
-        logger.info(f"Delegating using skill={skill}")
-        agent = self.get_agent_by_skill(skill)
+        ``event`` may be an :class:`~src.events.EventEnvelope` or a plain
+        ``{"type": ..., "payload": ...}`` mapping, which is wrapped without
+        copying the payload.
+        """
+        event = EventEnvelope.of(event)
+        event_type = event.type
+        logger.info(f"Handling event type={event_type}")
+
+        await self._persist(event_type or "unknown", [event.raw_payload()])
+
+        agent = self.agents.get(event_type)
         if not agent:
-            logger.warning(f"No agent found with skill: {skill}")
-            return {"status": "unhandled"}
+            logger.warning(f"Unknown event type: {event_type}")
+            return {"status": "ignored"}
 
-        agent_name = getattr(agent, "__class__").__name__
-        self.loop_counts[agent_name] = self.loop_counts.get(agent_name, 0) + 1
-        loops = self.loop_counts[agent_name]
+        try:
+            payload_obj = self._validate(event_type, event)
+        except TypeError as exc:
+            return self._invalid(event_type, exc)
 
-        tokens = self._estimate_tokens(payload)
-        self.token_usage[agent_name] = self.token_usage.get(agent_name, 0) + tokens
+        terminated, tokens, loops = self._charge(
+            agent, payload_obj, self._scope_of(event)
+        )
+        if terminated:
+            return terminated
 
-        loop_budget = getattr(agent, "loop_budget", None)
-        token_budget = getattr(agent, "token_budget", None)
-        if loop_budget is not None and loops > loop_budget:
-            logger.warning(f"Loop budget exceeded for {agent_name}")
-            return {"status": "terminated", "reason": "loop_budget_exceeded"}
-        if token_budget is not None and self.token_usage[agent_name] > token_budget:
-            logger.warning(f"Token budget exceeded for {agent_name}")
-            return {"status": "terminated", "reason": "token_budget_exceeded"}
+        self._push_usage(getattr(agent, "__class__").__name__, tokens, loops)
+        return await self._run_agent(agent, payload_obj)
 
-        if self.pusher:
-            labels = {"agent": agent_name}
-            try:  # pragma: no cover - metric push failures
-                self.pusher.push_metric("agent_tokens_used", tokens, labels)
-                self.pusher.push_metric("agent_loop_count", loops, labels)
-            except Exception:
-                logger.exception("Failed to push Prometheus metrics")
+    async def handle_events(
+        self,
+        batch: Iterable[EventEnvelope | Dict[str, Any]],
+        *,
+        concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """Process a burst of events and return their results in input order.
+
+        Events are grouped by ``type`` so each group is persisted with a single
+        :meth:`~src.memory_service.base.BaseMemoryService.store_many` call and
+        validated against its schema in one pass. Budgets are charged in input
+        order, usage metrics are pushed once per agent and the surviving events
+        are dispatched concurrently with at most ``concurrency`` agent calls in
+        flight. Each result has the same shape as :meth:`handle_event`.
+        """
 
-        result = agent.run(payload)
-        if inspect.isawaitable(result):
-            result = await result
-        return {"status": "done", "result": result}
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        events = [EventEnvelope.of(event) for event in batch]
+        results: List[Dict[str, Any] | None] = [None] * len(events)
+        groups: Dict[str | None, List[int]] = {}
+        for idx, event in enumerate(events):
+            groups.setdefault(event.type, []).append(idx)
+        logger.info(f"Handling batch of {len(events)} events in {len(groups)} groups")
+
+        payloads: List[Any] = [None] * len(events)
+        for event_type, indices in groups.items():
+            await self._persist(
+                event_type or "unknown",
+                [events[idx].raw_payload() for idx in indices],
+            )
+            if not self.agents.get(event_type):
+                logger.warning(f"Unknown event type: {event_type}")
+                for idx in indices:
+                    results[idx] = {"status": "ignored"}
+                continue
+            for idx in indices:
+                try:
+                    payloads[idx] = self._validate(event_type, events[idx])
+                except TypeError as exc:
+                    results[idx] = self._invalid(event_type, exc)
+
+        runnable: List[int] = []
+        usage: Dict[str, tuple[int, int]] = {}
+        for idx, event in enumerate(events):
+            if results[idx] is not None:
+                continue
+            agent = self.agents[event.type]
+            terminated, tokens, loops = self._charge(
+                agent, payloads[idx], self._scope_of(event)
+            )
+            if terminated:
+                results[idx] = terminated
+                continue
+            agent_name = getattr(agent, "__class__").__name__
+            usage[agent_name] = (usage.get(agent_name, (0, 0))[0] + tokens, loops)
+            runnable.append(idx)
+
+        for agent_name, (tokens, loops) in usage.items():
+            self._push_usage(agent_name, tokens, loops)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _dispatch(idx: int) -> None:
+            async with semaphore:
+                agent = self.agents[events[idx].type]
+                results[idx] = await self._run_agent(agent, payloads[idx])
+
+        await asyncio.gather(*(_dispatch(idx) for idx in runnable))
+        return [res for res in results if res is not None]
+
+    async def delegate_by_skill(
+        self, skill: str, payload: Dict[str, Any], *, scope: Hashable = None
+    ) -> Dict[str, Any]:
+        """Dispatch ``payload`` to an agent advertising ``skill``.
+
+        The agent is chosen by :attr:`skill_selector` which also records the
+        in-flight count and latency of the call. ``scope`` selects the task
+        whose budgets are charged.
+        """
+
+        logger.info(f"Delegating using skill={skill}")
+        selected = self._select_by_skill(skill)
+        if not selected:
+            logger.warning(f"No agent found with skill: {skill}")
+            return {"status": "unhandled"}
+        name, agent = selected
+
+        terminated, tokens, loops = self._charge(agent, payload, scope)
+        if terminated:
+            return terminated
+
+        self._push_usage(getattr(agent, "__class__").__name__, tokens, loops)
+        self.skill_selector.started(name)
+        start = time.perf_counter()
+        try:
+            return await self._run_agent(agent, payload)
+        finally:
+            self.skill_selector.finished(name, time.perf_counter() - start)
 
     def handle_event_sync(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """Synchronous wrapper around :meth:`handle_event`."""
         return run_sync(self.handle_event(event))
 
     def delegate_by_skill_sync(
-        self, skill: str, payload: Dict[str, Any]
+        self, skill: str, payload: Dict[str, Any], *, scope: Hashable = None
     ) -> Dict[str, Any]:
         """Synchronous wrapper around :meth:`delegate_by_skill`."""
 
-        return run_sync(self.delegate_by_skill(skill, payload))
+        return run_sync(self.delegate_by_skill(skill, payload, scope=scope))
 
     # ------------------------------------------------------------------
     # Async context manager hooks
@@ -196,7 +388,10 @@ class BaseOrchestrator:
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        """Close the underlying memory service if required."""
+        """Drain emitted bus events and close the memory service if required."""
+
+        if isinstance(self.bus, AsyncEventBus):
+            await self.bus.drain()
 
         if not self.memory:
             return
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+"""Time-windowed loop and token budgets for orchestrated agents.
+
+Usage is tracked per ``(agent, scope)`` pair where the scope is typically a
+task or correlation ID. Each pair keeps a sliding-window counter made of two
+fixed windows, which approximates the usage of the last ``window`` seconds in
+constant memory. Scopes that have been idle for longer than their ``ttl`` are
+expired so long-running processes do not accumulate state.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+
+class WindowCounter:
+    """Sliding-window counter for loop and token usage.
+
+    The counter keeps totals for the current and the previous fixed window and
+    weights the previous one by how much of it still overlaps the sliding
+    window ending at ``now``.
+    """
+
+    __slots__ = (
+        "window",
+        "start",
+        "loops",
+        "tokens",
+        "prev_loops",
+        "prev_tokens",
+        "last_seen",
+    )
+
+    def __init__(self, window: float, now: float) -> None:
+        self.window = window
+        self.start = now
+        self.loops = 0
+        self.tokens = 0
+        self.prev_loops = 0
+        self.prev_tokens = 0
+        self.last_seen = now
+
+    def _roll(self, now: float) -> None:
+        elapsed = now - self.start
+        if elapsed < self.window:
+            return
+        if elapsed < 2 * self.window:
+            self.prev_loops, self.prev_tokens = self.loops, self.tokens
+            self.start += self.window
+        else:
+            self.prev_loops = self.prev_tokens = 0
+            self.start = now
+        self.loops = self.tokens = 0
+
+    def add(self, loops: int, tokens: int, now: float) -> Tuple[float, float]:
+        """Record usage at ``now`` and return the windowed totals."""
+        self._roll(now)
+        self.loops += loops
+        self.tokens += tokens
+        self.last_seen = now
+        return self.value(now)
+
+    def value(self, now: float) -> Tuple[float, float]:
+        """Return ``(loops, tokens)`` used in the window ending at ``now``."""
+        self._roll(now)
+        weight = max(0.0, 1.0 - (now - self.start) / self.window)
+        return (
+            self.loops + self.prev_loops * weight,
+            self.tokens + self.prev_tokens * weight,
+        )
+
+
+class BudgetTracker:
+    """Track windowed usage per agent and scope.
+
+    Parameters
+    ----------
+    window:
+        Default length of the sliding window in seconds. Agents may override
+        it via a ``budget_window`` attribute.
+    ttl:
+        Idle time in seconds after which a scope is forgotten. Defaults to two
+        windows, after which its usage would have decayed to zero anyway.
+    clock:
+        Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        window: float = 3600.0,
+        *,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("budget window must be positive")
+        self.window = window
+        self.ttl = ttl
+        self.clock = clock
+        self._counters: OrderedDict[Tuple[str, Hashable], WindowCounter] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def charge(
+        self,
+        agent: str,
+        scope: Hashable = None,
+        *,
+        tokens: int = 0,
+        window: float | None = None,
+    ) -> Tuple[float, float]:
+        """Record one invocation of ``agent`` within ``scope``.
+
+        Returns the ``(loops, tokens)`` used by the pair within its window,
+        including this invocation.
+        """
+        now = self.clock()
+        self._expire(now)
+        key = (agent, scope)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = WindowCounter(window or self.window, now)
+        else:
+            self._counters.move_to_end(key)
+        return counter.add(1, tokens, now)
+
+    def usage(self, agent: str, scope: Hashable = None) -> Tuple[float, float]:
+        """Return the current ``(loops, tokens)`` of ``agent`` in ``scope``."""
+        counter = self._counters.get((agent, scope))
+        if counter is None:
+            return 0.0, 0.0
+        return counter.value(self.clock())
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the state of all active scopes for monitoring."""
+        now = self.clock()
+        self._expire(now)
+        state = []
+        for (agent, scope), counter in self._counters.items():
+            loops, tokens = counter.value(now)
+            state.append(
+                {
+                    "agent": agent,
+                    "scope": scope,
+                    "loops": round(loops, 2),
+                    "tokens": round(tokens, 2),
+                    "window": counter.window,
+                    "idle_seconds": round(now - counter.last_seen, 3),
+                }
+            )
+        return state
+
+    def _expire(self, now: float) -> None:
+        """Drop scopes idle for longer than their TTL."""
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            ttl = self.ttl if self.ttl is not None else 2 * counter.window
+            if now - counter.last_seen <= ttl:
+                break
+            del self._counters[key]
+
+
+__all__ = ["WindowCounter", "BudgetTracker"]
@@ -263,6 +263,25 @@ def cmd_run_integration(args: argparse.Namespace) -> None:
     print(json.dumps(resp))
 
 
+def cmd_history_retention(args: argparse.Namespace) -> None:
+    """Archive and delete expired event history, printing a JSON report."""
+
+    from .retention import apply_retention
+
+    try:
+        report = apply_retention(
+            ttl_days=args.ttl_days,
+            archive_dir=args.archive_dir,
+            archive=not args.no_archive,
+            archive_ttl_days=args.archive_ttl_days,
+            vacuum=not args.no_vacuum,
+            dry_run=args.dry_run,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(json.dumps(report.as_dict()))
+
+
 # ---------------------------------------------------------------------------
 # Argument parsing
 # ---------------------------------------------------------------------------
@@ -335,6 +354,38 @@ def build_parser() -> argparse.ArgumentParser:
     validate_p.add_argument("path", help="Path to team JSON file")
     validate_p.set_defaults(func=cmd_validate_team)
 
+    retention_p = sub.add_parser(
+        "history-retention",
+        help="Archive event history older than the TTL and compact the database",
+    )
+    retention_p.add_argument(
+        "--ttl-days",
+        type=float,
+        help="Keep this many days of history (default: HISTORY_TTL_DAYS)",
+    )
+    retention_p.add_argument(
+        "--archive-dir", help="Archive directory (default: HISTORY_ARCHIVE_DIR)"
+    )
+    retention_p.add_argument(
+        "--archive-ttl-days",
+        type=float,
+        help="Delete monthly archives older than this many days",
+    )
+    retention_p.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Delete expired events without exporting them",
+    )
+    retention_p.add_argument(
+        "--no-vacuum", action="store_true", help="Skip compacting the database"
+    )
+    retention_p.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report how many events would be archived per month",
+    )
+    retention_p.set_defaults(func=cmd_history_retention)
+
     return parser
 
 
@@ -21,6 +21,7 @@ misconfiguration early in application startup.
 from __future__ import annotations
 
 from typing import Literal, Optional
+import importlib.util
 import os
 
 from pydantic import BaseSettings, Field, validator
@@ -110,6 +111,11 @@ class Settings(BaseSettings):
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
     REDIS_URL: Optional[str] = None
     DB_CONNECTION_STRING: Optional[str] = None
+    DB_BUSY_TIMEOUT: float = 5.0
+    HISTORY_COMPRESSION: Optional[Literal["zlib", "zstd"]] = None
+    HISTORY_TTL_DAYS: Optional[float] = None
+    HISTORY_ARCHIVE_DIR: str = "history_archive"
+    HISTORY_ARCHIVE_TTL_DAYS: Optional[float] = None
     KAFKA_BOOTSTRAP_SERVERS: Optional[str] = None
     RABBITMQ_URL: Optional[str] = None
 
@@ -131,6 +137,8 @@ class Settings(BaseSettings):
 
     # Monitoring & Analytics
     PROMETHEUS_PUSHGATEWAY: Optional[str] = None
+    PROMETHEUS_PUSH_INTERVAL: float = 15.0
+    PROMETHEUS_METRICS_ENDPOINT: bool = False
     GA4_MEASUREMENT_ID: Optional[str] = None
     GA4_API_SECRET: Optional[str] = None
     MIXPANEL_TOKEN: Optional[str] = None
@@ -179,6 +187,7 @@ class Settings(BaseSettings):
     MEMORY_BACKEND: Literal["rest", "rest_async", "file", "redis", "embedding"] = "rest"
     MEMORY_ENDPOINT: str = "http://localhost:8000"
     MEMORY_FILE_PATH: str = "memory.jsonl"
+    MEMORY_FILE_INDEX: bool = True
     MEMORY_REDIS_URL: str = "redis://localhost:6379/0"
     MEMORY_EMBED_FIELD: str = "text"
 
@@ -218,6 +227,19 @@ class Settings(BaseSettings):
             raise ValueError("Invalid AWS region")
         return value
 
+    @validator("HISTORY_COMPRESSION", pre=True, allow_reuse=True)
+    def validate_history_compression(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        value = str(value).strip().lower()
+        if value in ("", "none"):
+            return None
+        if value == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ValueError(
+                "HISTORY_COMPRESSION=zstd requires the 'zstandard' package"
+            )
+        return value
+
 
 # Instantiate a single global settings object used across the project
 settings = Settings()
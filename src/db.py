@@ -8,18 +8,32 @@ dashboard. It intentionally avoids third-party dependencies so the
 application can run in restricted environments without internet access.
 """
 
-from datetime import datetime
+import atexit
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import json
+import os
 import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List
+import zlib
 
 from .config import settings
 
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except Exception:  # pragma: no cover - only needed for zstd compression
+    zstandard = None
+
 
 # ---------------------------------------------------------------------------
-# Database initialisation
+# Connections
 # ---------------------------------------------------------------------------
 
+#: Number of compiled statements each connection keeps for reuse.
+STATEMENT_CACHE_SIZE = 256
+
 
 def _get_db_path() -> Path:
     """Return the path to the SQLite database file based on settings."""
@@ -29,17 +43,102 @@ def _get_db_path() -> Path:
     return Path("data.db")
 
 
-def init_db() -> None:
-    """Create database tables and indexes if they do not yet exist.
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """Open a new tuned connection to ``path`` (default: configured DB).
 
-    The function also performs a lightweight migration step to add indexes
-    on the ``event_history`` table for the ``timestamp`` and ``team`` columns.
-    ``PRAGMA index_list`` is used to detect existing indexes so that repeated
-    calls remain idempotent.
+    The database is switched to WAL journal mode so readers never wait for a
+    writer, commits use ``synchronous=NORMAL`` and lock contention between
+    writers is retried for ``settings.DB_BUSY_TIMEOUT`` seconds before
+    ``database is locked`` is raised. Rows are returned as
+    :class:`sqlite3.Row`. The caller owns the connection; most code should
+    use the per-thread :func:`get_connection` instead.
     """
-    path = _get_db_path()
+    path = path or _get_db_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(path) as conn:
+    busy = float(settings.DB_BUSY_TIMEOUT)
+    conn = sqlite3.connect(
+        path,
+        timeout=busy,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(busy * 1000)}")
+    return conn
+
+
+_local = threading.local()
+_all_connections: List[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def get_connection(path: Path | None = None) -> sqlite3.Connection:
+    """Return the calling thread's pooled connection to ``path``.
+
+    Each thread keeps one connection per database file for its lifetime, so
+    repeated calls skip the cost of opening the file and reuse the
+    connection's prepared statements. Use the connection as a context manager
+    (``with conn:``) to commit or roll back; never close it directly, call
+    :func:`close_connections` instead.
+    """
+    global _pid
+    if os.getpid() != _pid:
+        # Connections must not be shared with a forked child.
+        with _connections_lock:
+            _all_connections.clear()
+            _pid = os.getpid()
+    pool: Dict[Path, sqlite3.Connection] | None = getattr(_local, "pool", None)
+    if pool is None or getattr(_local, "pid", None) != _pid:
+        pool = _local.pool = {}
+        _local.pid = _pid
+    key = (path or _get_db_path()).absolute()
+    conn = pool.get(key)
+    if conn is None:
+        conn = pool[key] = connect(key)
+        with _connections_lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def close_connections() -> None:
+    """Close every pooled connection of this process.
+
+    Threads obtain a fresh connection on their next :func:`get_connection`
+    call.
+    """
+    global _pid
+    with _connections_lock:
+        conns = list(_all_connections) if os.getpid() == _pid else []
+        _all_connections.clear()
+        _pid = os.getpid()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:  # pragma: no cover - already unusable
+            pass
+    _local.__dict__.clear()
+
+
+atexit.register(close_connections)
+
+
+# ---------------------------------------------------------------------------
+# Database initialisation
+# ---------------------------------------------------------------------------
+
+
+def init_db(path: Path | None = None) -> None:
+    """Create database tables and indexes if they do not yet exist.
+
+    The function also migrates existing ``event_history`` tables to the
+    integer ``ts`` column and its indexes, see :func:`_migrate_event_history`.
+    ``path`` defaults to the configured database.
+    """
+    conn = get_connection(path)
+    with conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS event_history (
@@ -48,7 +147,9 @@ def init_db() -> None:
                 event_type TEXT NOT NULL,
                 payload TEXT NOT NULL,
                 result TEXT,
-                timestamp TEXT NOT NULL
+                timestamp TEXT NOT NULL,
+                ts INTEGER NOT NULL DEFAULT 0,
+                duration_ms REAL
             )
             """
         )
@@ -76,93 +177,495 @@ def init_db() -> None:
         # ------------------------------------------------------------------
         # Index creation / migration
         # ------------------------------------------------------------------
-        existing_indexes = {
-            row[1] for row in conn.execute("PRAGMA index_list('event_history')")
-        }
-        if "idx_event_history_timestamp" not in existing_indexes:
-            conn.execute(
-                "CREATE INDEX idx_event_history_timestamp ON event_history(timestamp)"
-            )
-        if "idx_event_history_team" not in existing_indexes:
-            conn.execute(
-                "CREATE INDEX idx_event_history_team ON event_history(team)"
-            )
+        _migrate_event_history(conn)
+        _create_rollups(conn)
+
+
+#: Indexes serving :func:`fetch_history`: newest first overall, per team and
+#: per event type. SQLite appends the row ``id`` to every index, which breaks
+#: ties between events with the same ``ts``.
+HISTORY_INDEXES = {
+    "idx_event_history_ts": "ts",
+    "idx_event_history_team_ts": "team, ts",
+    "idx_event_history_type_ts": "event_type, ts",
+}
+
+
+def _migrate_event_history(conn: sqlite3.Connection) -> None:
+    """Add the ``ts`` and ``duration_ms`` columns and the ``ts`` indexes.
+
+    ``ts`` holds the event time in microseconds since the Unix epoch so
+    history can be sorted and paged through an index. Rows written before
+    the column existed are backfilled from their ISO ``timestamp`` once;
+    their ``duration_ms`` stays ``NULL``.
+    The single column ``timestamp`` and ``team`` indexes are superseded by
+    the composite ones and dropped. ``PRAGMA table_info`` and
+    ``PRAGMA index_list`` keep repeated calls idempotent.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info('event_history')")}
+    if "ts" not in columns:
+        conn.execute(
+            "ALTER TABLE event_history ADD COLUMN ts INTEGER NOT NULL DEFAULT 0"
+        )
+        # ``timestamp`` is ``datetime.isoformat()`` output: whole seconds
+        # followed by an optional ``.ffffff`` fraction from character 21.
+        conn.execute(
+            "UPDATE event_history SET ts = COALESCE("
+            "CAST(strftime('%s', timestamp) AS INTEGER) * 1000000"
+            " + CAST(substr(timestamp, 21, 6) AS INTEGER), 0)"
+        )
+
+    if "duration_ms" not in columns:
+        conn.execute("ALTER TABLE event_history ADD COLUMN duration_ms REAL")
+
+    existing_indexes = {
+        row[1] for row in conn.execute("PRAGMA index_list('event_history')")
+    }
+    for name, columns_sql in HISTORY_INDEXES.items():
+        if name not in existing_indexes:
+            conn.execute(f"CREATE INDEX {name} ON event_history({columns_sql})")
+    for name in ("idx_event_history_timestamp", "idx_event_history_team"):
+        if name in existing_indexes:
+            conn.execute(f"DROP INDEX {name}")
+
+
+#: Rollup granularities and their bucket width in seconds. Each has a
+#: ``history_rollup_<name>`` table maintained by :func:`write_events`.
+ROLLUP_BUCKETS = {"minute": 60, "hour": 3600, "day": 86400}
+
+
+def _create_rollups(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables, backfilling new ones from ``event_history``."""
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    for name, width in ROLLUP_BUCKETS.items():
+        table = f"history_rollup_{name}"
+        if table in existing:
+            continue
+        conn.execute(
+            f"""
+            CREATE TABLE {table} (
+                start INTEGER NOT NULL,
+                team TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                timed INTEGER NOT NULL,
+                duration_sum REAL NOT NULL,
+                duration_min REAL,
+                duration_max REAL,
+                PRIMARY KEY (start, team, event_type)
+            ) WITHOUT ROWID
+            """
+        )
+        width_us = width * 1_000_000
+        conn.execute(
+            f"INSERT INTO {table} SELECT ts - ts % {width_us}, team, event_type,"
+            " COUNT(*), COUNT(duration_ms), COALESCE(SUM(duration_ms), 0),"
+            " MIN(duration_ms), MAX(duration_ms) FROM event_history"
+            f" GROUP BY ts - ts % {width_us}, team, event_type"
+        )
 
 
 # ---------------------------------------------------------------------------
 # Data access helpers
 # ---------------------------------------------------------------------------
 
+INSERT_EVENT_SQL = (
+    "INSERT INTO event_history\n"
+    "(team, event_type, payload, result, timestamp, ts, duration_ms)\n"
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
 
-def insert_event(team: str, event_type: str, payload: dict, result: dict) -> None:
-    """Insert a single event entry into the history table."""
-    path = _get_db_path()
-    ts = datetime.utcnow().isoformat()
-    with sqlite3.connect(path) as conn:
-        conn.execute(
-            "INSERT INTO event_history (team, event_type, payload, result, timestamp)\n"
-            "VALUES (?, ?, ?, ?, ?)",
-            (team, event_type, json.dumps(payload), json.dumps(result), ts),
+_ROLLUP_UPSERT_SQL = """
+INSERT INTO history_rollup_{name} VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (start, team, event_type) DO UPDATE SET
+    count = count + excluded.count,
+    timed = timed + excluded.timed,
+    duration_sum = duration_sum + excluded.duration_sum,
+    duration_min = min(
+        coalesce(duration_min, excluded.duration_min),
+        coalesce(excluded.duration_min, duration_min)
+    ),
+    duration_max = max(
+        coalesce(duration_max, excluded.duration_max),
+        coalesce(excluded.duration_max, duration_max)
+    )
+"""
+
+_EPOCH = datetime(1970, 1, 1)
+
+#: Encoded JSON shorter than this is stored as plain text even when
+#: compression is enabled; compressing it would not save space.
+COMPRESS_MIN_SIZE = 128
+
+# Compressed ``payload``/``result`` values are BLOBs whose first byte names
+# the codec. Plain JSON is stored as TEXT, so both kinds can share a table.
+_ZLIB = b"z"
+_ZSTD = b"s"
+_zstd_local = threading.local()
+
+
+def _zstd() -> tuple:
+    # zstd (de)compressors are not thread-safe; keep one pair per thread.
+    pair = getattr(_zstd_local, "pair", None)
+    if pair is None:
+        if zstandard is None:
+            raise RuntimeError(
+                "HISTORY_COMPRESSION=zstd requires the 'zstandard' package"
+            )
+        pair = _zstd_local.pair = (
+            zstandard.ZstdCompressor(level=3),
+            zstandard.ZstdDecompressor(),
         )
-        conn.commit()
+    return pair
 
 
-def fetch_history(
+def pack_json(text: str, codec: str | None = None) -> str | bytes:
+    """Return JSON ``text`` as stored in the history table.
+
+    ``codec`` is ``"zlib"``, ``"zstd"`` or ``None`` for plain text and
+    defaults to ``settings.HISTORY_COMPRESSION``.
+    """
+    codec = codec if codec is not None else settings.HISTORY_COMPRESSION
+    if not codec or len(text) < COMPRESS_MIN_SIZE:
+        return text
+    data = text.encode()
+    if codec == "zlib":
+        return _ZLIB + zlib.compress(data, 6)
+    if codec == "zstd":
+        return _ZSTD + _zstd()[0].compress(data)
+    raise ValueError(f"unknown history compression codec: {codec!r}")
+
+
+def json_text(value: str | bytes | None) -> str | None:
+    """Return the JSON text of a stored ``payload`` or ``result`` value."""
+    if value is None or isinstance(value, str):
+        return value
+    tag, data = value[:1], value[1:]
+    if tag == _ZLIB:
+        return zlib.decompress(data).decode()
+    if tag == _ZSTD:
+        return _zstd()[1].decompress(data).decode()
+    raise ValueError(f"unknown history compression tag: {tag!r}")
+
+
+def load_json(value: str | bytes | None) -> Any:
+    """Decode a stored ``payload`` or ``result`` value."""
+    text = json_text(value)
+    return json.loads(text) if text else None
+
+
+def encode_event(
+    team: str,
+    event_type: str,
+    payload: Any,
+    result: dict,
+    *,
+    payload_json: str | None = None,
+    duration_ms: float | None = None,
+) -> tuple:
+    """Return the ``event_history`` row for an event, timestamped now.
+
+    ``payload`` and ``result`` are compressed according to
+    ``settings.HISTORY_COMPRESSION``. ``duration_ms`` is the time the team
+    took to handle the event and feeds the latency rollups.
+    """
+    encoded = payload_json if payload_json is not None else json.dumps(payload)
+    codec = settings.HISTORY_COMPRESSION
+    ts = time.time_ns() // 1000
+    return (
+        team,
+        event_type,
+        pack_json(encoded, codec),
+        pack_json(json.dumps(result), codec),
+        (_EPOCH + timedelta(microseconds=ts)).isoformat(),
+        ts,
+        duration_ms,
+    )
+
+
+def write_events(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    """Insert rows from :func:`encode_event` and update the rollup tables.
+
+    Rows are first aggregated per bucket, team and event type, so a batch
+    costs one upsert per distinct key rather than one per row. Call inside
+    a transaction (``with conn:``) so history and rollups stay consistent.
+    """
+    conn.executemany(INSERT_EVENT_SQL, rows)
+    for name, width in ROLLUP_BUCKETS.items():
+        width_us = width * 1_000_000
+        buckets: Dict[tuple, list] = {}
+        for row in rows:
+            team, event_type, ts, duration = row[0], row[1], row[5], row[6]
+            key = (ts - ts % width_us, team, event_type)
+            agg = buckets.get(key)
+            if agg is None:
+                agg = buckets[key] = [0, 0, 0.0, None, None]
+            agg[0] += 1
+            if duration is not None:
+                agg[1] += 1
+                agg[2] += duration
+                agg[3] = duration if agg[3] is None else min(agg[3], duration)
+                agg[4] = duration if agg[4] is None else max(agg[4], duration)
+        conn.executemany(
+            _ROLLUP_UPSERT_SQL.format(name=name),
+            [(*key, *agg) for key, agg in buckets.items()],
+        )
+
+
+def insert_event(
+    team: str,
+    event_type: str,
+    payload: Any,
+    result: dict,
+    *,
+    payload_json: str | None = None,
+    duration_ms: float | None = None,
+) -> None:
+    """Insert a single event entry into the history table.
+
+    ``payload_json`` may carry the already encoded payload, as returned by
+    :meth:`src.events.EventEnvelope.payload_json`, to avoid encoding it again.
+    """
+    row = encode_event(
+        team,
+        event_type,
+        payload,
+        result,
+        payload_json=payload_json,
+        duration_ms=duration_ms,
+    )
+    conn = get_connection()
+    with conn:
+        write_events(conn, [row])
+
+
+def encode_cursor(ts: int, event_id: int) -> str:
+    """Return the opaque history cursor pointing after ``(ts, event_id)``."""
+    return f"{ts}-{event_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Return the ``(ts, id)`` position encoded in ``cursor``.
+
+    Raises
+    ------
+    ValueError
+        If ``cursor`` was not produced by :func:`encode_cursor`.
+    """
+    try:
+        ts, event_id = cursor.split("-")
+        return int(ts), int(event_id)
+    except ValueError:
+        raise ValueError(f"invalid history cursor: {cursor!r}") from None
+
+
+#: Columns that can be requested from :func:`fetch_history_page`.
+HISTORY_FIELDS = ("id", "team", "event_type", "payload", "result", "timestamp")
+_DECODED_FIELDS = {"payload", "result"}
+
+
+def fetch_history_page(
     limit: int = 10,
     offset: int = 0,
     *,
+    cursor: str | None = None,
     team: str | None = None,
     event_type: str | None = None,
-) -> list[dict]:
-    """Return history records ordered by timestamp descending.
+    fields: Iterable[str] | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return one page of history, newest first, and the next page's cursor.
+
+    Pass the returned cursor back as ``cursor`` to continue after the last
+    record of the page. Cursor pages seek directly into the ``ts`` indexes,
+    so fetching page ``N`` costs the same as fetching the first page;
+    ``offset`` still works but has to step over every skipped row. The
+    cursor is ``None`` once fewer than ``limit`` records were returned.
 
     Parameters
     ----------
     limit:
         Maximum number of records to return.
     offset:
-        Number of records to skip from the start of the result set.
+        Number of records to skip after the cursor position.
+    cursor:
+        Value returned by a previous call with the same filters.
     team:
         Optional team name to filter by.
     event_type:
         Optional event type to filter by.
+    fields:
+        Subset of :data:`HISTORY_FIELDS` to return. ``payload`` and
+        ``result`` are only read and decoded when requested; all fields
+        are returned by default.
+
+    Raises
+    ------
+    ValueError
+        If ``cursor`` or ``fields`` is invalid.
+    """
+
+    if fields is None:
+        selected = HISTORY_FIELDS
+    else:
+        selected = tuple(dict.fromkeys(fields))
+        unknown = [name for name in selected if name not in HISTORY_FIELDS]
+        if unknown or not selected:
+            raise ValueError(
+                f"invalid history fields: {', '.join(unknown) or '(none)'}; "
+                f"choose from {', '.join(HISTORY_FIELDS)}"
+            )
+    columns = ", ".join(dict.fromkeys((*selected, "id", "ts")))
+    query = f"SELECT {columns}\nFROM event_history"
+
+    filters: list[str] = []
+    params: list = []
+    if team is not None:
+        filters.append("team = ?")
+        params.append(team)
+    if event_type is not None:
+        filters.append("event_type = ?")
+        params.append(event_type)
+    if cursor is not None:
+        filters.append("(ts, id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    if filters:
+        query += " WHERE " + " AND ".join(filters)
+
+    query += " ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+
+    rows = get_connection().execute(query, params).fetchall()
+    history = [
+        {
+            name: load_json(row[name]) if name in _DECODED_FIELDS else row[name]
+            for name in selected
+        }
+        for row in rows
+    ]
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1]["ts"], rows[-1]["id"])
+    return history, next_cursor
+
+
+def fetch_history(
+    limit: int = 10,
+    offset: int = 0,
+    *,
+    cursor: str | None = None,
+    team: str | None = None,
+    event_type: str | None = None,
+    fields: Iterable[str] | None = None,
+) -> list[dict]:
+    """Return history records ordered by timestamp descending.
+
+    See :func:`fetch_history_page` for the parameters.
     """
 
-    path = _get_db_path()
-    with sqlite3.connect(path) as conn:
-        conn.row_factory = sqlite3.Row
+    history, _ = fetch_history_page(
+        limit,
+        offset,
+        cursor=cursor,
+        team=team,
+        event_type=event_type,
+        fields=fields,
+    )
+    return history
+
 
-        query = (
-            "SELECT id, team, event_type, payload, result, timestamp\n"
-            "FROM event_history"
+def _parse_time(value: datetime | str | None) -> datetime | None:
+    """Return ``value`` as a naive UTC datetime; aware values are converted."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        text = value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"invalid time: {value!r}") from None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def fetch_stats(
+    bucket: str = "hour",
+    *,
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+    team: str | None = None,
+    event_type: str | None = None,
+    group_by: Iterable[str] = ("team", "event_type"),
+) -> list[dict]:
+    """Return event counts and latency per time bucket from the rollups.
+
+    Parameters
+    ----------
+    bucket:
+        One of :data:`ROLLUP_BUCKETS`.
+    since, until:
+        Datetimes or ISO strings; naive values are taken as UTC and values
+        with an offset are converted to it. Buckets from the one containing
+        ``since`` up to ``until`` are returned; ``since`` defaults to 60
+        buckets before ``until`` (default: now).
+    team, event_type:
+        Optional filters.
+    group_by:
+        Subset of ``team`` and ``event_type`` to break the counts down by;
+        an empty sequence returns one total per bucket.
+
+    Raises
+    ------
+    ValueError
+        If ``bucket``, ``group_by``, ``since`` or ``until`` is invalid.
+    """
+
+    if bucket not in ROLLUP_BUCKETS:
+        raise ValueError(
+            f"invalid bucket: {bucket!r}; choose from {', '.join(ROLLUP_BUCKETS)}"
         )
+    group = tuple(dict.fromkeys(group_by))
+    if any(name not in ("team", "event_type") for name in group):
+        raise ValueError(f"invalid group_by: {', '.join(group)}")
+    width = timedelta(seconds=ROLLUP_BUCKETS[bucket])
+    until_dt = _parse_time(until) or datetime.utcnow()
+    since_dt = _parse_time(since) or until_dt - 60 * width
+    to_ts = timedelta(microseconds=1)
 
-        filters: list[str] = []
-        params: list = []
-        if team is not None:
-            filters.append("team = ?")
-            params.append(team)
-        if event_type is not None:
-            filters.append("event_type = ?")
-            params.append(event_type)
-        if filters:
-            query += " WHERE " + " AND ".join(filters)
-
-        query += " ORDER BY datetime(timestamp) DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-
-        cur = conn.execute(query, params)
-        rows = cur.fetchall()
-    history: list[dict] = []
+    # Include the bucket ``since`` falls into.
+    since_us = (since_dt - _EPOCH) // to_ts
+    since_us -= since_us % (width // to_ts)
+    filters = ["start >= ?", "start <= ?"]
+    params: list = [since_us, (until_dt - _EPOCH) // to_ts]
+    if team is not None:
+        filters.append("team = ?")
+        params.append(team)
+    if event_type is not None:
+        filters.append("event_type = ?")
+        params.append(event_type)
+    keys = ", ".join(("start", *group))
+    rows = get_connection().execute(
+        f"SELECT {keys}, SUM(count) AS count, SUM(timed) AS timed,"
+        " SUM(duration_sum) AS duration_sum, MIN(duration_min) AS duration_min,"
+        f" MAX(duration_max) AS duration_max FROM history_rollup_{bucket}"
+        f" WHERE {' AND '.join(filters)} GROUP BY {keys} ORDER BY {keys}",
+        params,
+    ).fetchall()
+
+    stats: list[dict] = []
     for row in rows:
-        history.append(
-            {
-                "id": row["id"],
-                "team": row["team"],
-                "event_type": row["event_type"],
-                "payload": json.loads(row["payload"]),
-                "result": json.loads(row["result"]) if row["result"] else None,
-                "timestamp": row["timestamp"],
-            }
-        )
-    return history
+        entry = {"start": (_EPOCH + timedelta(microseconds=row["start"])).isoformat()}
+        entry.update((name, row[name]) for name in group)
+        timed = row["timed"]
+        entry["count"] = row["count"]
+        entry["latency_ms"] = {
+            "count": timed,
+            "avg": row["duration_sum"] / timed if timed else None,
+            "min": row["duration_min"],
+            "max": row["duration_max"],
+        }
+        stats.append(entry)
+    return stats
@@ -1,51 +1,228 @@
 from __future__ import annotations
 
-"""Event dataclasses used across orchestrators and agents."""
+"""Event types used across orchestrators and agents.
 
+:class:`EventEnvelope` wraps an incoming event once and is passed unchanged
+from the API through the orchestrators, history and stream subscribers. The
+payload dataclasses are frozen and slotted to keep per-event memory low;
+orchestrators build them through validators generated by
+:mod:`src.schema_compiler`.
+"""
+
+import json
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List
+
+_ENVELOPE_KEYS = ("type", "payload", "task_id", "correlation_id")
+
+
+class EventEnvelope(Mapping):
+    """Immutable event with a read-only, zero-copy view of its payload.
+
+    The envelope behaves like the ``{"type": ..., "payload": ...}`` dictionaries
+    orchestrators used to receive, so ``event.get("type")`` keeps working, but
+    it cannot be modified and never copies the payload. ``payload`` returns a
+    :class:`types.MappingProxyType` over the original dictionary and the JSON
+    encoding of the payload is computed at most once and shared by every
+    consumer that persists or streams the event.
+
+    Parameters
+    ----------
+    type:
+        Event type used to route the event to an agent.
+    payload:
+        Event data. Dictionaries are wrapped, not copied, so callers must not
+        mutate them afterwards; other values are kept as they are.
+    task_id, correlation_id:
+        Optional identifiers scoping agent budgets.
+    """
+
+    __slots__ = ("type", "task_id", "correlation_id", "_raw", "_json")
+
+    def __init__(
+        self,
+        type: str | None,
+        payload: Dict[str, Any] | None = None,
+        *,
+        task_id: str | None = None,
+        correlation_id: str | None = None,
+    ) -> None:
+        raw = {} if payload is None else payload
+        if isinstance(raw, MappingProxyType):
+            raw = dict(raw)
+        init = object.__setattr__
+        init(self, "type", type)
+        init(self, "task_id", task_id)
+        init(self, "correlation_id", correlation_id)
+        init(self, "_raw", raw)
+        init(self, "_json", None)
+
+    @property
+    def payload(self) -> Any:
+        """Read-only view of the payload (created on access, never a copy)."""
+
+        raw = self._raw
+        return MappingProxyType(raw) if isinstance(raw, dict) else raw
+
+    @classmethod
+    def of(cls, event: Mapping) -> "EventEnvelope":
+        """Return ``event`` as an envelope, wrapping plain mappings."""
+
+        if isinstance(event, cls):
+            return event
+        return cls(
+            event.get("type"),
+            event.get("payload"),
+            task_id=event.get("task_id"),
+            correlation_id=event.get("correlation_id"),
+        )
+
+    def raw_payload(self) -> Any:
+        """Return the original payload without copying it.
+
+        Intended for serializers such as memory services; it must not be
+        mutated.
+        """
+
+        return self._raw
+
+    def payload_json(self) -> str:
+        """Return the JSON encoding of the payload, computed once."""
+
+        encoded = self._json
+        if encoded is None:
+            encoded = json.dumps(self._raw)
+            object.__setattr__(self, "_json", encoded)
+        return encoded
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dictionary sharing the original payload."""
+
+        return {key: self[key] if key != "payload" else self._raw for key in self}
+
+    # Mapping protocol -------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key in _ENVELOPE_KEYS:
+            value = getattr(self, key)
+            if value is not None or key in ("type", "payload"):
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _ENVELOPE_KEYS:
+            if key in ("type", "payload") or getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (
+            _rebuild_envelope,
+            (self.type, self._raw, self.task_id, self.correlation_id),
+        )
+
+    def __repr__(self) -> str:
+        return f"EventEnvelope(type={self.type!r}, payload={self._raw!r})"
+
+
+def _rebuild_envelope(
+    type: str | None,
+    payload: Dict[str, Any],
+    task_id: str | None,
+    correlation_id: str | None,
+) -> EventEnvelope:
+    return EventEnvelope(type, payload, task_id=task_id, correlation_id=correlation_id)
+
+
+def json_default(obj: Any) -> Any:
+    """``json.dumps`` hook encoding envelopes and payload views."""
+
+    if isinstance(obj, EventEnvelope):
+        return obj.to_dict()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _SlottedEvent:
+    """Base of the frozen payload dataclasses below.
+
+    Their ``__slots__`` are spelled out because ``dataclass(slots=True)``
+    needs Python 3.10. This also provides the state hooks it would generate,
+    which ``copy`` and ``pickle`` need to restore frozen slotted instances.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self) -> List[Any]:
+        return [getattr(self, name) for name in self.__slots__]
 
+    def __setstate__(self, state: List[Any]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
-@dataclass
-class LeadCaptureEvent:
+
+@dataclass(frozen=True)
+class LeadCaptureEvent(_SlottedEvent):
     """Event payload for :class:`LeadCaptureAgent`."""
 
+    __slots__ = ("form_data", "source")
+
     form_data: Dict[str, Any]
     source: str
 
 
-@dataclass
-class ChatbotEvent:
+@dataclass(frozen=True)
+class ChatbotEvent(_SlottedEvent):
     """Event payload for :class:`ChatbotAgent`."""
 
+    __slots__ = ("messages",)
+
     messages: List[Dict[str, Any]]
 
 
-@dataclass
-class CRMPipelineEvent:
+@dataclass(frozen=True)
+class CRMPipelineEvent(_SlottedEvent):
     """Event payload for :class:`CRMPipelineAgent`."""
 
+    __slots__ = ("deal_id", "calendar_id", "followup_template")
+
     deal_id: str
     calendar_id: str
     followup_template: Dict[str, Any]
 
 
-@dataclass
-class SegmentationEvent:
+@dataclass(frozen=True)
+class SegmentationEvent(_SlottedEvent):
     """Event payload for :class:`SegmentationAdTargetingAgent`."""
 
+    __slots__ = ("segments", "budget_per_segment")
+
     segments: List[Dict[str, Any]]
     budget_per_segment: int
 
 
-@dataclass
-class IntegrationRequest:
+@dataclass(frozen=True)
+class IntegrationRequest(_SlottedEvent):
     """Event payload for :class:`IntegrationAgent`."""
 
+    __slots__ = ("name",)
+
     name: str
 
 
 __all__ = [
+    "EventEnvelope",
+    "json_default",
     "LeadCaptureEvent",
     "ChatbotEvent",
     "CRMPipelineEvent",
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+"""Write-behind persistence of the event history.
+
+:class:`HistoryWriter` takes already encoded ``event_history`` rows from the
+orchestrator and writes them from a background thread. The thread keeps one
+SQLite connection in WAL mode and commits everything that queued up while the
+previous transaction was running in a single :func:`src.db.write_events`
+call, so the cost of a commit and of the rollup updates is shared by the
+whole batch and the event loop never waits on disk I/O. The queue is bounded:
+when the database cannot keep up, :meth:`HistoryWriter.submit` blocks until
+there is room again instead of growing memory without limit, while
+:meth:`HistoryWriter.try_submit`, used from the event loop, drops the row.
+
+Batches that fail because the database is locked are retried with
+exponential backoff before they are dropped. Written, failed, dropped and
+pending rows are reported as ``history_rows_*`` metrics of the ``history_writer`` job.
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from . import db
+from .tools.metrics_tools.metrics_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+#: ``OperationalError`` messages worth retrying a batch for.
+_TRANSIENT_ERRORS = ("database is locked", "database table is locked", "busy")
+
+
+def _is_transient(exc: sqlite3.Error) -> bool:
+    message = str(exc).lower()
+    return isinstance(exc, sqlite3.OperationalError) and any(
+        text in message for text in _TRANSIENT_ERRORS
+    )
+
+
+class HistoryWriter:
+    """Batch ``event_history`` inserts on a background thread.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file. Tables are created on first use.
+    max_queue:
+        Maximum number of rows waiting to be written. :meth:`submit` blocks
+        while the queue is full and :meth:`try_submit` drops the row.
+    batch_size:
+        Maximum number of rows committed in one transaction.
+    retries:
+        How often a batch failing with a transient error such as ``database
+        is locked`` is retried before its rows are dropped.
+    retry_delay:
+        Seconds to wait before the first retry; doubled for every further
+        attempt.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        retries: int = 3,
+        retry_delay: float = 0.1,
+    ) -> None:
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be positive")
+        if retries < 0 or retry_delay < 0:
+            raise ValueError("retries and retry_delay must not be negative")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._done = 0
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.batches = 0
+        self.failed = 0
+        self.dropped = 0
+        self.metrics = get_registry("history_writer")
+        self._labels = {"db": str(self.path)}
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+    def submit(self, row: tuple, *, timeout: float | None = None) -> None:
+        """Queue one row as returned by :func:`src.db.encode_event`.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer has been closed.
+        queue.Full
+            If ``timeout`` elapsed while the queue was full.
+        """
+        self.submit_many([row], timeout=timeout)
+
+    def submit_many(
+        self, rows: Iterable[tuple], *, timeout: float | None = None
+    ) -> None:
+        """Queue several rows in order."""
+        if self._closed:
+            raise RuntimeError("history writer is closed")
+        self._ensure_thread()
+        for row in rows:
+            with self._cond:
+                self._submitted += 1
+            try:
+                self._queue.put(row, timeout=timeout)
+            except queue.Full:
+                with self._cond:
+                    self._submitted -= 1
+                raise
+
+    def try_submit(self, row: tuple) -> bool:
+        """Queue one row without waiting, for callers on an event loop.
+
+        Returns ``False`` and counts the row as ``history_rows_dropped`` if
+        the queue is full.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("history writer is closed")
+        self._ensure_thread()
+        with self._cond:
+            self._submitted += 1
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._cond:
+                self._submitted -= 1
+                self.dropped += 1
+            self.metrics.inc("history_rows_dropped", 1, self._labels)
+            logger.warning(f"History queue for {self.path} is full; dropped a row")
+            return False
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted rows not yet committed."""
+        with self._cond:
+            return self._submitted - self._done
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every row submitted so far is committed.
+
+        Returns ``False`` if ``timeout`` elapsed first.
+        """
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._done >= target, timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Write all pending rows and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():  # pragma: no cover - disk stalled
+            logger.warning(f"History writer for {self.path} did not stop in time")
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="history-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = db.connect(self.path)
+        db.init_db(self.path)
+        return conn
+
+    def _run(self) -> None:
+        conn: sqlite3.Connection | None
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError) as exc:
+            logger.error(f"Cannot open history database {self.path}: {exc}")
+            conn = None
+        try:
+            stop = False
+            while not stop:
+                batch: List[tuple] = []
+                item = self._queue.get()
+                # Take whatever queued up while the last commit was running.
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write(conn, batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _write(self, conn: sqlite3.Connection | None, batch: List[tuple]) -> None:
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                if conn is None:
+                    raise sqlite3.OperationalError("database unavailable")
+                # The transaction is rolled back on errors, so a retry writes
+                # the whole batch again.
+                with conn:
+                    db.write_events(conn, batch)
+            except sqlite3.Error as exc:
+                if attempt < self.retries and _is_transient(exc):
+                    delay = self.retry_delay * 2**attempt
+                    attempt += 1
+                    logger.warning(
+                        f"Retrying {len(batch)} history rows for {self.path} "
+                        f"in {delay:.2f}s: {exc}"
+                    )
+                    self.metrics.inc("history_write_retries", 1, self._labels)
+                    time.sleep(delay)
+                    continue
+                self.failed += len(batch)
+                self.metrics.inc("history_rows_failed", len(batch), self._labels)
+                logger.error(
+                    f"Dropped {len(batch)} history rows for {self.path}: {exc}"
+                )
+            else:
+                self.batches += 1
+                self.metrics.inc("history_rows_written", len(batch), self._labels)
+                logger.debug(
+                    f"Wrote {len(batch)} history rows in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+            break
+        with self._cond:
+            self._done += len(batch)
+            self._cond.notify_all()
+            pending = self._submitted - self._done
+        self.metrics.set("history_rows_pending", pending, self._labels)
+
+
+# ----------------------------------------------------------------------
+# Process-wide writers
+# ----------------------------------------------------------------------
+_writers: Dict[Path, HistoryWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: str | Path | None = None) -> HistoryWriter:
+    """Return the shared writer for ``path`` (default: the configured DB)."""
+
+    key = Path(path) if path is not None else db._get_db_path()
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = _writers[key] = HistoryWriter(key)
+    return writer
+
+
+def flush_all(timeout: float | None = None) -> bool:
+    """Flush every shared writer; ``False`` if any timed out."""
+
+    return all(writer.flush(timeout) for writer in list(_writers.values()))
+
+
+def shutdown() -> None:
+    """Write pending rows and stop all shared writers."""
+
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(shutdown)
+
+
+__all__ = ["HistoryWriter", "flush_all", "get_writer", "shutdown"]
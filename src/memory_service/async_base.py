@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 
 class AsyncBaseMemoryService(ABC):
@@ -17,6 +17,16 @@ class AsyncBaseMemoryService(ABC):
     async def fetch(self, key: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Return up to ``top_k`` records associated with ``key`` asynchronously."""
 
+    async def store_many(self, key: str, payloads: Iterable[Dict[str, Any]]) -> bool:
+        """Persist several ``payloads`` under ``key`` asynchronously.
+
+        The default awaits :meth:`store` for every payload in order.
+        """
+        ok = True
+        for payload in payloads:
+            ok = await self.store(key, payload) and ok
+        return ok
+
     async def aclose(self) -> None:  # pragma: no cover - optional hook
         """Release any underlying resources."""
         return None
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 
 class BaseMemoryService(ABC):
@@ -16,3 +16,14 @@ class BaseMemoryService(ABC):
     @abstractmethod
     def fetch(self, key: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Return up to ``top_k`` records associated with ``key``."""
+
+    def store_many(self, key: str, payloads: Iterable[Dict[str, Any]]) -> bool:
+        """Persist several ``payloads`` under ``key``.
+
+        Backends able to write a batch in one round-trip should override this;
+        the default simply calls :meth:`store` for every payload.
+        """
+        ok = True
+        for payload in payloads:
+            ok = self.store(key, payload) and ok
+        return ok
@@ -2,41 +2,357 @@
 
 from __future__ import annotations
 
+from array import array
 import json
+import mmap
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from .base import BaseMemoryService
 import logging
 
 logger = logging.getLogger(__name__)
 
+#: First line of the sidecar index file.
+INDEX_HEADER = b'{"format": "file-memory-index", "version": 1}\n'
+
+_KEY_PREFIX = b'{"key": '
+_decoder = json.JSONDecoder()
+
+Entry = Tuple[str, int, int]
+
 
 class FileMemoryService(BaseMemoryService):
-    """Append events to a local JSONL file and read them back."""
+    """Append events to a local JSONL file and read them back.
 
-    def __init__(self, file_path: str | Path) -> None:
+    By default a sidecar index (``<file>.idx``) maps every key to the byte
+    offset and length of its records, so :meth:`fetch` reads only the last
+    ``top_k`` records of a key instead of parsing the whole log. See
+    :class:`_LogIndex` for how the index is kept in sync with the log.
+
+    With ``index=False`` no sidecar is kept and :meth:`fetch` scans the
+    memory-mapped log backwards from the end instead, stopping as soon as
+    ``top_k`` records of the key are found (see :func:`tail_fetch`). That
+    avoids the startup cost of loading or building the index and suits logs
+    where lookups target recently written keys.
+    """
+
+    def __init__(self, file_path: str | Path, *, index: bool = True) -> None:
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         self.file_path.touch(exist_ok=True)
+        self._index = _index_for(self.file_path) if index else None
+
+    @property
+    def index_path(self) -> Path | None:
+        """Location of the sidecar index, ``None`` without an index."""
+        return self._index.index_path if self._index else None
 
     def store(self, key: str, payload: Dict[str, Any]) -> bool:
-        record = {"key": key, "data": payload}
-        with self.file_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record) + "\n")
+        self._append(key, [payload])
         logger.info(f"Stored event for key={key} in {self.file_path}")
         return True
 
+    def store_many(self, key: str, payloads: Iterable[Dict[str, Any]]) -> bool:
+        count = self._append(key, payloads)
+        logger.info(f"Stored {count} events for key={key} in {self.file_path}")
+        return True
+
+    def _append(self, key: str, payloads: Iterable[Dict[str, Any]]) -> int:
+        if self._index is not None:
+            return self._index.append(key, payloads)
+        lines = [_encode_record(key, payload) for payload in payloads]
+        with self.file_path.open("ab") as fh:
+            fh.write(b"".join(lines))
+        return len(lines)
+
     def fetch(self, key: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        if not self.file_path.exists():
+        if top_k <= 0 or not self.file_path.exists():
+            return []
+        if self._index is None:
+            return tail_fetch(self.file_path, key, top_k)
+        return self._index.fetch(key, top_k)
+
+
+def tail_fetch(path: str | Path, key: str, top_k: int) -> List[Dict[str, Any]]:
+    """Return the newest ``top_k`` records of ``key`` by reading ``path`` backwards.
+
+    The log is memory-mapped and walked from the end one line at a time with
+    :meth:`mmap.mmap.rfind`, so only the lines after the ``top_k``-th match
+    from the end are touched. Lines are tested with byte comparisons before
+    any JSON is decoded: lines written by :class:`FileMemoryService` start
+    with ``{"key": <key>,`` and are skipped unless that prefix matches; other
+    lines are only parsed if they contain the encoded key at all.
+    """
+
+    encoded_key = json.dumps(key).encode()
+    prefix = _KEY_PREFIX + encoded_key + b","
+    results: List[Dict[str, Any]] = []
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
             return results
-        with self.file_path.open("r", encoding="utf-8") as fh:
-            for line in fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0 and len(results) < top_k:
+                start = mm.rfind(b"\n", 0, end - 1) + 1
+                if mm.find(_KEY_PREFIX, start, start + len(_KEY_PREFIX)) == start:
+                    candidate = mm.find(prefix, start, start + len(prefix)) == start
+                else:
+                    candidate = mm.find(encoded_key, start, end) != -1
+                if candidate:
+                    try:
+                        rec = json.loads(mm[start:end])
+                    except ValueError:
+                        rec = None
+                    if isinstance(rec, dict) and rec.get("key") == key:
+                        results.append(rec.get("data", {}))
+                end = start
+    results.reverse()
+    return results
+
+
+class _LogIndex:
+    """In-memory key index of one JSONL log, persisted to a sidecar file.
+
+    The sidecar holds one ``<json key>\\t<offset>\\t<length>`` line per record
+    and is only ever appended to. It is loaded once per process and log, and
+    every append writes the new records to the log and their entries to the
+    sidecar. Records appended by other processes are indexed from the end of
+    the log before each read or write. A missing or corrupt sidecar, or one
+    describing a different file, is rebuilt by scanning the log.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.lock = threading.Lock()
+        self.offsets: Dict[str, array[int]] = {}
+        self.lengths: Dict[str, array[int]] = {}
+        # Log offset up to which every record is indexed.
+        self.end = 0
+        with self.lock:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Reads and writes
+    # ------------------------------------------------------------------
+    def append(self, key: str, payloads: Iterable[Dict[str, Any]]) -> int:
+        lines = [_encode_record(key, payload) for payload in payloads]
+        if not lines:
+            return 0
+        with self.lock:
+            self._catch_up()
+            with self.path.open("ab") as fh:
+                offset = fh.seek(0, os.SEEK_END)
+                fh.write(b"".join(lines))
+            entries: List[Entry] = []
+            for line in lines:
+                entries.append((key, offset, len(line)))
+                offset += len(line)
+            self._add(entries)
+            self._persist(entries)
+        return len(lines)
+
+    def fetch(self, key: str, top_k: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            self._catch_up()
+            records = self._read(key, top_k)
+            if records is None:
+                logger.warning(f"{self.index_path} does not match the log")
+                self._rebuild()
+                records = self._read(key, top_k) or []
+        return records
+
+    def _read(self, key: str, top_k: int) -> List[Dict[str, Any]] | None:
+        """Read the last ``top_k`` valid records of ``key``, newest last.
+
+        Returns ``None`` if an indexed record belongs to a different key.
+        """
+        offsets = self.offsets.get(key)
+        if not offsets:
+            return []
+        lengths = self.lengths[key]
+        results: List[Dict[str, Any]] = []
+        with self.path.open("rb") as fh:
+            fd = fh.fileno()
+            for idx in range(len(offsets) - 1, -1, -1):
+                raw = os.pread(fd, lengths[idx], offsets[idx])
                 try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if rec.get("key") == key:
-                    results.append(rec.get("data", {}))
-        return results[-top_k:]
+                    rec = json.loads(raw)
+                except ValueError:
+                    if _record_key(raw) != key:
+                        return None
+                    continue  # damaged record, skipped like before
+                if not isinstance(rec, dict) or rec.get("key") != key:
+                    return None
+                results.append(rec.get("data", {}))
+                if len(results) == top_k:
+                    break
+        results.reverse()
+        return results
+
+    def _scan(self, start: int, stop: int | None = None) -> Iterator[Entry]:
+        """Yield entries of complete records in ``[start, stop)`` of the log.
+
+        Only the key of each record is decoded. Lines that are not records
+        are skipped, and so is a trailing line that is still being written.
+        """
+        with self.path.open("rb") as fh:
+            fh.seek(start)
+            offset = start
+            for line in fh:
+                if stop is not None and offset >= stop:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                key = _record_key(line)
+                if key is not None:
+                    yield key, offset, len(line)
+                offset += len(line)
+                self.end = max(self.end, offset)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _add(self, entries: Iterable[Entry]) -> None:
+        offsets, lengths = self.offsets, self.lengths
+        end = self.end
+        for key, offset, length in entries:
+            if key not in offsets:
+                offsets[key] = array("q")
+                lengths[key] = array("q")
+            offsets[key].append(offset)
+            lengths[key].append(length)
+            end = max(end, offset + length)
+        self.end = end
+
+    def _persist(self, entries: List[Entry]) -> None:
+        if entries:
+            with self.index_path.open("ab") as fh:
+                fh.write(_encode_entries(entries))
+
+    def _catch_up(self) -> None:
+        """Index records appended to the log since it was last indexed."""
+        size = self.path.stat().st_size
+        if size == self.end:
+            return
+        if size < self.end:
+            logger.warning(f"{self.path} shrank; rebuilding its index")
+            self._rebuild()
+            return
+        entries = list(self._scan(self.end))
+        self._add(entries)
+        self._persist(entries)
+
+    def _rebuild(self) -> None:
+        logger.info(f"Rebuilding memory index {self.index_path}")
+        self.offsets, self.lengths, self.end = {}, {}, 0
+        entries = list(self._scan(0))
+        self._add(entries)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(INDEX_HEADER)
+            fh.write(_encode_entries(entries))
+        os.replace(tmp, self.index_path)
+
+    def _load(self) -> None:
+        """Load the sidecar, rebuilding it if it does not match the log."""
+        try:
+            data = self.index_path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        lines = data[len(INDEX_HEADER) :].split(b"\n")
+        if not data.startswith(INDEX_HEADER) or lines[-1]:
+            # Missing, foreign, or cut off in the middle of an entry.
+            self._rebuild()
+            return
+
+        entries = lines[:-1]
+        try:
+            if entries and not self._matches_log(_parse_entry(entries[-1], {})):
+                self._rebuild()
+                return
+            self._load_entries(entries)
+        except ValueError:
+            self._rebuild()
+            return
+        self._catch_up()
+
+    def _load_entries(self, lines: List[bytes]) -> None:
+        # Several processes may append to the same sidecar: entries that were
+        # recorded twice are dropped and the log is scanned for any records
+        # that were never recorded.
+        offsets, lengths = self.offsets, self.lengths
+        keys: Dict[bytes, str] = {}
+        end = 0
+        for line in lines:
+            key, offset, length = _parse_entry(line, keys)
+            if offset < end:
+                continue
+            if offset > end:
+                self._add(list(self._scan(end, offset)))
+            if key not in offsets:
+                offsets[key] = array("q")
+                lengths[key] = array("q")
+            offsets[key].append(offset)
+            lengths[key].append(length)
+            end = offset + length
+        self.end = max(self.end, end)
+
+    def _matches_log(self, entry: Entry) -> bool:
+        key, offset, length = entry
+        with self.path.open("rb") as fh:
+            raw = os.pread(fh.fileno(), length, offset)
+        return len(raw) == length and raw.endswith(b"\n") and _record_key(raw) == key
+
+
+_indexes: Dict[Path, _LogIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_for(path: Path) -> _LogIndex:
+    """Return the index shared by every service using the log at ``path``."""
+    key = path.resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = _LogIndex(path)
+    return index
+
+
+def _encode_record(key: str, payload: Dict[str, Any]) -> bytes:
+    return (json.dumps({"key": key, "data": payload}) + "\n").encode()
+
+
+def _record_key(line: bytes) -> str | None:
+    """Return the key of a JSONL record, decoding only the key if possible."""
+    if line.startswith(_KEY_PREFIX):
+        try:
+            key, _ = _decoder.raw_decode(line.decode(), len(_KEY_PREFIX))
+        except ValueError:
+            key = None
+        if isinstance(key, str):
+            return key
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return None
+    key = rec.get("key") if isinstance(rec, dict) else None
+    return key if isinstance(key, str) else None
+
+
+def _parse_entry(line: bytes, keys: Dict[bytes, str]) -> Entry:
+    raw_key, offset, length = line.rsplit(b"\t", 2)
+    key = keys.get(raw_key)
+    if key is None:
+        key = keys[raw_key] = json.loads(raw_key)
+    return key, int(offset), int(length)
+
+
+def _encode_entries(entries: Iterable[Entry]) -> bytes:
+    return b"".join(
+        f"{json.dumps(key)}\t{offset}\t{length}\n".encode()
+        for key, offset, length in entries
+    )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import types
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from .base import BaseMemoryService
 import logging
@@ -44,6 +44,18 @@ class RedisMemoryService(BaseMemoryService):
             logger.error(f"Redis store failed for key={key}: {exc}")
             return False
 
+    def store_many(self, key: str, payloads: Iterable[Dict[str, Any]]) -> bool:
+        values = [json.dumps(payload) for payload in payloads]
+        if not values:
+            return True
+        try:
+            self.client.rpush(key, *values)
+            logger.info(f"Stored {len(values)} events for key={key} in Redis")
+            return True
+        except Exception as exc:  # pragma: no cover - runtime errors
+            logger.error(f"Redis store failed for key={key}: {exc}")
+            return False
+
     def fetch(self, key: str, top_k: int = 5) -> List[Dict[str, Any]]:
         try:
             raw = self.client.lrange(key, -top_k, -1)
@@ -46,7 +46,6 @@ from .agents.operations.procurement_agent import ProcurementAgent
 from .agents.sales.revops_agent import RevOpsAgent
 from .agents.integration_agent import IntegrationAgent
 
-
 logger = logging.getLogger(__name__)
 
 USE_LLM_PLANNER = False
@@ -124,7 +123,9 @@ class Orchestrator(BaseOrchestrator):
         backend = memory_backend or settings.MEMORY_BACKEND
         if backend == "file":
             path = memory_file or settings.MEMORY_FILE_PATH
-            memory: BaseMemoryService = FileMemoryService(path)
+            memory: BaseMemoryService = FileMemoryService(
+                path, index=settings.MEMORY_FILE_INDEX
+            )
         elif backend == "redis":
             url = settings.MEMORY_REDIS_URL
             memory = RedisMemoryService(url)
@@ -181,22 +182,34 @@ class Orchestrator(BaseOrchestrator):
     # --- planning callbacks -------------------------------------------------
 
     async def _on_lead_won(self, payload: dict) -> None:
-        """Trigger material planning after a lead is won."""
+        """Trigger material planning after a lead is won.
+
+        The follow-up event is emitted without waiting for procurement so the
+        publisher of ``Lead.Won`` is not held up by the downstream chain.
+        Events for the same deal are still delivered in order.
+        """
         if USE_LLM_PLANNER:
             try:
                 gpt_plan("plan materials", ["Project.MaterialsNeeded"])
             except Exception as exc:  # pragma: no cover - network failures
                 logger.warning(f"LLM planner failed: {exc}")
-        await run_maybe_async(self.bus.publish, "Project.MaterialsNeeded", payload)
+        await self._emit("Project.MaterialsNeeded", payload, key=payload.get("deal_id"))
 
     async def _on_materials_resolved(self, payload: dict) -> None:
         """Schedule project kickoff once materials are procured."""
-        await run_maybe_async(
-            self.bus.publish,
+        await self._emit(
             "Email.SendKickoff",
             {"project_id": payload.get("project_id")},
+            key=payload.get("project_id"),
         )
 
+    async def _emit(self, topic: str, payload: dict, *, key: Any = None) -> None:
+        """Emit ``topic`` without waiting, or publish it on a synchronous bus."""
+        if isinstance(self.bus, AsyncEventBus):
+            self.bus.emit(topic, payload, key=key)
+        else:
+            await run_maybe_async(self.bus.publish, topic, payload)
+
     async def monthly_tick(self) -> None:
         """Emit the RevOps analysis cron event."""
         await run_maybe_async(self.bus.publish, "RevOps.Analyze", {"tenant_id": "demo"})
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+"""Retention and archival of the ``event_history`` table.
+
+:func:`apply_retention` keeps the hot history database small. Events older
+than the configured TTL are exported month by month to gzip compressed JSON
+Lines files (``event_history-YYYY-MM.jsonl.gz``) and then deleted from the
+table in short transactions, so the history writer is never locked out for
+long. Archives older than their own TTL are removed, and the database file is
+compacted once enough pages have been freed. Run it periodically with
+``brookside-cli history-retention``.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+from typing import Dict, Iterator, List, Tuple
+
+from . import db
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "event_history-"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+#: Fraction of free pages above which the database file is vacuumed.
+VACUUM_THRESHOLD = 0.25
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class RetentionReport:
+    """Outcome of one :func:`apply_retention` run."""
+
+    cutoff: str
+    exported: Dict[str, int] = field(default_factory=dict)
+    deleted: int = 0
+    archives: List[str] = field(default_factory=list)
+    pruned: List[str] = field(default_factory=list)
+    vacuumed: bool = False
+    dry_run: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "cutoff": self.cutoff,
+            "exported": dict(self.exported),
+            "deleted": self.deleted,
+            "archives": list(self.archives),
+            "pruned": list(self.pruned),
+            "vacuumed": self.vacuumed,
+            "dry_run": self.dry_run,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Partitions
+# ---------------------------------------------------------------------------
+
+
+def _to_ts(moment: datetime) -> int:
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_ts(ts: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ts)
+
+
+def _next_month(moment: datetime) -> datetime:
+    return datetime(moment.year + moment.month // 12, moment.month % 12 + 1, 1)
+
+
+def partitions(conn: sqlite3.Connection, cutoff: int) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``(month, start, end)`` ``ts`` ranges of rows older than ``cutoff``.
+
+    Months are ``YYYY-MM`` strings in UTC. Only the oldest ``ts`` is looked
+    up, through ``idx_event_history_ts``, so the table is never scanned; the
+    last range ends at ``cutoff``.
+    """
+
+    (oldest,) = conn.execute("SELECT MIN(ts) FROM event_history").fetchone()
+    if oldest is None or oldest >= cutoff:
+        return
+    first = _from_ts(oldest)
+    month = datetime(first.year, first.month, 1)
+    while _to_ts(month) < cutoff:
+        following = _next_month(month)
+        yield month.strftime("%Y-%m"), _to_ts(month), min(_to_ts(following), cutoff)
+        month = following
+
+
+def archive_path(archive_dir: Path, month: str) -> Path:
+    """Return the archive file of ``month`` in ``archive_dir``."""
+
+    return Path(archive_dir) / f"{ARCHIVE_PREFIX}{month}{ARCHIVE_SUFFIX}"
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+def _encode_line(row: sqlite3.Row) -> str:
+    # ``payload`` and ``result`` hold JSON text, possibly compressed, and are
+    # embedded without being decoded.
+    payload = db.json_text(row["payload"])
+    result = db.json_text(row["result"]) or "null"
+    return (
+        f'{{"id": {row["id"]}, "team": {json.dumps(row["team"])}, '
+        f'"event_type": {json.dumps(row["event_type"])}, '
+        f'"payload": {payload}, "result": {result}, '
+        f'"timestamp": {json.dumps(row["timestamp"])}, "ts": {row["ts"]}, '
+        f'"duration_ms": {json.dumps(row["duration_ms"])}}}\n'
+    )
+
+
+def export_range(conn: sqlite3.Connection, start: int, end: int, path: Path) -> int:
+    """Append rows with ``start <= ts < end`` to the archive at ``path``.
+
+    Rows are streamed in ``ts`` order into a new gzip member. The member is
+    written next to the archive and moved into place with :func:`os.replace`
+    after being synced to disk, so an interrupted export never leaves a
+    truncated archive behind. Returns the number of exported rows.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    if path.exists():
+        shutil.copyfile(path, tmp)
+    count = 0
+    try:
+        with open(tmp, "ab") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as out:
+                rows = conn.execute(
+                    "SELECT id, team, event_type, payload, result, timestamp, ts,"
+                    " duration_ms\nFROM event_history"
+                    " WHERE ts >= ? AND ts < ? ORDER BY ts, id",
+                    (start, end),
+                )
+                for row in rows:
+                    out.write(_encode_line(row))
+                    count += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+        if count:
+            os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
+
+
+def iter_archive(path: str | Path) -> Iterator[dict]:
+    """Yield the events stored in an archive written by :func:`export_range`."""
+
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            yield json.loads(line)
+
+
+def _delete_range(
+    conn: sqlite3.Connection, start: int, end: int, batch_size: int
+) -> int:
+    deleted = 0
+    while True:
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM event_history WHERE id IN ("
+                "SELECT id FROM event_history WHERE ts >= ? AND ts < ? LIMIT ?)",
+                (start, end, batch_size),
+            )
+        deleted += cur.rowcount
+        if cur.rowcount < batch_size:
+            return deleted
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+
+def prune_archives(archive_dir: Path, before: datetime) -> List[str]:
+    """Delete archives of months that ended before ``before``."""
+
+    pruned: List[str] = []
+    for path in sorted(Path(archive_dir).glob(f"{ARCHIVE_PREFIX}*{ARCHIVE_SUFFIX}")):
+        month = path.name[len(ARCHIVE_PREFIX) : -len(ARCHIVE_SUFFIX)]
+        try:
+            start = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            continue
+        if _next_month(start) <= before:
+            path.unlink()
+            pruned.append(path.name)
+    return pruned
+
+
+def compact(conn: sqlite3.Connection, *, threshold: float = VACUUM_THRESHOLD) -> bool:
+    """Checkpoint the WAL and ``VACUUM`` if enough pages are free.
+
+    Returns ``True`` when the file was vacuumed. A database busy with other
+    transactions is left as it is and retried on the next run.
+    """
+
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        (pages,) = conn.execute("PRAGMA page_count").fetchone()
+        (free,) = conn.execute("PRAGMA freelist_count").fetchone()
+        if not pages or free / pages < threshold:
+            return False
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.OperationalError as exc:
+        logger.warning(f"Skipping history compaction: {exc}")
+        return False
+    return True
+
+
+def apply_retention(
+    *,
+    ttl_days: float | None = None,
+    archive_dir: str | Path | None = None,
+    archive: bool = True,
+    archive_ttl_days: float | None = None,
+    vacuum: bool = True,
+    dry_run: bool = False,
+    now: datetime | None = None,
+    batch_size: int = 5_000,
+    path: Path | None = None,
+) -> RetentionReport:
+    """Archive and delete history older than ``ttl_days``.
+
+    Parameters
+    ----------
+    ttl_days:
+        Age in days after which events leave the hot table. Defaults to
+        ``settings.HISTORY_TTL_DAYS``.
+    archive_dir:
+        Directory receiving the monthly archives. Defaults to
+        ``settings.HISTORY_ARCHIVE_DIR``.
+    archive:
+        Export rows before deleting them. With ``False`` expired rows are
+        dropped without a copy.
+    archive_ttl_days:
+        Age in days after which whole monthly archives are deleted. Defaults
+        to ``settings.HISTORY_ARCHIVE_TTL_DAYS``; ``None`` keeps them.
+    vacuum:
+        Compact the database file afterwards, see :func:`compact`.
+    dry_run:
+        Only count the rows that would be archived per month.
+    now:
+        Reference time in UTC, mainly for tests.
+    batch_size:
+        Rows deleted per transaction.
+    path:
+        History database. Defaults to the configured database.
+
+    Raises
+    ------
+    ValueError
+        If no TTL is given or configured.
+    """
+
+    ttl_days = ttl_days if ttl_days is not None else settings.HISTORY_TTL_DAYS
+    if ttl_days is None:
+        raise ValueError("no history TTL given or configured (HISTORY_TTL_DAYS)")
+    if archive_ttl_days is None:
+        archive_ttl_days = settings.HISTORY_ARCHIVE_TTL_DAYS
+    archive_dir = Path(archive_dir or settings.HISTORY_ARCHIVE_DIR)
+    now = now or datetime.utcnow()
+    cutoff = _to_ts(now - timedelta(days=ttl_days))
+    report = RetentionReport(cutoff=_from_ts(cutoff).isoformat(), dry_run=dry_run)
+
+    db.init_db(path)
+    conn = db.get_connection(path)
+    for month, start, end in list(partitions(conn, cutoff)):
+        if dry_run:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM event_history WHERE ts >= ? AND ts < ?",
+                (start, end),
+            ).fetchone()
+            if count:
+                report.exported[month] = count
+            continue
+        # Rows are only deleted once their archive is on disk. A run that
+        # stops in between exports those rows again on the next run, so
+        # archives may repeat an ``id`` but never miss one.
+        if archive:
+            target = archive_path(archive_dir, month)
+            count = export_range(conn, start, end, target)
+            if count:
+                report.exported[month] = count
+                report.archives.append(str(target))
+        report.deleted += _delete_range(conn, start, end, batch_size)
+        logger.info(f"Retired history partition {month}")
+
+    if dry_run:
+        return report
+    if archive_ttl_days is not None and archive_dir.exists():
+        report.pruned = prune_archives(
+            archive_dir, now - timedelta(days=archive_ttl_days)
+        )
+    if vacuum and report.deleted:
+        report.vacuumed = compact(conn)
+    return report
+
+
+__all__ = [
+    "RetentionReport",
+    "apply_retention",
+    "archive_path",
+    "compact",
+    "export_range",
+    "iter_archive",
+    "partitions",
+    "prune_archives",
+]
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+"""Compile event dataclasses into specialised payload validators.
+
+``BaseOrchestrator`` used to turn raw payloads into event objects with
+``schema(**payload)``, which performs no type checks and reports problems as
+an opaque ``TypeError``. :func:`compile_schema` instead generates a dedicated
+validator function per event dataclass once, at startup. The generated code
+checks every field with inlined ``type(value) is ...`` tests, only falls back
+to the slower coercion helpers when a value has the wrong type, and builds the
+(slotted) result object without going through keyword-argument unpacking.
+
+Validation problems raise :class:`EventValidationError`, a ``TypeError``
+subclass listing every offending field::
+
+    >>> validate = compile_schema(LeadCaptureEvent)
+    >>> validate({"form_data": {}, "source": 3})
+    LeadCaptureEvent(form_data={}, source='3')
+    >>> validate({"source": "web", "extra": 1})
+    Traceback (most recent call last):
+    ...
+    EventValidationError: LeadCaptureEvent: form_data: field required; extra: unexpected field
+
+Checked field types are ``str``, ``int``, ``float``, ``bool``,
+``dict``/``Dict[...]``, ``list``/``List[X]`` and ``Optional[X]`` of those.
+Scalars are coerced where it is lossless (``"5"`` to ``5``, ``3`` to ``"3"``),
+tuples become lists and list elements are checked individually. Fields of any
+other type (nested dataclasses, tuples, datetimes, ...) are passed through
+unchecked, as ``cls(**payload)`` did.
+"""
+
+import dataclasses
+import logging
+import types
+import typing
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Literal, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+ExtraPolicy = Literal["forbid", "ignore"]
+
+Validator = Callable[[Any], Any]
+
+
+class EventValidationError(TypeError):
+    """Raised when a payload does not match its event schema.
+
+    Attributes
+    ----------
+    schema:
+        Name of the event class the payload was validated against.
+    errors:
+        ``(field, message)`` pairs. Nested list elements are reported as
+        ``field[index]``.
+    """
+
+    def __init__(self, schema: str, errors: List[Tuple[str, str]]) -> None:
+        self.schema = schema
+        self.errors = errors
+        details = "; ".join(
+            f"{field}: {msg}" if field else msg for field, msg in errors
+        )
+        super().__init__(f"{schema}: {details}")
+
+    def as_dicts(self) -> List[Dict[str, str]]:
+        """Return the errors as JSON-friendly dictionaries."""
+        return [{"field": field, "message": msg} for field, msg in self.errors]
+
+
+class _Invalid(Exception):
+    """Internal signal raised by coercion helpers."""
+
+    def __init__(self, message: str, suffix: str = "") -> None:
+        super().__init__(message)
+        self.message = message
+        self.suffix = suffix
+
+
+_MISSING = object()
+
+
+# ----------------------------------------------------------------------
+# Coercion helpers used on the slow path
+# ----------------------------------------------------------------------
+def _type_name(value: Any) -> str:
+    return type(value).__name__
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise _Invalid(f"expected str, got {_type_name(value)}")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise _Invalid("expected int, got bool")
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            raise _Invalid(f"expected int, got {value!r}") from None
+    raise _Invalid(f"expected int, got {_type_name(value)}")
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise _Invalid("expected float, got bool")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            raise _Invalid(f"expected float, got {value!r}") from None
+    raise _Invalid(f"expected float, got {_type_name(value)}")
+
+
+_BOOL_STRINGS = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "false": False,
+    "0": False,
+    "no": False,
+}
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _BOOL_STRINGS:
+        return _BOOL_STRINGS[value.strip().lower()]
+    raise _Invalid(f"expected bool, got {value!r}")
+
+
+def _to_dict(value: Any) -> dict:
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise _Invalid(f"expected object, got {_type_name(value)}")
+
+
+def _list_of(item: Callable[[Any], Any] | None, item_type: type | None):
+    """Return a coercer for lists whose elements are checked by ``item``."""
+
+    def _to_list(value: Any) -> list:
+        if isinstance(value, tuple):
+            value = list(value)
+        elif not isinstance(value, list):
+            raise _Invalid(f"expected list, got {_type_name(value)}")
+        if item is None:
+            return value
+        result = value
+        for idx, element in enumerate(value):
+            if type(element) is item_type:
+                continue
+            try:
+                coerced = item(element)
+            except _Invalid as exc:
+                raise _Invalid(exc.message, f"[{idx}]{exc.suffix}") from None
+            if result is value:
+                result = list(value)
+            result[idx] = coerced
+        return result
+
+    return _to_list
+
+
+def _optional(inner: Callable[[Any], Any]):
+    def _to_optional(value: Any) -> Any:
+        return None if value is None else inner(value)
+
+    return _to_optional
+
+
+_SCALARS: Dict[Any, Tuple[type, Callable[[Any], Any]]] = {
+    str: (str, _to_str),
+    int: (int, _to_int),
+    float: (float, _to_float),
+    bool: (bool, _to_bool),
+    dict: (dict, _to_dict),
+}
+
+
+_Check = Tuple["type | None", "Callable[[Any], Any] | None", "type | None"]
+
+
+def _checker(tp: Any) -> _Check:
+    """Return ``(fast_type, coercer, item_type)`` for annotation ``tp``.
+
+    ``fast_type`` is the exact type accepted without calling ``coercer``;
+    ``item_type`` is set for lists whose elements must additionally be of
+    that exact type. ``(None, None, None)`` means any value is accepted,
+    which is also the case for annotations not listed in the module docs.
+    """
+
+    if tp is Any or tp is object:
+        return None, None, None
+    origin = typing.get_origin(tp)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) != len(typing.get_args(tp)) and len(args) == 1:
+            fast, coerce, item = _checker(args[0])
+            if coerce is None:
+                return None, None, None
+            return (None if item else fast), _optional(coerce), None
+        return None, None, None
+    if origin is dict or tp is dict:
+        return (*_SCALARS[dict], None)
+    if origin is list or tp is list:
+        args = typing.get_args(tp)
+        item_fast, item_coerce, nested = (
+            _checker(args[0]) if args else (None, None, None)
+        )
+        if item_coerce is None:
+            return list, _list_of(None, None), None
+        coerce = _list_of(item_coerce, None if nested else item_fast)
+        if item_fast is None or nested:
+            return None, coerce, None
+        return list, coerce, item_fast
+    if tp in _SCALARS:
+        return (*_SCALARS[tp], None)
+    return None, None, None
+
+
+# ----------------------------------------------------------------------
+# Code generation
+# ----------------------------------------------------------------------
+def compile_schema(
+    cls: Type[Any], *, extra: ExtraPolicy = "forbid", check_items: bool = True
+) -> Validator:
+    """Return a validator building ``cls`` instances from payload mappings.
+
+    Parameters
+    ----------
+    cls:
+        Dataclass describing the payload.
+    extra:
+        ``"forbid"`` reports unknown keys as errors (matching the old
+        ``cls(**payload)`` behaviour), ``"ignore"`` drops them.
+    check_items:
+        Validate every element of typed lists. Disabling it makes
+        validation of list fields ``O(1)`` (useful for long chat transcripts)
+        at the cost of not reporting bad elements.
+    """
+
+    if not dataclasses.is_dataclass(cls):
+        raise TypeError(f"{cls!r} is not a dataclass")
+    hints = typing.get_type_hints(cls)
+    fields = [f for f in dataclasses.fields(cls) if f.init]
+    frozen = cls.__dataclass_params__.frozen
+    name = cls.__name__
+
+    env: Dict[str, Any] = {
+        "_cls": cls,
+        "_new": object.__new__,
+        "_setattr": object.__setattr__,
+        "_Mapping": Mapping,
+        "_MISSING": _MISSING,
+        "_Invalid": _Invalid,
+        "_Error": EventValidationError,
+        "_NAME": name,
+        "_FIELDS": frozenset(f.name for f in fields),
+    }
+    checks = []
+    for idx, field in enumerate(fields):
+        fast, coerce, item = _checker(hints.get(field.name, Any))
+        if not check_items and (fast is list or item is not None):
+            fast, coerce, item = list, _list_of(None, None), None
+        if coerce is not None:
+            env[f"_c{idx}"] = coerce
+        if fast is not None:
+            env[f"_t{idx}"] = fast
+        if item is not None:
+            env[f"_i{idx}"] = item
+        checks.append((field, fast, coerce, item))
+
+    build = ["        obj = _new(_cls)"]
+    for idx, field in enumerate(fields):
+        slot = cls.__dict__.get(field.name)
+        if frozen and isinstance(slot, types.MemberDescriptorType):
+            # Writing through the slot descriptor skips the frozen __setattr__.
+            env[f"_s{idx}"] = slot.__set__
+            build.append(f"        _s{idx}(obj, v{idx})")
+        elif frozen:
+            build.append(f"        _setattr(obj, {field.name!r}, v{idx})")
+        else:
+            build.append(f"        obj.{field.name} = v{idx}")
+    for field in dataclasses.fields(cls):
+        if field.init:
+            continue
+        if field.default is not dataclasses.MISSING:
+            env[f"_n_{field.name}"] = field.default
+            build.append(f"        _setattr(obj, {field.name!r}, _n_{field.name})")
+        elif field.default_factory is not dataclasses.MISSING:
+            env[f"_n_{field.name}"] = field.default_factory
+            build.append(f"        _setattr(obj, {field.name!r}, _n_{field.name}())")
+    if hasattr(cls, "__post_init__"):
+        build.append("        obj.__post_init__()")
+    build.append("        return obj")
+
+    # Slow path: collects every error, applies defaults and coercion.
+    lines = [
+        "def _slow(payload):",
+        "    if type(payload) is not dict:",
+        "        if not isinstance(payload, _Mapping):",
+        "            raise _Error(_NAME, [('', 'expected an object, got ' + type(payload).__name__)])",
+        "        payload = dict(payload)",
+        "    errors = None",
+        "    seen = 0",
+    ]
+    for idx, (field, fast, coerce, item) in enumerate(checks):
+        var = f"v{idx}"
+        lines.append(f"    {var} = payload.get({field.name!r}, _MISSING)")
+        lines.append(f"    if {var} is _MISSING:")
+        if field.default is not dataclasses.MISSING:
+            env[f"_d{idx}"] = field.default
+            lines.append(f"        {var} = _d{idx}")
+        elif field.default_factory is not dataclasses.MISSING:
+            env[f"_f{idx}"] = field.default_factory
+            lines.append(f"        {var} = _f{idx}()")
+        else:
+            lines.append("        errors = errors or []")
+            lines.append(f"        errors.append(({field.name!r}, 'field required'))")
+        lines.append("    else:")
+        lines.append("        seen += 1")
+        if coerce is not None:
+            guard = "True" if fast is None or item else f"type({var}) is not _t{idx}"
+            lines.append(f"        if {guard}:")
+            lines.append("            try:")
+            lines.append(f"                {var} = _c{idx}({var})")
+            lines.append("            except _Invalid as exc:")
+            lines.append("                errors = errors or []")
+            lines.append(
+                f"                errors.append(({field.name!r} + exc.suffix, exc.message))"
+            )
+    if extra == "forbid":
+        lines.append("    if len(payload) != seen:")
+        lines.append("        errors = errors or []")
+        lines.append("        for key in payload:")
+        lines.append("            if key not in _FIELDS:")
+        lines.append("                errors.append((str(key), 'unexpected field'))")
+    elif extra != "ignore":
+        raise ValueError(f"unknown extra policy: {extra}")
+    lines.append("    if errors:")
+    lines.append("        raise _Error(_NAME, errors)")
+    lines.append("    if True:")
+    lines.extend(build)
+
+    # Fast path: every field present with the expected type and nothing else.
+    lines += ["", "def validate(payload):", "    try:"]
+    lines += [f"        v{idx} = payload[{f.name!r}]" for idx, f in enumerate(fields)]
+    lines += ["    except (KeyError, TypeError):", "        return _slow(payload)"]
+    conds = [f"type(v{idx}) is _t{idx}" for idx, check in enumerate(checks) if check[1]]
+    conds.append(f"len(payload) == {len(fields)}")
+    lines.append(f"    if {' and '.join(conds)}:")
+    for idx, check in enumerate(checks):
+        if check[3] is not None:
+            lines.append(f"        for item in v{idx}:")
+            lines.append(f"            if type(item) is not _i{idx}:")
+            lines.append("                return _slow(payload)")
+    slow_checked = [
+        idx for idx, check in enumerate(checks) if check[2] and not check[1]
+    ]
+    if slow_checked:
+        lines.append("        try:")
+        lines += [f"            v{idx} = _c{idx}(v{idx})" for idx in slow_checked]
+        lines += ["        except _Invalid:", "            return _slow(payload)"]
+    lines += build
+    lines.append("    return _slow(payload)")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<validator {name}>", "exec"), env)
+    validator = env["validate"]
+    validator.__name__ = validator.__qualname__ = f"validate_{name}"
+    validator.__doc__ = f"Validate a payload and return a :class:`{name}`."
+    validator.__source__ = source
+    return validator
+
+
+_compiled: Dict[Type[Any], Validator] = {}
+
+
+def get_validator(cls: Type[Any]) -> Validator:
+    """Return the cached validator for ``cls``, compiling it on first use.
+
+    Classes that are not dataclasses, or whose annotations cannot be
+    resolved, fall back to ``cls(**payload)``.
+    """
+
+    validator = _compiled.get(cls)
+    if validator is None:
+        try:
+            validator = compile_schema(cls)
+        except (NameError, TypeError) as exc:
+            if dataclasses.is_dataclass(cls):
+                logger.warning(f"Cannot compile a validator for {cls!r}: {exc}")
+
+            def validator(payload: Any, _cls: Type[Any] = cls) -> Any:
+                return _cls(**payload)
+
+        _compiled[cls] = validator
+    return validator
+
+
+__all__ = [
+    "EventValidationError",
+    "ExtraPolicy",
+    "Validator",
+    "compile_schema",
+    "get_validator",
+]
@@ -6,12 +6,20 @@ from pathlib import Path
 from collections import defaultdict
 from typing import Any, Dict, List, Optional
 import asyncio
+import time
 from .utils import ActivityLogger
+from .events import EventEnvelope
 
-from . import db
+from . import db, history_writer, workflow_runs
 
 from .agents.planner_agent import PlannerAgent
-from .workflows.graph import GraphWorkflowDefinition, GraphWorkflowEngine
+from .workflows.graph import (
+    GraphWorkflowDefinition,
+    GraphWorkflowEngine,
+    WorkflowPlan,
+    compile_workflow,
+    load_plan,
+)
 
 from .team_orchestrator import TeamOrchestrator
 
@@ -28,7 +36,9 @@ class SolutionOrchestrator:
         workflows.
     persist_history:
         If ``True`` processed events are written to the SQLite history database
-        via :mod:`src.db`.
+        via :mod:`src.db`. Rows are written behind by
+        :class:`~src.history_writer.HistoryWriter`; call :meth:`flush_history`
+        to wait until they are committed.
     """
 
     def __init__(
@@ -44,6 +54,7 @@ class SolutionOrchestrator:
         self.history: list[dict] = []
         self.status: Dict[str, str] = {}
         self._subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+        self._subscriber_loops: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
         self.planner: Optional[PlannerAgent] = None
         self.activity_logger = ActivityLogger(log_path) if log_path else None
         self.persist_history = persist_history
@@ -55,6 +66,10 @@ class SolutionOrchestrator:
 
         queue: asyncio.Queue = asyncio.Queue()
         self._subscribers[team].append(queue)
+        try:
+            self._subscriber_loops[queue] = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
         return queue
 
     def unsubscribe(self, team: str, queue: asyncio.Queue) -> None:
@@ -62,34 +77,67 @@ class SolutionOrchestrator:
 
         if queue in self._subscribers.get(team, []):
             self._subscribers[team].remove(queue)
+        self._subscriber_loops.pop(queue, None)
 
     def _publish(self, team: str, message: dict) -> None:
-        """Send ``message`` to all queues subscribed to ``team``."""
+        """Send ``message`` to all queues subscribed to ``team``.
 
-        for q in list(self._subscribers.get(team, [])):
-            try:
-                q.put_nowait(message)
-            except asyncio.QueueFull:  # pragma: no cover - unlikely
-                pass
+        Events handled through the sync wrappers run on the shared background
+        loop, so queues owned by another loop are fed thread-safely.
+        """
 
-    async def handle_event(self, team: str, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Forward ``event`` to ``team`` and record the result."""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for q in list(self._subscribers.get(team, [])):
+            loop = self._subscriber_loops.get(q)
+            if loop is not None and loop is not current and not loop.is_closed():
+                loop.call_soon_threadsafe(self._put, q, message)
+            else:
+                self._put(q, message)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, message: dict) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:  # pragma: no cover - unlikely
+            pass
+
+    async def handle_event(
+        self, team: str, event: EventEnvelope | Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Forward ``event`` to ``team`` and record the result.
+
+        The same :class:`~src.events.EventEnvelope` is handed to the team,
+        kept in :attr:`history` and published to stream subscribers; the
+        payload is serialized once and queued for the background history
+        writer, so the handler never waits on the database. If the writer's
+        queue is full the row is dropped and counted rather than blocking
+        the event loop.
+        """
         orchestrator = self.teams.get(team)
         if not orchestrator:
             return {"status": "unknown_team"}
+        event = EventEnvelope.of(event)
+        started = time.perf_counter()
         result = await orchestrator.handle_event(event)
+        duration_ms = (time.perf_counter() - started) * 1000
         self.history.append({"team": team, "event": event, "result": result})
 
         if self.persist_history:
-            db.insert_event(
+            row = db.encode_event(
                 team,
-                str(event.get("type")),
-                event.get("payload", {}),
+                str(event.type),
+                event.raw_payload(),
                 result,
+                payload_json=event.payload_json(),
+                duration_ms=duration_ms,
             )
+            history_writer.get_writer().try_submit(row)
 
         if self.activity_logger:
-            agent_id = str(event.get("type", "unknown"))
+            agent_id = str(event.type or "unknown")
             summary = str(result.get("result", result))
             self.activity_logger.log(agent_id, summary)
 
@@ -97,7 +145,17 @@ class SolutionOrchestrator:
 
         return result
 
-    def handle_event_sync(self, team: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    def flush_history(self, timeout: float | None = None) -> bool:
+        """Block until queued history rows are committed.
+
+        Returns ``False`` if ``timeout`` elapsed first.
+        """
+
+        return history_writer.flush_all(timeout)
+
+    def handle_event_sync(
+        self, team: str, event: EventEnvelope | Dict[str, Any]
+    ) -> Dict[str, Any]:
         """Synchronous wrapper around :meth:`handle_event`."""
         from agentic_core import run_sync
 
@@ -131,24 +189,107 @@ class SolutionOrchestrator:
             raise RuntimeError("Planner is not configured")
         return self.planner.run({"goal": goal})
 
+    async def aexecute_goal(self, goal: str) -> Dict[str, Any]:
+        """Run the planner for ``goal`` on the running event loop.
+
+        Unlike :meth:`execute_goal` this can be awaited from async code such
+        as API handlers. Per-step progress is streamed to subscribers.
+
+        Raises
+        ------
+        RuntimeError
+            If the orchestrator was initialised without a planner.
+        """
+
+        if not self.planner:
+            raise RuntimeError("Planner is not configured")
+        return await self.planner.arun({"goal": goal})
+
     def execute_workflow(
-        self, workflow: str | Path | GraphWorkflowDefinition
+        self,
+        workflow: str | Path | GraphWorkflowDefinition | WorkflowPlan | None = None,
+        *,
+        max_parallel: int = 1,
+        team_limits: Optional[Dict[str, int]] = None,
+        run_id: str | None = None,
+        checkpoint: bool = False,
     ) -> Dict[str, Any]:
         """Execute a graph workflow definition.
 
-        ``workflow`` may be a path to a JSON file or a pre-loaded
-        :class:`GraphWorkflowDefinition` instance. Each node ``config`` must
+        ``workflow`` may be a path to a JSON file, a pre-loaded
+        :class:`GraphWorkflowDefinition` or a compiled :class:`WorkflowPlan`.
+        Files are compiled once and cached by content (see
+        :func:`~src.workflows.graph.load_plan`), so repeated executions of a
+        saved workflow skip parsing and validation. Each node ``config`` must
         include ``team`` and ``event`` fields which are forwarded to
-        :meth:`handle_event_sync`.
+        :meth:`handle_event_sync`. With ``max_parallel`` greater than one,
+        independent nodes run concurrently, limited per team by
+        ``team_limits`` (see :meth:`GraphWorkflowEngine.async_run`).
+
+        Passing ``run_id`` or ``checkpoint=True`` records the run and the
+        result of every node via :mod:`src.workflow_runs`; the returned
+        dictionary then includes the ``run_id``. If a run with ``run_id``
+        already exists it is resumed: completed nodes are not executed again
+        and ``workflow`` may be omitted.
         """
 
+        plan: WorkflowPlan | None
         if isinstance(workflow, (str, Path)):
-            definition = GraphWorkflowDefinition.from_file(workflow)
+            plan = load_plan(workflow)
+        elif isinstance(workflow, GraphWorkflowDefinition):
+            plan = compile_workflow(workflow)
+        else:
+            plan = workflow
+
+        if run_id is None and not checkpoint:
+            if plan is None:
+                raise ValueError("workflow is required unless resuming a run")
+            engine = GraphWorkflowEngine(plan)
+            return engine.run(self, max_parallel=max_parallel, team_limits=team_limits)
+
+        run = workflow_runs.get_run(run_id) if run_id else None
+        if run is None:
+            if plan is None:
+                raise KeyError(f"unknown workflow run: {run_id}")
+            run_id = workflow_runs.create_run(plan.definition, run_id)
         else:
-            definition = workflow
+            if plan is not None and plan.definition.to_dict() != run["definition"]:
+                raise ValueError(
+                    f"workflow does not match the definition of run {run_id}"
+                )
+            if plan is None:
+                plan = compile_workflow(
+                    GraphWorkflowDefinition.from_dict(run["definition"])
+                )
+            workflow_runs.set_run_status(run_id, "running")
+
+        engine = GraphWorkflowEngine(
+            plan, checkpoint=workflow_runs.RunCheckpoint(run_id)
+        )
+        try:
+            result = engine.run(
+                self, max_parallel=max_parallel, team_limits=team_limits
+            )
+        except Exception as exc:
+            workflow_runs.set_run_status(run_id, "failed", repr(exc))
+            raise
+        workflow_runs.set_run_status(run_id, "complete")
+        return {**result, "run_id": run_id}
+
+    def resume_workflow(self, run_id: str, **kwargs: Any) -> Dict[str, Any]:
+        """Resume the checkpointed run ``run_id`` from its last completed node.
 
-        engine = GraphWorkflowEngine(definition)
-        return engine.run(self)
+        Keyword arguments are forwarded to :meth:`execute_workflow`.
+
+        Raises
+        ------
+        KeyError
+            If no run with this ID has been recorded.
+        """
+
+        if workflow_runs.get_run(run_id) is None:
+            raise KeyError(f"unknown workflow run: {run_id}")
+        return self.execute_workflow(run_id=run_id, **kwargs)
 
     # ------------------------------------------------------------------
     # Async context manager implementation
@@ -159,8 +300,13 @@ class SolutionOrchestrator:
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        """Release resources such as async memory services on shutdown."""
+        """Release resources such as async memory services on shutdown.
+
+        Pending history rows are flushed to the database first.
+        """
 
+        if self.persist_history:
+            await asyncio.to_thread(self.flush_history)
         for team in self.teams.values():
             mem = getattr(team, "memory", None)
             if hasattr(mem, "aclose"):
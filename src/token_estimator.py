@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+"""Token estimators used by orchestrators to enforce token budgets.
+
+The estimators avoid third-party tokenizers so budgets can be enforced in
+restricted environments. :class:`BPEApproxEstimator` mimics the
+pre-tokenisation of common byte-pair encodings (words, digit groups and
+punctuation runs) which is far closer to real token counts than measuring
+``len(str(payload))``. It walks payloads structurally instead of
+stringifying them and caches the estimates of long strings and of list
+elements such as chat messages, so re-sending a conversation only pays for
+the messages that were added since the last call.
+"""
+
+import dataclasses
+import math
+import re
+from collections import OrderedDict
+from collections.abc import Mapping
+from threading import Lock
+from typing import Any, Hashable, Protocol, Tuple, runtime_checkable
+
+
+@runtime_checkable
+class TokenEstimator(Protocol):
+    """Interface implemented by token estimators."""
+
+    def estimate(self, payload: Any) -> int:
+        """Return the estimated number of tokens in ``payload``."""
+
+
+class LengthEstimator:
+    """Legacy estimator counting the characters of ``str(payload)``."""
+
+    def estimate(self, payload: Any) -> int:
+        return len(str(payload))
+
+
+_PIECE_RE = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+",
+    re.IGNORECASE,
+)
+
+_CacheKey = Tuple[str, int, int]
+
+#: Value types of flat messages that can be keyed without freezing them.
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class BPEApproxEstimator:
+    """Approximate BPE token counts using a pure-Python pre-tokeniser.
+
+    Parameters
+    ----------
+    cache_size:
+        Maximum number of cached estimates. Entries are keyed by a content
+        hash and evicted in least-recently-used order.
+    min_cached_length:
+        Strings shorter than this are counted directly as hashing them costs
+        about as much as estimating them.
+    """
+
+    #: Characters per token assumed for long words.
+    chars_per_token = 5
+
+    def __init__(self, cache_size: int = 8192, min_cached_length: int = 64) -> None:
+        self.cache_size = cache_size
+        self.min_cached_length = min_cached_length
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[_CacheKey, int] = OrderedDict()
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def estimate(self, payload: Any) -> int:
+        """Return the estimated token count of ``payload``."""
+
+        if isinstance(payload, str):
+            return self.estimate_text(payload)
+        if payload is None or isinstance(payload, bool):
+            return 1
+        if isinstance(payload, (int, float)):
+            return self._count(str(payload))
+        if isinstance(payload, Mapping):
+            total = 0
+            for key, value in payload.items():
+                total += self.estimate(key) + self.estimate(value) + 1
+            return total
+        if isinstance(payload, (list, tuple)):
+            return self.estimate_items(payload)
+        if dataclasses.is_dataclass(payload) and not isinstance(payload, type):
+            total = 0
+            for field in dataclasses.fields(payload):
+                value = getattr(payload, field.name)
+                total += self.estimate(field.name) + self.estimate(value) + 1
+            return total
+        return self.estimate_text(str(payload))
+
+    def estimate_text(self, text: str) -> int:
+        """Return the estimated token count of ``text``."""
+
+        if len(text) < self.min_cached_length:
+            return self._count(text)
+        key = ("s", hash(text), len(text))
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._remember(key, self._count(text))
+
+    def estimate_items(self, items: list | tuple) -> int:
+        """Return the estimated token count of a sequence such as chat messages.
+
+        Dictionary elements are cached by content so only elements that have
+        not been seen before are counted. Flat messages are keyed by their
+        items directly; as Python caches the hash of a string, a repeated
+        message costs a lookup rather than a pass over its content.
+        """
+
+        total = 0
+        for item in items:
+            key = self._item_key(item) if isinstance(item, dict) else None
+            if key is None:
+                total += self.estimate(item) + 1
+                continue
+            cached = self._lookup(key)
+            if cached is None:
+                cached = self._remember(key, self.estimate(item) + 1)
+            total += cached
+        return total
+
+    def cache_info(self) -> dict:
+        """Return cache statistics for monitoring."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _count(self, text: str) -> int:
+        """Count approximate tokens of ``text`` without caching."""
+
+        tokens = 0
+        for piece in _PIECE_RE.findall(text):
+            stripped = piece.lstrip(" ")
+            length = len(stripped)
+            if not length:  # run of spaces
+                tokens += 1
+            elif stripped[0].isalpha():
+                tokens += 1 if length <= 8 else math.ceil(length / self.chars_per_token)
+            elif stripped[0].isdigit():
+                tokens += math.ceil(length / 3)
+            elif stripped[0].isspace():
+                tokens += 1
+            else:
+                tokens += math.ceil(length / 2)
+        return tokens
+
+    def _item_key(self, item: dict) -> _CacheKey | None:
+        """Return a content hash key for ``item`` or ``None`` if unhashable.
+
+        Only structured items with nested values are frozen first.
+        """
+
+        values = item.values()
+        try:
+            if all(isinstance(value, _SCALARS) for value in values):
+                return ("i", hash(tuple(item.items())), len(item))
+            return ("i", hash(_freeze(item)), len(item))
+        except TypeError:
+            return None
+
+    def _lookup(self, key: _CacheKey) -> int | None:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _remember(self, key: _CacheKey, value: int) -> int:
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable representation of nested dicts and lists."""
+
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+#: Estimator shared by orchestrators that are not given their own instance.
+default_estimator = BPEApproxEstimator()
+
+
+__all__ = [
+    "TokenEstimator",
+    "LengthEstimator",
+    "BPEApproxEstimator",
+    "default_estimator",
+]
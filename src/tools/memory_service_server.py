@@ -17,8 +17,11 @@ app = FastAPI(title="Memory Service")
 # Initialise backend storage using a path supplied via environment variable.
 # Defaults to ``memory.jsonl`` inside the working directory so the container can
 # mount a persistent volume.
+# ``MEMORY_FILE_INDEX=false`` serves fetches by scanning the log backwards
+# instead of keeping a sidecar index.
 mem_path = Path(os.getenv("MEMORY_FILE_PATH", "memory.jsonl"))
-svc = FileMemoryService(mem_path)
+use_index = os.getenv("MEMORY_FILE_INDEX", "true").lower() not in {"0", "false", "no"}
+svc = FileMemoryService(mem_path, index=use_index)
 
 
 class StorePayload(BaseModel):
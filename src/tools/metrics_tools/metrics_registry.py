@@ -0,0 +1,349 @@
+"""In-process metrics registry with background Pushgateway flushing.
+
+Recording a metric only updates an in-memory series under a lock, so hot
+paths such as event handling and HTTP middleware never wait on the network.
+Each registry belongs to a Pushgateway ``job``; a daemon thread pushes the
+aggregated counters, gauges and histograms every ``interval`` seconds and the
+same data can be scraped in the Prometheus text format via :func:`render_all`.
+
+The registry is self-contained and speaks the Pushgateway HTTP protocol
+directly, so it works without ``prometheus_client`` being installed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import logging
+import threading
+import urllib.request
+from typing import Dict, Iterable, List, Literal, Mapping, Tuple
+from urllib.parse import quote
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+MetricKind = Literal["counter", "gauge", "histogram"]
+LabelKey = Tuple[Tuple[str, str], ...]
+
+#: Default histogram buckets in seconds, matching ``prometheus_client``.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    """Cumulative-on-render histogram of observed values."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+    def copy(self) -> "_Histogram":
+        clone = _Histogram(self.buckets)
+        clone.counts = list(self.counts)
+        clone.sum = self.sum
+        clone.count = self.count
+        return clone
+
+
+class _Family:
+    """All series of one metric name."""
+
+    __slots__ = ("kind", "buckets", "series")
+
+    def __init__(self, kind: MetricKind, buckets: Tuple[float, ...] = ()) -> None:
+        self.kind = kind
+        self.buckets = buckets
+        self.series: Dict[LabelKey, float | _Histogram] = {}
+
+
+def _label_key(labels: Mapping[str, object] | None) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Aggregate metrics for one Pushgateway job in memory.
+
+    Parameters
+    ----------
+    job:
+        Job name used as the Pushgateway grouping key and as the ``job`` label
+        when scraped through :func:`render_all`.
+    """
+
+    def __init__(self, job: str) -> None:
+        self.job = job
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._gateway: str | None = None
+
+    # ------------------------------------------------------------------
+    # Recording (hot path)
+    # ------------------------------------------------------------------
+    def _family(
+        self, name: str, kind: MetricKind, buckets: Tuple[float, ...] = ()
+    ) -> _Family:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _Family(kind, buckets)
+        elif family.kind != kind:
+            raise ValueError(f"metric {name} is a {family.kind}, not a {kind}")
+        return family
+
+    def inc(
+        self, name: str, value: float = 1.0, labels: Mapping[str, object] | None = None
+    ) -> None:
+        """Add ``value`` to the counter ``name``."""
+        if value < 0:
+            raise ValueError("counters can only increase")
+        key = _label_key(labels)
+        with self._lock:
+            series = self._family(name, "counter").series
+            series[key] = series.get(key, 0.0) + value
+
+    def set(
+        self, name: str, value: float, labels: Mapping[str, object] | None = None
+    ) -> None:
+        """Set the gauge ``name`` to ``value``."""
+        key = _label_key(labels)
+        with self._lock:
+            self._family(name, "gauge").series[key] = float(value)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Mapping[str, object] | None = None,
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Record ``value`` in the histogram ``name``."""
+        key = _label_key(labels)
+        with self._lock:
+            family = self._family(name, "histogram", tuple(buckets))
+            hist = family.series.get(key)
+            if hist is None:
+                hist = family.series[key] = _Histogram(family.buckets)
+            hist.observe(value)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, _Family]:
+        """Return a consistent copy of all metric families."""
+        with self._lock:
+            copies = {}
+            for name, family in self._families.items():
+                clone = _Family(family.kind, family.buckets)
+                clone.series = {
+                    key: value.copy() if isinstance(value, _Histogram) else value
+                    for key, value in family.series.items()
+                }
+                copies[name] = clone
+            return copies
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        return _render({name: [((), fam)] for name, fam in self.snapshot().items()})
+
+    def push(self, gateway: str | None = None, *, timeout: float = 5.0) -> bool:
+        """Push the current metrics to the Pushgateway now.
+
+        Returns ``True`` on success. Failures are logged, not raised.
+        """
+        gateway = gateway or self._gateway or settings.PROMETHEUS_PUSHGATEWAY
+        if not gateway:
+            return False
+        body = self.render().encode("utf-8")
+        if not body:
+            return True
+        if "://" not in gateway:
+            gateway = f"http://{gateway}"
+        url = f"{gateway.rstrip('/')}/metrics/job/{quote(self.job, safe='')}"
+        request = urllib.request.Request(
+            url, data=body, method="PUT", headers={"Content-Type": CONTENT_TYPE}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout):
+                pass
+        except Exception as exc:
+            logger.warning(f"Failed to push metrics for job={self.job}: {exc}")
+            return False
+        logger.debug(f"Pushed metrics for job={self.job} to {gateway}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+    def start_flusher(self, gateway: str, interval: float = 15.0) -> None:
+        """Push metrics to ``gateway`` every ``interval`` seconds in a thread."""
+        if interval <= 0:
+            raise ValueError("flush interval must be positive")
+        if self._thread and self._thread.is_alive():
+            return
+        self._gateway = gateway
+        self._stop.clear()
+
+        def _run() -> None:
+            while not self._stop.wait(interval):
+                self.push()
+
+        self._thread = threading.Thread(
+            target=_run, name=f"metrics-flusher-{self.job}", daemon=True
+        )
+        self._thread.start()
+
+    def stop_flusher(self, *, flush: bool = True) -> None:
+        """Stop the background thread, pushing a final time if ``flush``."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._thread = None
+        if flush:
+            self.push()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _render(families: Dict[str, List[Tuple[LabelKey, _Family]]]) -> str:
+    """Render ``families`` (each with extra labels per source) as text."""
+    lines: List[str] = []
+    for name in sorted(families):
+        sources = families[name]
+        lines.append(f"# TYPE {name} {sources[0][1].kind}")
+        for extra, family in sources:
+            for key, value in family.series.items():
+                labels = extra + key
+                if not isinstance(value, _Histogram):
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(value.buckets, value.counts):
+                    cumulative += count
+                    le = labels + (("le", _fmt_value(bound)),)
+                    lines.append(f"{name}_bucket{_fmt_labels(le)} {cumulative}")
+                inf = labels + (("le", "+Inf"),)
+                lines.append(f"{name}_bucket{_fmt_labels(inf)} {value.count}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(value.sum)}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {value.count}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+# ----------------------------------------------------------------------
+# Process-wide registries
+# ----------------------------------------------------------------------
+_registries: Dict[str, MetricsRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(job: str) -> MetricsRegistry:
+    """Return the shared registry for ``job``.
+
+    The first call for a job starts its background flusher when
+    ``PROMETHEUS_PUSHGATEWAY`` is configured.
+    """
+
+    registry = _registries.get(job)
+    if registry is not None:
+        return registry
+    with _registries_lock:
+        registry = _registries.get(job)
+        if registry is None:
+            registry = _registries[job] = MetricsRegistry(job)
+            if settings.PROMETHEUS_PUSHGATEWAY:
+                registry.start_flusher(
+                    settings.PROMETHEUS_PUSHGATEWAY,
+                    settings.PROMETHEUS_PUSH_INTERVAL,
+                )
+    return registry
+
+
+def render_all() -> str:
+    """Render every registry for scraping, labelling series with their job."""
+
+    merged: Dict[str, List[Tuple[LabelKey, _Family]]] = {}
+    for job, registry in list(_registries.items()):
+        for name, family in registry.snapshot().items():
+            sources = merged.setdefault(name, [])
+            if sources and sources[0][1].kind != family.kind:
+                logger.warning(f"Skipping metric {name} of job={job}: kind mismatch")
+                continue
+            sources.append(((("job", job),), family))
+    return _render(merged)
+
+
+def flush_all() -> None:
+    """Push every registry with an active flusher immediately."""
+
+    for registry in list(_registries.values()):
+        if registry._thread is not None:
+            registry.push()
+
+
+def shutdown() -> None:
+    """Stop all flushers after a final push."""
+
+    for registry in list(_registries.values()):
+        registry.stop_flusher()
+
+
+atexit.register(shutdown)
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "MetricsRegistry",
+    "flush_all",
+    "get_registry",
+    "render_all",
+    "shutdown",
+]
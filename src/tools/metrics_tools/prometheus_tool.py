@@ -1,36 +1,35 @@
 # Tools/metrics_tools/prometheus_tool.py
 
-import time
 import logging
-from ...config import settings
 
-try:  # pragma: no cover - optional dependency
-    from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
-except Exception:  # pragma: no cover - allow running without package
-    CollectorRegistry = Gauge = push_to_gateway = None
+from .metrics_registry import DEFAULT_BUCKETS, MetricsRegistry, get_registry
 
 logger = logging.getLogger(__name__)
 
 
 class PrometheusPusher:
+    """Record metrics for ``job`` without blocking on the network.
+
+    Values are aggregated in the job's shared :class:`MetricsRegistry`, whose
+    background flusher pushes them to ``PROMETHEUS_PUSHGATEWAY`` on an
+    interval. Collectors are reused across calls.
+    """
+
     def __init__(self, job: str):
-        self.registry = CollectorRegistry() if CollectorRegistry else None
         self.job = job
+        self.registry: MetricsRegistry = get_registry(job)
 
     def push_metric(self, name: str, value: float, labels: dict = None):
-        labels = labels or {}
-        if not all([Gauge, push_to_gateway, self.registry]):
-            logger.warning("prometheus_client not available; skipping metric push")
-            return
-        gauge = Gauge(
-            name,
-            f"{name} gauge",
-            labelnames=list(labels.keys()),
-            registry=self.registry,
-        )
-        gauge.labels(**labels).set(value)
-        timestamp = int(time.time())
-        logger.info(f"Pushing metric {name}={value} to Prometheus (job={self.job})")
-        push_to_gateway(
-            settings.PROMETHEUS_PUSHGATEWAY, job=self.job, registry=self.registry
-        )
+        """Set the gauge ``name`` to ``value``."""
+        logger.debug(f"Recording metric {name}={value} (job={self.job})")
+        self.registry.set(name, value, labels)
+
+    def inc(self, name: str, value: float = 1, labels: dict = None):
+        """Increment the counter ``name`` by ``value``."""
+        self.registry.inc(name, value, labels)
+
+    def observe(
+        self, name: str, value: float, labels: dict = None, buckets=DEFAULT_BUCKETS
+    ):
+        """Record ``value`` in the histogram ``name``."""
+        self.registry.observe(name, value, labels, buckets=buckets)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+"""SQLite persistence for resumable graph workflow runs.
+
+Every run started through
+:meth:`~src.solution_orchestrator.SolutionOrchestrator.execute_workflow` with
+a ``run_id`` (or ``checkpoint=True``) stores its workflow definition and the
+state of each node in the same database as :mod:`src.db`. When a process
+crashes or is redeployed mid-run, calling ``execute_workflow`` or
+``resume_workflow`` with the same run ID replays the recorded results of
+completed nodes and only executes the remaining ones.
+"""
+
+from datetime import datetime
+import json
+import sqlite3
+import uuid
+from typing import Dict, Mapping
+
+from . import db
+from .db import get_connection
+from .events import json_default
+from .workflows.graph import GraphWorkflowDefinition
+
+RUN_STATUSES = ("running", "complete", "failed")
+
+#: ``(database path, connection id)`` pairs whose tables are known to exist.
+_ready: set = set()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return the pooled connection, creating the run tables on first use."""
+
+    conn = get_connection()
+    key = (db._get_db_path().absolute(), id(conn))
+    if key not in _ready:
+        _create_tables(conn)
+        _ready.add(key)
+    return conn
+
+
+def init_runs() -> None:
+    """Create the workflow run tables if they do not yet exist."""
+
+    _connect()
+
+
+def _create_tables(conn: sqlite3.Connection) -> None:
+    with conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workflow_runs (
+                id TEXT PRIMARY KEY,
+                workflow TEXT NOT NULL,
+                definition TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workflow_run_nodes (
+                run_id TEXT NOT NULL REFERENCES workflow_runs(id),
+                node_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                record TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, node_id)
+            )
+            """
+        )
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+
+def create_run(definition: GraphWorkflowDefinition, run_id: str | None = None) -> str:
+    """Register a new run of ``definition`` and return its ID."""
+
+    run_id = run_id or uuid.uuid4().hex
+    now = datetime.utcnow().isoformat()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO workflow_runs\n"
+            "(id, workflow, definition, status, created_at, updated_at)\n"
+            "VALUES (?, ?, ?, 'running', ?, ?)",
+            (run_id, definition.name, json.dumps(definition.to_dict()), now, now),
+        )
+    return run_id
+
+
+def get_run(run_id: str) -> dict | None:
+    """Return the run ``run_id`` with the state of its nodes, or ``None``."""
+
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT * FROM workflow_runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        nodes = conn.execute(
+            "SELECT node_id, status, record, error, attempts, updated_at\n"
+            "FROM workflow_run_nodes WHERE run_id = ?",
+            (run_id,),
+        ).fetchall()
+    return {
+        "id": row["id"],
+        "workflow": row["workflow"],
+        "definition": json.loads(row["definition"]),
+        "status": row["status"],
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "nodes": {
+            node["node_id"]: {
+                "status": node["status"],
+                "record": json.loads(node["record"]) if node["record"] else None,
+                "error": node["error"],
+                "attempts": node["attempts"],
+                "updated_at": node["updated_at"],
+            }
+            for node in nodes
+        },
+    }
+
+
+def load_definition(run_id: str) -> GraphWorkflowDefinition:
+    """Return the workflow definition stored for ``run_id``.
+
+    Raises
+    ------
+    KeyError
+        If no run with this ID exists.
+    """
+
+    run = get_run(run_id)
+    if run is None:
+        raise KeyError(f"unknown workflow run: {run_id}")
+    return GraphWorkflowDefinition.from_dict(run["definition"])
+
+
+def set_run_status(run_id: str, status: str, error: str | None = None) -> None:
+    """Update the overall status of ``run_id``."""
+
+    if status not in RUN_STATUSES:
+        raise ValueError(f"invalid run status: {status}")
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE workflow_runs SET status = ?, error = ?, updated_at = ?\n"
+            "WHERE id = ?",
+            (status, error, datetime.utcnow().isoformat(), run_id),
+        )
+
+
+def list_runs(limit: int = 20, *, status: str | None = None) -> list[dict]:
+    """Return the most recently updated runs without node details."""
+
+    query = (
+        "SELECT id, workflow, status, error, created_at, updated_at\n"
+        "FROM workflow_runs"
+    )
+    params: list = []
+    if status is not None:
+        query += " WHERE status = ?"
+        params.append(status)
+    query += " ORDER BY updated_at DESC LIMIT ?"
+    params.append(limit)
+    with _connect() as conn:
+        return [dict(row) for row in conn.execute(query, params)]
+
+
+# ---------------------------------------------------------------------------
+# Nodes
+# ---------------------------------------------------------------------------
+
+
+def _set_node(
+    run_id: str,
+    node_id: str,
+    status: str,
+    *,
+    record: dict | None = None,
+    error: str | None = None,
+    attempt: bool = False,
+) -> None:
+    encoded = json.dumps(record, default=json_default) if record is not None else None
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO workflow_run_nodes\n"
+            "(run_id, node_id, status, record, error, attempts, updated_at)\n"
+            "VALUES (?, ?, ?, ?, ?, ?, ?)\n"
+            "ON CONFLICT (run_id, node_id) DO UPDATE SET\n"
+            "status = excluded.status, record = excluded.record,\n"
+            "error = excluded.error, updated_at = excluded.updated_at,\n"
+            "attempts = workflow_run_nodes.attempts + ?",
+            (
+                run_id,
+                node_id,
+                status,
+                encoded,
+                error,
+                int(attempt),
+                datetime.utcnow().isoformat(),
+                int(attempt),
+            ),
+        )
+
+
+def completed_nodes(run_id: str) -> Dict[str, dict]:
+    """Return the stored records of all completed nodes of ``run_id``."""
+
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT node_id, record FROM workflow_run_nodes\n"
+            "WHERE run_id = ? AND status = 'completed'",
+            (run_id,),
+        ).fetchall()
+    return {row["node_id"]: json.loads(row["record"]) for row in rows}
+
+
+class RunCheckpoint:
+    """Persist node state of one run for :class:`GraphWorkflowEngine`.
+
+    Implements :class:`src.workflows.graph.WorkflowCheckpoint`. Nodes are
+    marked ``running`` before they execute and ``completed`` or ``failed``
+    afterwards; only ``completed`` nodes are skipped when the run resumes,
+    so nodes interrupted mid-flight are executed again.
+
+    Parameters
+    ----------
+    run_id:
+        ID of a run created with :func:`create_run`.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+
+    def completed(self) -> Mapping[str, dict]:
+        return completed_nodes(self.run_id)
+
+    def node_started(self, node_id: str) -> None:
+        _set_node(self.run_id, node_id, "running", attempt=True)
+
+    def node_finished(self, node_id: str, record: dict) -> None:
+        _set_node(self.run_id, node_id, "completed", record=record)
+
+    def node_failed(self, node_id: str, error: BaseException) -> None:
+        _set_node(self.run_id, node_id, "failed", error=repr(error))
+
+
+__all__ = [
+    "RunCheckpoint",
+    "completed_nodes",
+    "create_run",
+    "get_run",
+    "init_runs",
+    "list_runs",
+    "load_definition",
+    "set_run_status",
+]
@@ -6,10 +6,36 @@ The expected JSON structure is defined in :doc:`workflow_schema.json` and is
 compatible with the objects emitted by the ReactFlow editor.
 """
 
+import asyncio
+import copy
+import hashlib
 import json
+import os
+import re
+import threading
+from collections import OrderedDict, deque
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+from agentic_core import run_sync
+
+from ..events import EventEnvelope
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type hints only
+    from ..solution_orchestrator import SolutionOrchestrator
 
 NodeType = Literal["agent", "tool"]
 
@@ -93,6 +119,281 @@ class GraphWorkflowDefinition:
         Path(path).write_text(json.dumps(self.to_dict(), indent=2))
 
 
+class WorkflowCheckpoint(Protocol):
+    """Persistence hooks used by :class:`GraphWorkflowEngine` to resume runs.
+
+    See :class:`src.workflow_runs.RunCheckpoint` for the SQLite backed
+    implementation.
+    """
+
+    def completed(self) -> Mapping[str, dict]:
+        """Return the records of nodes finished by earlier attempts."""
+
+    def node_started(self, node_id: str) -> None:
+        """Record that ``node_id`` began executing."""
+
+    def node_finished(self, node_id: str, record: dict) -> None:
+        """Record the result ``record`` of ``node_id``."""
+
+    def node_failed(self, node_id: str, error: BaseException) -> None:
+        """Record that ``node_id`` raised ``error``."""
+
+
+_REF_RE = re.compile(r"\{\{\s*nodes\.([^{}\s]+)\s*\}\}")
+
+#: Renders a node payload from the results of the nodes executed so far.
+PayloadTemplate = Callable[[Mapping[str, Any]], Any]
+
+
+def _resolve(results: Mapping[str, Any], ref: str) -> Any:
+    """Return the upstream value addressed by ``ref`` without copying it.
+
+    ``ref`` is ``<node id>`` optionally followed by dotted keys or list
+    indices into that node's result, e.g. ``capture.result.lead.email``.
+    """
+
+    node_id, *path = ref.split(".")
+    try:
+        value = results[node_id]
+        for key in path:
+            if isinstance(value, Mapping):
+                value = value[key]
+            elif isinstance(value, (list, tuple)):
+                value = value[int(key)]
+            else:
+                value = getattr(value, key)
+    except (KeyError, IndexError, ValueError, AttributeError) as exc:
+        raise ValueError(f"cannot resolve {{{{ nodes.{ref} }}}}: {exc!r}") from None
+    return value
+
+
+def _compile_template(value: Any, refs: set[str]) -> PayloadTemplate | None:
+    """Compile ``{{ nodes.<id>.<path> }}`` references in ``value``.
+
+    Returns ``None`` when ``value`` contains no references so static parts
+    of a payload are reused as they are. Other ``{{ ... }}`` text, such as
+    placeholders of an email template, is left untouched. Referenced node
+    IDs are added to ``refs``. A string consisting of a single reference
+    resolves to the referenced object itself; references embedded in longer
+    strings are formatted with :func:`str`.
+    """
+
+    if isinstance(value, str):
+        matches = list(_REF_RE.finditer(value))
+        if not matches:
+            return None
+        refs.update(m.group(1).split(".", 1)[0] for m in matches)
+        if len(matches) == 1 and matches[0].span() == (0, len(value)):
+            ref = matches[0].group(1)
+            return lambda results: _resolve(results, ref)
+        return lambda results: _REF_RE.sub(
+            lambda m: str(_resolve(results, m.group(1))), value
+        )
+
+    if isinstance(value, Mapping):
+        parts = {key: _compile_template(item, refs) for key, item in value.items()}
+        if not any(parts.values()):
+            return None
+        return lambda results: {
+            key: render(results) if render else copy.deepcopy(value[key])
+            for key, render in parts.items()
+        }
+
+    if isinstance(value, list):
+        items = [_compile_template(item, refs) for item in value]
+        if not any(items):
+            return None
+        return lambda results: [
+            render(results) if render else copy.deepcopy(item)
+            for render, item in zip(items, value)
+        ]
+
+    return None
+
+
+def _ancestors(node_id: str, predecessors: Mapping[str, List[str]]) -> set[str]:
+    seen: set[str] = set()
+    stack = list(predecessors[node_id])
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(predecessors[current])
+    return seen
+
+
+@dataclass(frozen=True)
+class WorkflowPlan:
+    """Validated, immutable execution plan of a :class:`GraphWorkflowDefinition`.
+
+    Plans are produced by :func:`compile_workflow` and hold everything the
+    engine derives from a definition: adjacency lists, in-degrees, the
+    sequential execution order, topological levels and the team and event of
+    every node, with events pre-wrapped in an
+    :class:`~src.events.EventEnvelope`. One plan can be shared by any number
+    of :class:`GraphWorkflowEngine` runs, each of which copies the in-degree
+    counters and, when dispatching a node, its payload.
+
+    ``templates`` maps the nodes whose payloads reference upstream results
+    to functions rendering the payload at dispatch time.
+    """
+
+    definition: GraphWorkflowDefinition
+    nodes: Mapping[str, NodeDefinition]
+    successors: Mapping[str, Tuple[str, ...]]
+    indegree: Mapping[str, int]
+    roots: Tuple[str, ...]
+    order: Mapping[str, int]
+    levels: Tuple[Tuple[str, ...], ...]
+    calls: Mapping[str, Tuple[Optional[str], Optional[EventEnvelope]]]
+    digest: Optional[str] = None
+    templates: Mapping[str, PayloadTemplate] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+
+def compile_workflow(
+    definition: GraphWorkflowDefinition, *, digest: str | None = None
+) -> WorkflowPlan:
+    """Validate ``definition`` and return its :class:`WorkflowPlan`.
+
+    Edges must reference known nodes and the graph must be acyclic; a cycle
+    anywhere raises :class:`ValueError` naming the nodes that could never
+    run. The definition is copied so later changes to it do not affect the
+    plan.
+    """
+
+    if not definition.nodes:
+        raise ValueError("workflow must contain at least one node")
+    definition = copy.deepcopy(definition)
+    nodes = {n.id: n for n in definition.nodes}
+
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+    indegree: Dict[str, int] = {node_id: 0 for node_id in nodes}
+    for edge in definition.edges:
+        if edge.source not in nodes or edge.target not in nodes:
+            raise ValueError("edge references unknown node")
+        successors[edge.source].append(edge.target)
+        indegree[edge.target] += 1
+
+    roots = tuple(node_id for node_id, deg in indegree.items() if deg == 0)
+    if not roots:
+        raise ValueError("workflow has no starting node or contains a cycle")
+
+    # Kahn's algorithm yields the sequential order; the level of a node is
+    # the length of the longest path from a root to it.
+    remaining = dict(indegree)
+    depth = dict.fromkeys(nodes, 0)
+    queue = deque(roots)
+    order: Dict[str, int] = {}
+    while queue:
+        node_id = queue.popleft()
+        order[node_id] = len(order)
+        for tgt in successors[node_id]:
+            depth[tgt] = max(depth[tgt], depth[node_id] + 1)
+            remaining[tgt] -= 1
+            if remaining[tgt] == 0:
+                queue.append(tgt)
+    if len(order) != len(nodes):
+        stuck = [n for n in nodes if n not in order]
+        listed = ", ".join(stuck[:10]) + (", ..." if len(stuck) > 10 else "")
+        raise ValueError(f"workflow contains a cycle; unreachable nodes: {listed}")
+
+    levels: List[List[str]] = [[] for _ in range(max(depth.values()) + 1)]
+    for node_id in order:
+        levels[depth[node_id]].append(node_id)
+
+    calls = {}
+    templates: Dict[str, PayloadTemplate] = {}
+    predecessors: Dict[str, List[str]] | None = None
+    for node_id, node in nodes.items():
+        team = node.config.get("team")
+        event = node.config.get("event")
+        if isinstance(event, Mapping):
+            event = EventEnvelope.of(event)
+            refs: set[str] = set()
+            template = _compile_template(event.raw_payload(), refs)
+            if template is not None:
+                # Data only flows along edges: a node may reference the
+                # results of nodes it (transitively) depends on.
+                if predecessors is None:
+                    predecessors = {n: [] for n in nodes}
+                    for src, targets in successors.items():
+                        for tgt in targets:
+                            predecessors[tgt].append(src)
+                unknown = refs - _ancestors(node_id, predecessors)
+                if unknown:
+                    raise ValueError(
+                        f"node {node_id} references results of nodes that are "
+                        f"not upstream of it: {', '.join(sorted(unknown))}"
+                    )
+                templates[node_id] = template
+        calls[node_id] = (team, event)
+
+    return WorkflowPlan(
+        definition=definition,
+        nodes=MappingProxyType(nodes),
+        successors=MappingProxyType({k: tuple(v) for k, v in successors.items()}),
+        indegree=MappingProxyType(indegree),
+        roots=roots,
+        order=MappingProxyType(order),
+        levels=tuple(tuple(level) for level in levels),
+        calls=MappingProxyType(calls),
+        digest=digest,
+        templates=MappingProxyType(templates),
+    )
+
+
+_PLAN_CACHE_SIZE = 128
+_plan_cache: OrderedDict[str, WorkflowPlan] = OrderedDict()
+_plan_files: Dict[str, Tuple[int, int, str]] = {}
+_plan_lock = threading.Lock()
+
+
+def load_plan(path: str | Path) -> WorkflowPlan:
+    """Return the compiled plan of the workflow file at ``path``.
+
+    Plans are cached by content hash. While the file's modification time and
+    size are unchanged the file is not read at all; when they change the
+    file is hashed and only parsed and validated again if its content
+    differs from every cached plan.
+    """
+
+    key = str(Path(path).resolve())
+    stat = os.stat(key)
+    with _plan_lock:
+        known = _plan_files.get(key)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            plan = _plan_cache.get(known[2])
+            if plan is not None:
+                _plan_cache.move_to_end(known[2])
+                return plan
+
+    data = Path(key).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    with _plan_lock:
+        plan = _plan_cache.get(digest)
+    if plan is None:
+        definition = GraphWorkflowDefinition.from_dict(json.loads(data))
+        plan = compile_workflow(definition, digest=digest)
+
+    with _plan_lock:
+        _plan_files[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        _plan_cache[digest] = plan
+        _plan_cache.move_to_end(digest)
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_plan_cache() -> None:
+    """Forget all cached workflow plans."""
+
+    with _plan_lock:
+        _plan_cache.clear()
+        _plan_files.clear()
+
+
 class GraphWorkflowEngine:
     """Execute :class:`GraphWorkflowDefinition` nodes in topological order.
 
@@ -101,24 +402,59 @@ class GraphWorkflowEngine:
     :meth:`~src.solution_orchestrator.SolutionOrchestrator.handle_event_sync`.
     Asynchronous flows use :meth:`~src.solution_orchestrator.SolutionOrchestrator.handle_event`.
     Nodes without either field are treated as no-ops.
-    """
 
-    def __init__(self, definition: GraphWorkflowDefinition) -> None:
-        if not definition.nodes:
-            raise ValueError("workflow must contain at least one node")
-        self.definition = definition
-        self._node_map = {n.id: n for n in definition.nodes}
+    The engine accepts a definition, which is validated and compiled on
+    construction (see :func:`compile_workflow`), or a precompiled
+    :class:`WorkflowPlan` such as those returned by :func:`load_plan`.
 
-        # Track incoming edge counts for topological ordering
-        self._incoming: dict[str, int] = {n.id: 0 for n in definition.nodes}
-        for edge in definition.edges:
-            if edge.source not in self._node_map or edge.target not in self._node_map:
-                raise ValueError("edge references unknown node")
-            self._incoming[edge.target] += 1
+    An optional :class:`WorkflowCheckpoint` is notified whenever a node
+    starts, finishes or fails. Nodes it reports as already completed are not
+    executed again; their stored records are returned in their place, which
+    lets an interrupted run resume where it stopped.
+    """
 
-        self._queue: list[str] = [n for n, deg in self._incoming.items() if deg == 0]
-        if not self._queue:
-            raise ValueError("workflow has no starting node or contains a cycle")
+    def __init__(
+        self,
+        definition: GraphWorkflowDefinition | WorkflowPlan,
+        *,
+        checkpoint: WorkflowCheckpoint | None = None,
+    ) -> None:
+        plan = (
+            definition
+            if isinstance(definition, WorkflowPlan)
+            else compile_workflow(definition)
+        )
+        self.plan = plan
+        self.definition = plan.definition
+        self._node_map = plan.nodes
+        self._successors = plan.successors
+        self._order = plan.order
+        # Only the per-run scheduling state is mutable.
+        self._incoming: dict[str, int] = dict(plan.indegree)
+        self._queue: deque[str] = deque(plan.roots)
+        # Result of every finished node, referenced (never copied) by the
+        # payloads of downstream nodes.
+        self._results: Dict[str, Any] = {}
+
+        # Nodes completed by an earlier, interrupted run are not executed
+        # again; their recorded results are replayed in order instead.
+        self.checkpoint = checkpoint
+        self._memo: Dict[str, dict] = {}
+        if checkpoint is not None:
+            self._memo = {
+                node_id: record
+                for node_id, record in checkpoint.completed().items()
+                if node_id in self._node_map
+            }
+
+    def _release(self, node_id: str) -> None:
+        """Mark ``node_id`` complete and queue successors that became ready."""
+
+        incoming = self._incoming
+        for tgt in self._successors[node_id]:
+            incoming[tgt] -= 1
+            if incoming[tgt] == 0:
+                self._queue.append(tgt)
 
     def step(self, orchestrator: "SolutionOrchestrator") -> dict:
         """Execute the next queued node and return the result."""
@@ -126,24 +462,103 @@ class GraphWorkflowEngine:
         if not self._queue:
             raise StopIteration("workflow complete")
 
-        node_id = self._queue.pop(0)
-        node = self._node_map[node_id]
-        team = node.config.get("team")
-        event = node.config.get("event")
-
-        if team and event:
-            result = orchestrator.handle_event_sync(team, event)
-        else:  # pragma: no cover - simple branch
-            result = {"status": "noop"}
-
-        for edge in self.definition.edges:
-            if edge.source == node_id:
-                tgt = edge.target
-                self._incoming[tgt] -= 1
-                if self._incoming[tgt] == 0:
-                    self._queue.append(tgt)
+        node_id = self._queue.popleft()
+        record = self._memo.get(node_id)
+        if record is None:
+            team, event = self._dispatch(node_id)
 
-        return {"node": node_id, "team": team, "result": result}
+            self._checkpoint("node_started", node_id)
+            try:
+                if team and event:
+                    result = orchestrator.handle_event_sync(team, event)
+                else:  # pragma: no cover - simple branch
+                    result = {"status": "noop"}
+            except Exception as exc:
+                self._checkpoint("node_failed", node_id, exc)
+                raise
+            record = {"node": node_id, "team": team, "result": result}
+            self._checkpoint("node_finished", node_id, record)
+
+        self._results[node_id] = record["result"]
+        self._release(node_id)
+        return record
+
+    async def _execute(
+        self,
+        node_id: str,
+        orchestrator: "SolutionOrchestrator",
+        *,
+        offload: bool = False,
+    ) -> dict:
+        """Run ``node_id`` through ``orchestrator`` without touching the queue.
+
+        With ``offload`` set, checkpoint hooks run in a worker thread so their
+        blocking writes do not stall nodes executing concurrently.
+        """
+
+        record = self._memo.get(node_id)
+        if record is not None:
+            self._results[node_id] = record["result"]
+            return record
+
+        team, event = self._dispatch(node_id)
+
+        await self._async_checkpoint(offload, "node_started", node_id)
+        try:
+            if team and event:
+                result = await orchestrator.handle_event(team, event)
+            else:  # pragma: no cover - simple branch
+                result = {"status": "noop"}
+        except Exception as exc:
+            await self._async_checkpoint(offload, "node_failed", node_id, exc)
+            raise
+        record = {"node": node_id, "team": team, "result": result}
+        await self._async_checkpoint(offload, "node_finished", node_id, record)
+        self._results[node_id] = result
+        return record
+
+    def _dispatch(self, node_id: str) -> Tuple[Optional[str], Any]:
+        """Return the team and event of ``node_id`` with references resolved.
+
+        Payload templates are rendered only now, when every upstream node has
+        finished; referenced results are embedded as they are, not copied.
+        The payload parts taken from the plan are deep-copied, so a handler
+        mutating its payload cannot affect later runs of a cached plan.
+        """
+
+        team, event = self.plan.calls[node_id]
+        if not isinstance(event, EventEnvelope):
+            return team, event
+        template = self.plan.templates.get(node_id)
+        if template is None:
+            payload = copy.deepcopy(event.raw_payload())
+        else:
+            try:
+                payload = template(self._results)
+            except ValueError as exc:
+                raise ValueError(f"node {node_id}: {exc}") from None
+        return team, EventEnvelope(
+            event.type,
+            payload,
+            task_id=event.task_id,
+            correlation_id=event.correlation_id,
+        )
+
+    def _checkpoint(self, hook: str, *args: Any) -> None:
+        """Forward a node state change to the checkpoint, if any."""
+
+        if self.checkpoint is not None:
+            getattr(self.checkpoint, hook)(*args)
+
+    async def _async_checkpoint(self, offload: bool, hook: str, *args: Any) -> None:
+        """Like :meth:`_checkpoint`, in a worker thread when ``offload`` is set."""
+
+        if self.checkpoint is None:
+            return
+        if offload:
+            await asyncio.to_thread(getattr(self.checkpoint, hook), *args)
+        else:
+            getattr(self.checkpoint, hook)(*args)
 
     async def async_step(self, orchestrator: "SolutionOrchestrator") -> dict:
         """Asynchronously execute the next queued node."""
@@ -151,27 +566,31 @@ class GraphWorkflowEngine:
         if not self._queue:
             raise StopAsyncIteration("workflow complete")
 
-        node_id = self._queue.pop(0)
-        node = self._node_map[node_id]
-        team = node.config.get("team")
-        event = node.config.get("event")
-
-        if team and event:
-            result = await orchestrator.handle_event(team, event)
-        else:  # pragma: no cover - simple branch
-            result = {"status": "noop"}
-
-        for edge in self.definition.edges:
-            if edge.source == node_id:
-                tgt = edge.target
-                self._incoming[tgt] -= 1
-                if self._incoming[tgt] == 0:
-                    self._queue.append(tgt)
-
-        return {"node": node_id, "team": team, "result": result}
-
-    def run(self, orchestrator: "SolutionOrchestrator") -> dict:
-        """Execute all nodes sequentially until finished."""
+        node_id = self._queue.popleft()
+        record = await self._execute(node_id, orchestrator)
+        self._release(node_id)
+        return record
+
+    def run(
+        self,
+        orchestrator: "SolutionOrchestrator",
+        *,
+        max_parallel: int = 1,
+        team_limits: Mapping[str, int] | None = None,
+    ) -> dict:
+        """Execute all nodes until finished.
+
+        With ``max_parallel`` greater than one the workflow is executed by
+        :meth:`async_run` on the shared event loop runner; see there for the
+        meaning of the arguments.
+        """
+
+        if max_parallel > 1:
+            return run_sync(
+                self.async_run(
+                    orchestrator, max_parallel=max_parallel, team_limits=team_limits
+                )
+            )
 
         results = []
         while True:
@@ -181,13 +600,81 @@ class GraphWorkflowEngine:
                 break
         return {"status": "complete", "results": results}
 
-    async def async_run(self, orchestrator: "SolutionOrchestrator") -> dict:
-        """Asynchronously execute all nodes sequentially."""
+    async def async_run(
+        self,
+        orchestrator: "SolutionOrchestrator",
+        *,
+        max_parallel: int = 1,
+        team_limits: Mapping[str, int] | None = None,
+    ) -> dict:
+        """Asynchronously execute all nodes.
+
+        Parameters
+        ----------
+        orchestrator:
+            Orchestrator receiving the node events.
+        max_parallel:
+            Maximum number of nodes executing at the same time. ``1`` keeps the
+            sequential behaviour; larger values start every node whose
+            dependencies have completed, so independent branches overlap and
+            the wall-clock time approaches the critical path.
+        team_limits:
+            Optional per-team caps on concurrently executing nodes, for teams
+            backed by rate-limited services.
+
+        Results are always returned in the order a sequential run would
+        produce them.
+        """
+
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        if max_parallel == 1:
+            results = []
+            while True:
+                try:
+                    results.append(await self.async_step(orchestrator))
+                except (StopIteration, StopAsyncIteration):
+                    break
+            return {"status": "complete", "results": results}
+
+        order = self._order
+        slots = asyncio.Semaphore(max_parallel)
+        team_slots = {
+            team: asyncio.Semaphore(limit)
+            for team, limit in (team_limits or {}).items()
+            if limit >= 1
+        }
 
-        results = []
-        while True:
-            try:
-                results.append(await self.async_step(orchestrator))
-            except (StopIteration, StopAsyncIteration):
-                break
-        return {"status": "complete", "results": results}
+        async def _run_node(node_id: str) -> dict:
+            team = self._node_map[node_id].config.get("team")
+            # Take the team slot first so nodes waiting on a busy team do not
+            # hold global slots other teams could use.
+            team_slot = team_slots.get(team) if team else None
+            if team_slot is None:
+                async with slots:
+                    return await self._execute(node_id, orchestrator, offload=True)
+            async with team_slot, slots:
+                return await self._execute(node_id, orchestrator, offload=True)
+
+        records: List[dict] = []
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while self._queue or running:
+                while self._queue:
+                    node_id = self._queue.popleft()
+                    running[asyncio.ensure_future(_run_node(node_id))] = node_id
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda t: order[running[t]]):
+                    node_id = running.pop(task)
+                    records.append(task.result())
+                    self._release(node_id)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        records.sort(key=lambda record: order[record["node"]])
+        return {"status": "complete", "results": records}
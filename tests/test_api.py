@@ -288,7 +288,7 @@ def test_history_and_cors(tmp_path):
         )
 
         code, body = _http_get(
-            f"http://127.0.0.1:{port}/history?limit=3",
+            f"http://127.0.0.1:{port}/history?limit=3&flush=true",
             headers={"X-API-Key": "secret"},
         )
         assert code == 200
@@ -313,6 +313,61 @@ def test_history_and_cors(tmp_path):
         data = json.loads(body)
         assert data["history"][0]["event_type"] == "other"
 
+        code, body = _http_get(
+            f"http://127.0.0.1:{port}/history?limit=2",
+            headers={"X-API-Key": "secret"},
+        )
+        first = json.loads(body)
+        code, body = _http_get(
+            f"http://127.0.0.1:{port}/history?limit=2&cursor={first['next_cursor']}",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 200
+        second = json.loads(body)
+        ids = [item["id"] for item in first["history"] + second["history"]]
+        assert ids == [3, 2, 1]
+        assert second["next_cursor"] is None
+
+        code, body = _http_get(
+            f"http://127.0.0.1:{port}/history?fields=id,team",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 200
+        assert json.loads(body)["history"][0] == {"id": 3, "team": "alpha"}
+
+        code, _ = _http_get(
+            f"http://127.0.0.1:{port}/history?fields=id,secret",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 400
+
+        code, body = _http_get(
+            f"http://127.0.0.1:{port}/history/stats?bucket=day&group_by=team",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 200
+        stats = json.loads(body)["stats"]
+        assert {s["team"]: s["count"] for s in stats} == {"alpha": 1, "demo": 2}
+        assert all(s["latency_ms"]["count"] == s["count"] for s in stats)
+
+        code, _ = _http_get(
+            f"http://127.0.0.1:{port}/history/stats?since=2024-01-01T00:00:00%2B00:00",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 200
+
+        code, _ = _http_get(
+            f"http://127.0.0.1:{port}/history/stats?bucket=week",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 400
+
+        code, _ = _http_get(
+            f"http://127.0.0.1:{port}/history?cursor=bogus",
+            headers={"X-API-Key": "secret"},
+        )
+        assert code == 400
+
         code, _, allow_origin = _http_options(
             f"http://127.0.0.1:{port}/teams/demo/event",
             headers={"Origin": "http://example.com"},
@@ -410,3 +465,50 @@ def test_stream_endpoint_async(tmp_path):
     finally:
         server.should_exit = True
         thread.join(timeout=5)
+
+
+def test_metrics_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.settings, "PROMETHEUS_METRICS_ENDPOINT", True)
+    monkeypatch.setattr(api.settings, "PROMETHEUS_PUSHGATEWAY", None)
+    monkeypatch.setattr(api.settings, "API_AUTH_KEY", None)
+    port = _get_free_port()
+    app = api.create_app(SolutionOrchestrator({}))
+    server, thread = _start_server(app, port)
+
+    try:
+        _http_get(f"http://127.0.0.1:{port}/activity")
+        code, body = _http_get(f"http://127.0.0.1:{port}/metrics")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    assert code == 200
+    assert 'api_request_count{job="api",method="GET",path="/activity"}' in body
+    assert "# TYPE api_request_latency_seconds histogram" in body
+
+
+def test_goal_endpoint_runs_planner_on_server_loop(tmp_path):
+    _register_agent()
+    team_cfg = _write_team(tmp_path)
+    port = _get_free_port()
+    tasks = [
+        {"team": "demo", "event": {"type": "echo_agent", "payload": {"n": n}}}
+        for n in (1, 2)
+    ]
+    plans = {"greet": [{"parallel": tasks}]}
+    orch = SolutionOrchestrator({"demo": str(team_cfg)}, planner_plans=plans)
+    api.settings.API_AUTH_KEY = None
+    app = api.create_app(orch)
+    server, thread = _start_server(app, port)
+
+    try:
+        code, body = _http_post(f"http://127.0.0.1:{port}/goals/greet", {})
+        assert code == 200
+        group = json.loads(body)["results"][0]["parallel"]
+        assert [entry["result"]["result"]["echo"]["n"] for entry in group] == [1, 2]
+
+        code, _ = _http_post(f"http://127.0.0.1:{port}/goals/missing", {})
+        assert code == 404
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
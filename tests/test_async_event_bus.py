@@ -1,4 +1,8 @@
 import asyncio
+import threading
+
+import pytest
+
 from agentic_core import AsyncEventBus
 
 
@@ -16,3 +20,190 @@ def test_async_event_bus_publish():
 
     asyncio.run(main())
     assert called == [{"x": 1}]
+
+
+def test_queue_mode_delivers_in_background():
+    bus = AsyncEventBus(mode="queue", queue_size=10, workers=2)
+    called = []
+
+    async def handler(payload):
+        await asyncio.sleep(0.01)
+        called.append(payload["n"])
+
+    async def main():
+        bus.subscribe("t", handler)
+        for n in range(5):
+            await bus.publish("t", {"n": n})
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert sorted(called) == [0, 1, 2, 3, 4]
+
+
+def test_queue_mode_runs_sync_handlers_on_dedicated_pool():
+    bus = AsyncEventBus(mode="queue")
+    threads = []
+
+    def handler(payload):
+        threads.append(threading.current_thread().name)
+
+    async def main():
+        bus.subscribe("t", handler)
+        await bus.publish("t", {})
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert threads and threads[0].startswith("eventbus")
+
+
+def test_queue_mode_drop_oldest():
+    bus = AsyncEventBus(mode="queue", queue_size=2, overflow="drop_oldest")
+    called = []
+    gate = asyncio.Event()
+
+    async def handler(payload):
+        await gate.wait()
+        called.append(payload["n"])
+
+    async def main():
+        bus.subscribe("t", handler)
+        await bus.publish("t", {"n": 0})
+        await asyncio.sleep(0)  # worker picks up the first payload
+        for n in range(1, 5):
+            await bus.publish("t", {"n": n})
+        gate.set()
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert called == [0, 3, 4]
+
+
+def test_queue_mode_reject():
+    bus = AsyncEventBus(mode="queue", queue_size=1, overflow="reject")
+    gate = asyncio.Event()
+
+    async def handler(payload):
+        await gate.wait()
+
+    async def main():
+        bus.subscribe("t", handler)
+        await bus.publish("t", {"n": 0})
+        await asyncio.sleep(0)
+        await bus.publish("t", {"n": 1})
+        with pytest.raises(asyncio.QueueFull):
+            await bus.publish("t", {"n": 2})
+        gate.set()
+        await bus.aclose()
+
+    asyncio.run(main())
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        AsyncEventBus(mode="queue", overflow="explode")
+
+
+def test_emit_returns_before_delivery_and_drain_waits():
+    bus = AsyncEventBus()
+    called = []
+
+    async def handler(payload):
+        await asyncio.sleep(0.01)
+        called.append(payload["n"])
+
+    async def main():
+        bus.subscribe("t", handler)
+        bus.emit("t", {"n": 1})
+        assert called == []
+        await bus.drain()
+        assert called == [1]
+
+    asyncio.run(main())
+
+
+def test_emit_orders_per_key_and_overlaps_keys():
+    bus = AsyncEventBus(partition_key="deal_id")
+    log = []
+
+    async def handler(payload):
+        log.append(("start", payload["deal_id"], payload["n"]))
+        await asyncio.sleep(0.01 if payload["n"] == 0 else 0)
+        log.append(("end", payload["deal_id"], payload["n"]))
+
+    async def main():
+        bus.subscribe("Deal.Updated", handler)
+        for n in range(3):
+            bus.emit("Deal.Updated", {"deal_id": "a", "n": n})
+        bus.publish_nowait("Deal.Updated", {"deal_id": "b", "n": 0})
+        await bus.drain()
+
+    asyncio.run(main())
+    deal_a = [entry for entry in log if entry[1] == "a"]
+    assert deal_a == [
+        ("start", "a", 0),
+        ("end", "a", 0),
+        ("start", "a", 1),
+        ("end", "a", 1),
+        ("start", "a", 2),
+        ("end", "a", 2),
+    ]
+    # deal "b" starts while deal "a" is still processing its first event
+    assert log.index(("start", "b", 0)) < log.index(("end", "a", 0))
+
+
+def test_emit_orders_per_key_in_queue_mode_with_workers():
+    bus = AsyncEventBus(mode="queue", workers=3)
+    seen = []
+
+    async def handler(payload):
+        # Earlier events take longer, so parallel delivery would reorder them.
+        await asyncio.sleep(0.03 - 0.01 * payload["n"])
+        seen.append((payload["key"], payload["n"]))
+
+    async def main():
+        bus.subscribe("t", handler)
+        for n in range(3):
+            bus.emit("t", {"key": "a", "n": n}, key="a")
+        bus.emit("t", {"key": "b", "n": 2}, key="b")
+        await bus.drain()
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert [n for key, n in seen if key == "a"] == [0, 1, 2]
+    # other keys still use the remaining workers meanwhile
+    assert seen.index(("b", 2)) < seen.index(("a", 0))
+
+
+def test_drain_waits_for_chained_emits():
+    bus = AsyncEventBus()
+    seen = []
+
+    async def first(payload):
+        bus.emit("second", payload, key="k")
+
+    async def second(payload):
+        seen.append(payload)
+
+    async def main():
+        bus.subscribe("first", first)
+        bus.subscribe("second", second)
+        bus.emit("first", {"x": 1}, key="k")
+        await bus.drain()
+
+    asyncio.run(main())
+    assert seen == [{"x": 1}]
+
+
+def test_emit_logs_subscriber_failures(caplog):
+    bus = AsyncEventBus()
+
+    async def boom(payload):
+        raise RuntimeError("boom")
+
+    async def main():
+        bus.subscribe("t", boom)
+        bus.emit("t", {})
+        await bus.drain()
+
+    asyncio.run(main())
+    assert "Delivery of emitted event 't' failed" in caplog.text
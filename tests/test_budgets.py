@@ -0,0 +1,81 @@
+from src.base_orchestrator import BaseOrchestrator
+from src.agents.base_agent import BaseAgent
+from src.budgets import BudgetTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LoopAgent(BaseAgent):
+    loop_budget = 2
+
+    def run(self, payload):
+        return "ok"
+
+
+def test_window_counts_decay():
+    clock = FakeClock()
+    tracker = BudgetTracker(10, clock=clock)
+
+    assert tracker.charge("a", tokens=5) == (1, 5)
+    assert tracker.charge("a", tokens=5) == (2, 10)
+
+    clock.now = 15  # half of the previous window still overlaps
+    loops, tokens = tracker.usage("a")
+    assert loops == 1.0
+    assert tokens == 5.0
+
+    clock.now = 30  # two full windows later all usage has expired
+    assert tracker.charge("a", tokens=1) == (1, 1)
+
+
+def test_scopes_are_independent_and_expire():
+    clock = FakeClock()
+    tracker = BudgetTracker(10, ttl=5, clock=clock)
+
+    tracker.charge("a", "task-1")
+    tracker.charge("a", "task-2")
+    assert len(tracker) == 2
+
+    clock.now = 4
+    tracker.charge("a", "task-2")
+    clock.now = 7
+    state = tracker.snapshot()
+
+    assert [entry["scope"] for entry in state] == ["task-2"]
+    assert state[0]["loops"] == 2
+
+
+def test_orchestrator_budgets_recover_after_window():
+    clock = FakeClock()
+    orch = BaseOrchestrator(budget_window=60)
+    orch.budgets.clock = clock
+    orch.agents = {"loop": LoopAgent()}
+
+    event = {"type": "loop", "payload": {}}
+    assert orch.handle_event_sync(event)["status"] == "done"
+    assert orch.handle_event_sync(event)["status"] == "done"
+    assert orch.handle_event_sync(event)["status"] == "terminated"
+
+    clock.now = 200
+    assert orch.handle_event_sync(event)["status"] == "done"
+
+
+def test_orchestrator_budgets_are_scoped_per_task():
+    orch = BaseOrchestrator()
+    orch.agents = {"loop": LoopAgent()}
+
+    for _ in range(2):
+        orch.handle_event_sync({"type": "loop", "payload": {}, "task_id": "t1"})
+    blocked = orch.handle_event_sync({"type": "loop", "payload": {}, "task_id": "t1"})
+    fresh = orch.handle_event_sync({"type": "loop", "payload": {}, "task_id": "t2"})
+
+    assert blocked["status"] == "terminated"
+    assert fresh["status"] == "done"
+    scopes = {entry["scope"]: entry["loops"] for entry in orch.budget_state()}
+    assert scopes == {"t1": 3, "t2": 1}
@@ -29,6 +29,17 @@ def test_invalid_adyen_environment(monkeypatch):
     _reload_settings(monkeypatch, ADYEN_ENVIRONMENT=None)
 
 
+def test_history_compression_is_validated(monkeypatch):
+    assert config.Settings(HISTORY_COMPRESSION=" ZLIB ").HISTORY_COMPRESSION == "zlib"
+    assert config.Settings(HISTORY_COMPRESSION="").HISTORY_COMPRESSION is None
+    with pytest.raises(ValidationError):
+        config.Settings(HISTORY_COMPRESSION="gzip")
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ValidationError, match="zstandard"):
+        config.Settings(HISTORY_COMPRESSION="zstd")
+
+
 def test_env_file_selection(monkeypatch, tmp_path):
     """Settings should load variables from the file chosen via ENV."""
     from pathlib import Path
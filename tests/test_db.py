@@ -1,6 +1,9 @@
 from src import db
 from src.config import settings
 import sqlite3
+from datetime import datetime
+
+import pytest
 
 
 def test_db_write_and_read(tmp_path):
@@ -29,5 +32,203 @@ def test_db_index_creation(tmp_path):
     with sqlite3.connect(tmp_path / "t.db") as conn:
         indexes = [row[1] for row in conn.execute("PRAGMA index_list('event_history')")]
 
-    assert "idx_event_history_timestamp" in indexes
-    assert "idx_event_history_team" in indexes
+    assert set(db.HISTORY_INDEXES) <= set(indexes)
+    assert "idx_event_history_timestamp" not in indexes
+    assert "idx_event_history_team" not in indexes
+
+
+def test_legacy_history_table_is_migrated(tmp_path):
+    path = tmp_path / "t.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE event_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "team TEXT NOT NULL, event_type TEXT NOT NULL, payload TEXT NOT NULL, "
+            "result TEXT, timestamp TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX idx_event_history_team ON event_history(team)")
+        conn.execute(
+            "INSERT INTO event_history (team, event_type, payload, result, timestamp) "
+            "VALUES ('demo', 'x', '{}', NULL, '2024-01-02T03:04:05.500000')"
+        )
+    conn.close()
+
+    settings.DB_CONNECTION_STRING = f"sqlite:///{path}"
+    db.init_db()
+    db.init_db()
+    db.insert_event("demo", "y", {}, {})
+
+    (ts,) = (
+        db.get_connection()
+        .execute("SELECT ts FROM event_history WHERE id = 1")
+        .fetchone()
+    )
+    assert ts == 1704164645500000
+    assert [row["event_type"] for row in db.fetch_history()] == ["y", "x"]
+
+
+def test_cursor_pagination(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    rows = [db.encode_event("demo", "x", {"i": i}, {}) for i in range(7)]
+    # Events recorded within the same microsecond are ordered by id.
+    rows[3] = rows[3][:5] + (rows[2][5],) + rows[3][6:]
+    conn = db.get_connection()
+    with conn:
+        db.write_events(conn, rows)
+
+    seen = []
+    page, cursor = db.fetch_history_page(limit=3, team="demo")
+    while True:
+        seen.extend(item["payload"]["i"] for item in page)
+        if cursor is None:
+            break
+        page, cursor = db.fetch_history_page(limit=3, team="demo", cursor=cursor)
+    assert seen == [6, 5, 4, 3, 2, 1, 0]
+    assert db.fetch_history_page(limit=3, event_type="other") == ([], None)
+
+    try:
+        db.fetch_history(cursor="nope")
+    except ValueError as exc:
+        assert "invalid history cursor" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("expected ValueError")
+
+
+def test_connections_are_reused_per_thread(tmp_path):
+    import threading
+
+    path = tmp_path / "t.db"
+    conn = db.get_connection(path)
+    assert db.get_connection(path) is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.get_connection(path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    db.close_connections()
+    assert db.get_connection(path) is not conn
+
+
+def test_connection_pragmas(tmp_path):
+    settings.DB_BUSY_TIMEOUT = 2.5
+    try:
+        conn = db.connect(tmp_path / "t.db")
+    finally:
+        settings.DB_BUSY_TIMEOUT = 5.0
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 2500
+    conn.close()
+
+
+def test_readers_do_not_wait_for_open_write_transaction(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    db.insert_event("demo", "x", {"a": 1}, {"r": 2})
+
+    writer = db.connect(tmp_path / "t.db")
+    writer.execute("BEGIN EXCLUSIVE")  # blocks readers without WAL
+    writer.execute(db.INSERT_EVENT_SQL, db.encode_event("demo", "y", {}, {}))
+    try:
+        rows = db.fetch_history(limit=10)
+    finally:
+        writer.rollback()
+        writer.close()
+    assert [row["event_type"] for row in rows] == ["x"]
+
+
+def test_compressed_history_and_projection(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    big = {"text": "lorem ipsum " * 100}
+    db.insert_event("demo", "plain", big, {"ok": True})
+    settings.HISTORY_COMPRESSION = "zlib"
+    try:
+        db.insert_event("demo", "packed", big, {"ok": True})
+    finally:
+        settings.HISTORY_COMPRESSION = None
+
+    stored = (
+        db.get_connection()
+        .execute("SELECT event_type, payload, result FROM event_history ORDER BY id")
+        .fetchall()
+    )
+    assert isinstance(stored[0]["payload"], str)
+    assert isinstance(stored[1]["payload"], bytes)
+    assert len(stored[1]["payload"]) < len(stored[0]["payload"]) / 10
+    assert stored[1]["result"] == '{"ok": true}'  # too small to compress
+
+    rows = db.fetch_history()
+    assert [row["payload"] for row in rows] == [big, big]
+    assert rows[0]["result"] == {"ok": True}
+
+    rows = db.fetch_history(fields=["event_type", "timestamp"])
+    assert [sorted(row) for row in rows] == [["event_type", "timestamp"]] * 2
+
+    with pytest.raises(ValueError, match="invalid history fields: bogus"):
+        db.fetch_history(fields=["team", "bogus"])
+    with pytest.raises(ValueError, match="unknown history compression codec"):
+        db.pack_json("x" * 200, "lz4")
+
+
+def test_rollups_track_counts_and_latency(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    base = db.encode_event("demo", "x", {}, {})[5]
+    base -= base % 3_600_000_000  # start of the current hour
+    rows = []
+    for idx, (team, kind, duration) in enumerate(
+        [("demo", "x", 10.0), ("demo", "x", 30.0), ("demo", "y", None), ("b", "x", 5.0)]
+    ):
+        row = db.encode_event(team, kind, {}, {}, duration_ms=duration)
+        rows.append(row[:5] + (base + idx * 60_000_000, duration))
+    conn = db.get_connection()
+    with conn:
+        db.write_events(conn, rows[:2])
+    with conn:
+        db.write_events(conn, rows[2:])
+
+    since = datetime.utcfromtimestamp(base / 1e6)
+    stats = db.fetch_stats("hour", since=since, team="demo")
+    assert [(s["event_type"], s["count"]) for s in stats] == [("x", 2), ("y", 1)]
+    assert stats[0]["latency_ms"] == {"count": 2, "avg": 20.0, "min": 10.0, "max": 30.0}
+    assert stats[1]["latency_ms"]["avg"] is None
+
+    (total,) = db.fetch_stats("day", since=since, group_by=())
+    assert total["count"] == 4 and total["latency_ms"]["max"] == 30.0
+    minutes = db.fetch_stats("minute", since=since, group_by=["team"])
+    assert [s["count"] for s in minutes] == [1, 1, 1, 1]
+
+    with pytest.raises(ValueError, match="invalid bucket"):
+        db.fetch_stats("week")
+
+
+def test_rollups_are_backfilled_from_existing_history(tmp_path):
+    path = tmp_path / "t.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE event_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "team TEXT NOT NULL, event_type TEXT NOT NULL, payload TEXT NOT NULL, "
+            "result TEXT, timestamp TEXT NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO event_history (team, event_type, payload, result, timestamp) "
+            "VALUES ('demo', 'x', '{}', NULL, ?)",
+            [("2024-01-02T03:04:05",), ("2024-01-02T03:59:00",)],
+        )
+    conn.close()
+
+    settings.DB_CONNECTION_STRING = f"sqlite:///{path}"
+    db.init_db()
+
+    (hour,) = db.fetch_stats("hour", since="2024-01-02T00:00:00", until="2024-01-03")
+    assert hour["start"] == "2024-01-02T03:00:00"
+    assert hour["count"] == 2 and hour["latency_ms"]["count"] == 0
+
+    # Offsets are converted to UTC.
+    assert db.fetch_stats(
+        "hour", since="2024-01-02T02:00:00+02:00", until="2024-01-03T00:00:00Z"
+    ) == [hour]
+    assert db.fetch_stats("hour", since="2024-01-02T05:00:00+01:00") == []
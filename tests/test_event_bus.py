@@ -0,0 +1,86 @@
+from agentic_core import EventBus
+
+
+def _collect(bus, pattern, sink):
+    def handler(payload):
+        sink.append((pattern, payload["n"]))
+
+    bus.subscribe(pattern, handler)
+    return handler
+
+
+def test_exact_topic_dispatch():
+    bus = EventBus()
+    seen = []
+    _collect(bus, "Lead.Won", seen)
+
+    bus.publish("Lead.Won", {"n": 1})
+    bus.publish("Lead.Lost", {"n": 2})
+
+    assert seen == [("Lead.Won", 1)]
+
+
+def test_single_segment_wildcard():
+    bus = EventBus()
+    seen = []
+    _collect(bus, "Project.*", seen)
+
+    bus.publish("Project.MaterialsNeeded", {"n": 1})
+    bus.publish("Project.MaterialsNeeded.Resolved", {"n": 2})
+    bus.publish("Project", {"n": 3})
+
+    assert seen == [("Project.*", 1)]
+
+
+def test_multi_segment_wildcard():
+    bus = EventBus()
+    seen = []
+    _collect(bus, "Project.#", seen)
+    _collect(bus, "#.Resolved", seen)
+
+    bus.publish("Project", {"n": 1})
+    bus.publish("Project.MaterialsNeeded.Resolved", {"n": 2})
+    bus.publish("RevOps.Analyze", {"n": 3})
+
+    assert seen == [
+        ("Project.#", 1),
+        ("Project.#", 2),
+        ("#.Resolved", 2),
+    ]
+
+
+def test_subscribers_called_in_subscription_order():
+    bus = EventBus()
+    seen = []
+    _collect(bus, "#", seen)
+    _collect(bus, "Lead.Won", seen)
+    _collect(bus, "Lead.*", seen)
+
+    bus.publish("Lead.Won", {"n": 1})
+
+    assert [p for p, _ in seen] == ["#", "Lead.Won", "Lead.*"]
+
+
+def test_unsubscribe_invalidates_cache():
+    bus = EventBus()
+    seen = []
+    handler = _collect(bus, "Lead.*", seen)
+
+    bus.publish("Lead.Won", {"n": 1})
+    assert bus.unsubscribe("Lead.*", handler) is True
+    bus.publish("Lead.Won", {"n": 2})
+
+    assert seen == [("Lead.*", 1)]
+    assert bus.subscribers("Lead.Won") == []
+    assert bus.unsubscribe("Lead.*", handler) is False
+
+
+def test_subscribe_after_publish_is_visible():
+    bus = EventBus()
+    seen = []
+    bus.publish("Lead.Won", {"n": 0})
+    _collect(bus, "Lead.#", seen)
+
+    bus.publish("Lead.Won", {"n": 1})
+
+    assert seen == [("Lead.#", 1)]
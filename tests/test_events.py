@@ -0,0 +1,67 @@
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from src.base_orchestrator import BaseOrchestrator
+from src.events import EventEnvelope, LeadCaptureEvent, json_default
+
+
+def test_envelope_wraps_payload_without_copying():
+    payload = {"form_data": {"email": "a@b.c"}, "source": "web"}
+    event = EventEnvelope("lead_capture", payload, task_id="t1")
+
+    assert event.raw_payload() is payload
+    assert event.payload["form_data"] is payload["form_data"]
+    assert dict(event) == {"type": "lead_capture", "payload": payload, "task_id": "t1"}
+    assert event.get("correlation_id") is None
+    assert EventEnvelope.of(event) is event
+
+
+def test_envelope_is_immutable_and_slotted():
+    event = EventEnvelope("x", {"a": 1})
+
+    with pytest.raises(AttributeError):
+        event.type = "y"
+    with pytest.raises(TypeError):
+        event.payload["a"] = 2
+    assert not hasattr(event, "__dict__")
+    assert pickle.loads(pickle.dumps(event)) == event
+
+
+def test_payload_json_is_encoded_once():
+    event = EventEnvelope("x", {"a": 1})
+
+    first = event.payload_json()
+
+    assert first == '{"a": 1}'
+    assert event.payload_json() is first
+    assert json.loads(json.dumps({"event": event}, default=json_default)) == {
+        "event": {"type": "x", "payload": {"a": 1}}
+    }
+
+
+def test_event_dataclasses_are_frozen():
+    event = LeadCaptureEvent(form_data={}, source="web")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        event.source = "mail"
+
+
+def test_orchestrator_accepts_envelopes():
+    seen = []
+
+    class Agent:
+        def run(self, payload):
+            seen.append(payload)
+            return "ok"
+
+    orch = BaseOrchestrator()
+    orch.agents = {"lead_capture": Agent()}
+    payload = {"form_data": {"email": "a@b.c"}, "source": "web"}
+
+    res = orch.handle_event_sync(EventEnvelope("lead_capture", payload))
+
+    assert res == {"status": "done", "result": "ok"}
+    assert seen[0].form_data is payload["form_data"]
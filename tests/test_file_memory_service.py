@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+from src.memory_service import file as file_module
 from src.memory_service.file import FileMemoryService
 
 
@@ -20,3 +21,84 @@ def test_store_and_fetch(tmp_path):
 
     none = svc.fetch("missing")
     assert none == []
+
+
+def test_store_many_appends_batch(tmp_path):
+    path = tmp_path / "mem.jsonl"
+    svc = FileMemoryService(path)
+
+    assert svc.store_many("k", [{"n": 1}, {"n": 2}])
+    svc.store("k", {"n": 3})
+
+    assert svc.fetch("k", top_k=5) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+def _fresh(path):
+    """Open ``path`` as a new process would, without the shared index."""
+    file_module._indexes.clear()
+    return FileMemoryService(path)
+
+
+def test_index_is_persisted_and_reused(tmp_path):
+    path = tmp_path / "mem.jsonl"
+    svc = FileMemoryService(path)
+    svc.store_many("a", [{"n": i} for i in range(10)])
+    svc.store("b", {"n": 99})
+    assert svc.index_path.read_bytes().startswith(file_module.INDEX_HEADER)
+
+    reopened = _fresh(path)
+    assert reopened.fetch("a", top_k=3) == [{"n": 7}, {"n": 8}, {"n": 9}]
+    assert reopened.fetch("b") == [{"n": 99}]
+    assert reopened.fetch("a", top_k=0) == []
+
+
+def test_appends_by_other_writers_are_indexed(tmp_path):
+    path = tmp_path / "mem.jsonl"
+    svc = FileMemoryService(path)
+    other = FileMemoryService(path)
+    svc.store("k", {"n": 1})
+    other.store("k", {"n": 2})
+    with path.open("a") as fh:  # e.g. another process, or a damaged line
+        fh.write(json.dumps({"key": "k", "data": {"n": 3}}) + "\n")
+        fh.write("not json\n")
+
+    assert svc.fetch("k") == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert _fresh(path).fetch("k") == [{"n": 1}, {"n": 2}, {"n": 3}]
+    # Every record is listed once in the sidecar.
+    assert len(svc.index_path.read_bytes().splitlines()) == 4
+
+
+def test_stale_or_corrupt_index_is_rebuilt(tmp_path):
+    path = tmp_path / "mem.jsonl"
+    svc = FileMemoryService(path)
+    svc.store_many("a", [{"n": 1}, {"n": 2}])
+
+    # The log is replaced by a different one.
+    path.write_text(json.dumps({"key": "b", "data": {"n": 3}}) + "\n")
+    assert svc.fetch("b") == [{"n": 3}]
+    assert svc.fetch("a") == []
+    assert _fresh(path).fetch("b") == [{"n": 3}]
+
+    svc.index_path.write_bytes(file_module.INDEX_HEADER + b'"b"\t0')
+    assert _fresh(path).fetch("b") == [{"n": 3}]
+    svc.index_path.unlink()
+    assert _fresh(path).fetch("b") == [{"n": 3}]
+
+
+def test_tail_fetch_without_index(tmp_path):
+    path = tmp_path / "mem.jsonl"
+    svc = FileMemoryService(path, index=False)
+    assert svc.fetch("a") == []
+    svc.store_many("a", [{"n": i} for i in range(5)])
+    svc.store("ab", {"n": "prefix of another key"})
+    with path.open("a") as fh:
+        fh.write('{"data": {"n": 5}, "key": "a"}\n')  # key not first
+        fh.write('{"key": "a", "data": \n')  # damaged line
+        fh.write('{"key": "a", "data": {"n": 6}}')  # no trailing newline
+
+    assert svc.index_path is None
+    assert not (tmp_path / "mem.jsonl.idx").exists()
+    assert svc.fetch("a", top_k=3) == [{"n": 4}, {"n": 5}, {"n": 6}]
+    assert svc.fetch("a", top_k=100) == [{"n": i} for i in range(7)]
+    assert svc.fetch("ab") == [{"n": "prefix of another key"}]
+    assert svc.fetch("missing") == []
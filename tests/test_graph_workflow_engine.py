@@ -14,6 +14,8 @@ from src.workflows.graph import (
     EdgeDefinition,
 )
 import asyncio
+import threading
+import time
 
 
 class DummyAgentA(BaseAgent):
@@ -235,3 +237,260 @@ def test_async_branching_graph_execution(tmp_path):
     assert result["results"][0]["node"] == "start"
     teams = {r["team"] for r in result["results"]}
     assert teams == {"A", "B"}
+
+
+class SleepyOrchestrator:
+    """Record concurrency while each event sleeps for ``delay`` seconds."""
+
+    def __init__(self, delay=0.05, delays=None):
+        self.delay = delay
+        self.delays = delays or {}
+        self.running = {}
+        self.peak = {}
+        self.peak_total = 0
+
+    async def handle_event(self, team, event):
+        self.running[team] = self.running.get(team, 0) + 1
+        self.peak[team] = max(self.peak.get(team, 0), self.running[team])
+        self.peak_total = max(self.peak_total, sum(self.running.values()))
+        await asyncio.sleep(self.delays.get(event["type"], self.delay))
+        self.running[team] -= 1
+        return {"status": "done", "result": event["type"]}
+
+
+def _fan_out(width, teams=("A",)):
+    nodes = [NodeDefinition(id="start", type="agent", label="start", config={})]
+    edges = []
+    for idx in range(width):
+        team = teams[idx % len(teams)]
+        nodes.append(
+            NodeDefinition(
+                id=f"n{idx}",
+                type="agent",
+                label=f"n{idx}",
+                config={"team": team, "event": {"type": f"n{idx}", "payload": {}}},
+            )
+        )
+        edges.append(EdgeDefinition(source="start", target=f"n{idx}"))
+    return GraphWorkflowDefinition(name="wide", nodes=nodes, edges=edges)
+
+
+def test_parallel_run_overlaps_independent_nodes():
+    orch = SleepyOrchestrator(delay=0.1)
+    engine = GraphWorkflowEngine(_fan_out(8))
+
+    began = time.perf_counter()
+    result = asyncio.run(engine.async_run(orch, max_parallel=8))
+    elapsed = time.perf_counter() - began
+
+    assert orch.peak_total == 8
+    assert elapsed < 0.5
+    assert [r["node"] for r in result["results"]] == ["start"] + [
+        f"n{idx}" for idx in range(8)
+    ]
+
+
+def test_parallel_run_orders_results_deterministically():
+    # Later nodes finish first; the output still follows the sequential order.
+    delays = {f"n{idx}": 0.01 * (5 - idx) for idx in range(5)}
+    orch = SleepyOrchestrator(delays=delays)
+
+    result = asyncio.run(
+        GraphWorkflowEngine(_fan_out(5)).async_run(orch, max_parallel=5)
+    )
+
+    assert [r["node"] for r in result["results"]] == [
+        "start",
+        "n0",
+        "n1",
+        "n2",
+        "n3",
+        "n4",
+    ]
+    assert [r["result"]["result"] for r in result["results"][1:]] == [
+        "n0",
+        "n1",
+        "n2",
+        "n3",
+        "n4",
+    ]
+
+
+def test_parallel_run_respects_global_and_team_limits():
+    orch = SleepyOrchestrator(delay=0.02)
+    engine = GraphWorkflowEngine(_fan_out(12, teams=("A", "B")))
+
+    asyncio.run(engine.async_run(orch, max_parallel=4, team_limits={"A": 1}))
+
+    assert orch.peak["A"] == 1
+    assert orch.peak["B"] == 3
+    assert orch.peak_total == 4
+
+
+def test_parallel_run_writes_checkpoints_off_the_event_loop():
+    class ThreadCheckpoint:
+        def __init__(self):
+            self.threads = set()
+
+        def completed(self):
+            return {}
+
+        def node_started(self, node_id):
+            self.threads.add(threading.get_ident())
+
+        def node_finished(self, node_id, record):
+            self.threads.add(threading.get_ident())
+
+        def node_failed(self, node_id, error):  # pragma: no cover - unused
+            pass
+
+    async def _run(max_parallel):
+        checkpoint = ThreadCheckpoint()
+        engine = GraphWorkflowEngine(_fan_out(3), checkpoint=checkpoint)
+        await engine.async_run(SleepyOrchestrator(delay=0), max_parallel=max_parallel)
+        return checkpoint.threads
+
+    assert threading.get_ident() not in asyncio.run(_run(3))
+    assert asyncio.run(_run(1)) == {threading.get_ident()}
+
+
+def test_parallel_run_propagates_errors():
+    class FailingOrchestrator(SleepyOrchestrator):
+        async def handle_event(self, team, event):
+            if event["type"] == "n1":
+                raise RuntimeError("boom")
+            return await super().handle_event(team, event)
+
+    engine = GraphWorkflowEngine(_fan_out(3))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(engine.async_run(FailingOrchestrator(), max_parallel=3))
+
+
+def test_sync_run_supports_parallel_mode():
+    orch = SleepyOrchestrator(delay=0.01)
+
+    result = GraphWorkflowEngine(_fan_out(3)).run(orch, max_parallel=3)
+
+    assert [r["node"] for r in result["results"]] == ["start", "n0", "n1", "n2"]
+    assert orch.peak_total == 3
+
+
+def test_engine_rejects_cycle_after_start_node():
+    nodes = [
+        NodeDefinition(id=node_id, type="agent", label=node_id, config={})
+        for node_id in ("start", "a", "b", "c")
+    ]
+    edges = [
+        EdgeDefinition(source="start", target="a"),
+        EdgeDefinition(source="a", target="b"),
+        EdgeDefinition(source="b", target="a"),
+        EdgeDefinition(source="b", target="c"),
+    ]
+    wf = GraphWorkflowDefinition(name="loop", nodes=nodes, edges=edges)
+
+    with pytest.raises(ValueError, match="cycle; unreachable nodes: a, b, c"):
+        GraphWorkflowEngine(wf)
+
+
+def test_engine_runs_large_chain_in_order():
+    size = 2000
+    nodes = [
+        NodeDefinition(id=f"n{idx}", type="agent", label=f"n{idx}", config={})
+        for idx in range(size)
+    ]
+    edges = [
+        EdgeDefinition(source=f"n{idx}", target=f"n{idx + 1}")
+        for idx in range(size - 1)
+    ]
+    wf = GraphWorkflowDefinition(name="chain", nodes=nodes, edges=edges)
+
+    result = GraphWorkflowEngine(wf).run(None)
+
+    assert [r["node"] for r in result["results"]] == [f"n{idx}" for idx in range(size)]
+
+
+class EchoOrchestrator:
+    """Return each payload so downstream nodes can reference it."""
+
+    def __init__(self):
+        self.payloads = {}
+
+    def handle_event_sync(self, team, event):
+        self.payloads[event["type"]] = event["payload"]
+        if event["type"] == "capture":
+            lead = {"lead": {"email": "a@b.c"}, "ids": [7]}
+            return {"status": "done", "result": lead}
+        return {"status": "done", "result": dict(event["payload"])}
+
+    async def handle_event(self, team, event):
+        return self.handle_event_sync(team, event)
+
+
+def _data_flow(follow_payload):
+    nodes = [
+        NodeDefinition(
+            id="capture",
+            type="agent",
+            label="capture",
+            config={"team": "A", "event": {"type": "capture", "payload": {}}},
+        ),
+        NodeDefinition(
+            id="follow",
+            type="agent",
+            label="follow",
+            config={
+                "team": "A",
+                "event": {"type": "follow", "payload": follow_payload},
+            },
+        ),
+    ]
+    edges = [EdgeDefinition(source="capture", target="follow")]
+    return GraphWorkflowDefinition(name="flow", nodes=nodes, edges=edges)
+
+
+@pytest.mark.parametrize("parallel", [1, 4])
+def test_downstream_payload_references_upstream_result(parallel):
+    orch = EchoOrchestrator()
+    wf = _data_flow(
+        {
+            "lead": "{{ nodes.capture.result.lead }}",
+            "first_id": "{{ nodes.capture.result.ids.0 }}",
+            "subject": "Welcome {{ nodes.capture.result.lead.email }}",
+            "static": {"keep": [1, 2]},
+        }
+    )
+
+    result = GraphWorkflowEngine(wf).run(orch, max_parallel=parallel)
+
+    payload = orch.payloads["follow"]
+    upstream = result["results"][0]["result"]["result"]
+    assert payload["lead"] is upstream["lead"]
+    assert payload["first_id"] == 7
+    assert payload["subject"] == "Welcome a@b.c"
+    assert payload["static"] == {"keep": [1, 2]}
+
+
+def test_text_without_nodes_prefix_passes_through():
+    orch = EchoOrchestrator()
+    body = "Hi {{ first_name }}, see {{capture.result}} and {{{{ raw }}}}"
+    wf = _data_flow({"body": body, "greeting": "{{ first_name }}"})
+
+    GraphWorkflowEngine(wf).run(orch)
+
+    assert orch.payloads["follow"] == {"body": body, "greeting": "{{ first_name }}"}
+
+
+def test_reference_to_non_upstream_node_is_rejected():
+    wf = _data_flow({"x": "{{ nodes.follow.result }}"})
+    wf.nodes[0].config["event"]["payload"] = {"y": "{{ nodes.follow.result }}"}
+
+    with pytest.raises(ValueError, match="capture references results of nodes"):
+        GraphWorkflowEngine(wf)
+
+
+def test_unresolvable_reference_fails_at_dispatch():
+    wf = _data_flow({"x": "{{ nodes.capture.result.missing }}"})
+
+    with pytest.raises(ValueError, match="node follow: cannot resolve"):
+        GraphWorkflowEngine(wf).run(EchoOrchestrator())
@@ -0,0 +1,96 @@
+import asyncio
+
+from src.base_orchestrator import BaseOrchestrator
+from src.agents.base_agent import BaseAgent
+from src.memory_service.base import BaseMemoryService
+
+
+class RecordingMemory(BaseMemoryService):
+    def __init__(self):
+        self.calls = []
+
+    def store(self, key, payload):
+        self.calls.append(("store", key, 1))
+        return True
+
+    def store_many(self, key, payloads):
+        self.calls.append(("store_many", key, len(list(payloads))))
+        return True
+
+    def fetch(self, key, top_k=5):
+        return []
+
+
+class SlowEchoAgent(BaseAgent):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def run(self, payload):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        # later events finish first so ordering must come from the batch
+        await asyncio.sleep(0.01 / (1 + payload["n"]))
+        self.active -= 1
+        return payload["n"]
+
+
+class LimitedAgent(BaseAgent):
+    loop_budget = 1
+
+    def run(self, payload):
+        return "ok"
+
+
+def test_handle_events_preserves_input_order():
+    memory = RecordingMemory()
+    orch = BaseOrchestrator(memory=memory)
+    echo = SlowEchoAgent()
+    orch.agents = {"echo": echo, "limited": LimitedAgent()}
+
+    batch = [
+        {"type": "echo", "payload": {"n": 0}},
+        {"type": "unknown", "payload": {}},
+        {"type": "echo", "payload": {"n": 1}},
+        {"type": "limited", "payload": {}},
+        {"type": "echo", "payload": {"n": 2}},
+        {"type": "limited", "payload": {}},
+    ]
+    results = asyncio.run(orch.handle_events(batch, concurrency=2))
+
+    assert results == [
+        {"status": "done", "result": 0},
+        {"status": "ignored"},
+        {"status": "done", "result": 1},
+        {"status": "done", "result": "ok"},
+        {"status": "done", "result": 2},
+        {"status": "terminated", "reason": "loop_budget_exceeded"},
+    ]
+    assert echo.peak == 2
+    assert sorted(memory.calls) == [
+        ("store", "unknown", 1),
+        ("store_many", "echo", 3),
+        ("store_many", "limited", 2),
+    ]
+
+
+def test_handle_events_reports_invalid_payloads():
+    orch = BaseOrchestrator()
+    orch.agents = {"lead_capture": LimitedAgent()}
+
+    results = asyncio.run(
+        orch.handle_events(
+            [
+                {"type": "lead_capture", "payload": {"source": "web"}},
+                {"type": "lead_capture", "payload": {"form_data": {}, "source": "web"}},
+            ]
+        )
+    )
+
+    assert results == [
+        {
+            "status": "invalid",
+            "errors": [{"field": "form_data", "message": "field required"}],
+        },
+        {"status": "done", "result": "ok"},
+    ]
@@ -0,0 +1,138 @@
+import sqlite3
+import sys
+import time
+import types
+
+from src import db, history_writer
+from src.agents.base_agent import BaseAgent
+from src.config import settings
+from src.history_writer import HistoryWriter
+from src.solution_orchestrator import SolutionOrchestrator
+
+
+def _rows(count):
+    return [db.encode_event("demo", "x", {"i": i}, {"ok": True}) for i in range(count)]
+
+
+def test_writer_batches_rows_into_transactions(tmp_path):
+    path = tmp_path / "h.db"
+    writer = HistoryWriter(path, batch_size=100)
+
+    writer.submit_many(_rows(1000))
+    assert writer.flush(timeout=5)
+    assert writer.pending == 0
+    assert writer.batches <= 1000 // 2
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM event_history").fetchone()[0] == 1000
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    writer.close()
+
+
+def test_close_writes_pending_rows(tmp_path):
+    path = tmp_path / "h.db"
+    writer = HistoryWriter(path)
+    writer.submit_many(_rows(50))
+    writer.close()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM event_history").fetchone()[0] == 50
+
+
+def _metric(writer, name):
+    series = writer.metrics.snapshot()[name].series
+    return series[(("db", str(writer.path)),)]
+
+
+def test_unwritable_database_does_not_block_flush(tmp_path):
+    writer = HistoryWriter(tmp_path)  # a directory cannot be opened
+    writer.submit_many(_rows(3))
+
+    assert writer.flush(timeout=5)
+    assert writer.failed == 3
+    assert _metric(writer, "history_rows_failed") == 3
+    assert _metric(writer, "history_rows_pending") == 0
+    writer.close()
+
+
+def test_locked_database_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BUSY_TIMEOUT", 0.01)
+    path = tmp_path / "h.db"
+    writer = HistoryWriter(path, retries=6, retry_delay=0.02)
+    writer.submit(_rows(1)[0])
+    assert writer.flush(timeout=5)
+
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    writer.submit_many(_rows(5))
+    deadline = time.monotonic() + 5
+    while not writer.metrics.snapshot().get("history_write_retries"):
+        assert time.monotonic() < deadline, "writer never retried"
+        time.sleep(0.01)
+    blocker.execute("COMMIT")
+    blocker.close()
+
+    assert writer.flush(timeout=5)
+    assert writer.failed == 0
+    assert _metric(writer, "history_rows_written") == 6
+    assert _metric(writer, "history_write_retries") >= 1
+    writer.close()
+
+
+class EchoAgent(BaseAgent):
+    def run(self, payload):
+        return {"echo": dict(payload)}
+
+
+def test_orchestrator_history_is_written_behind(tmp_path):
+    import json
+
+    mod = types.ModuleType("src.agents.echo_agent")
+    mod.EchoAgent = EchoAgent
+    sys.modules["src.agents.echo_agent"] = mod
+    team = tmp_path / "team.json"
+    team.write_text(
+        json.dumps(
+            {
+                "provider": "autogen.agentchat.teams.RoundRobinGroupChat",
+                "responsibilities": ["echo_agent"],
+                "config": {"participants": [{"config": {"name": "echo_agent"}}]},
+            }
+        )
+    )
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/orch.db"
+    orch = SolutionOrchestrator({"demo": str(team)})
+
+    for idx in range(20):
+        orch.handle_event_sync("demo", {"type": "echo_agent", "payload": {"i": idx}})
+    assert orch.flush_history(timeout=5)
+
+    rows = db.fetch_history(limit=50)
+    assert len(rows) == 20
+    assert history_writer.get_writer().path == tmp_path / "orch.db"
+
+
+def test_full_queue_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    import asyncio
+
+    writer = HistoryWriter(tmp_path / "h.db", max_queue=1)
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)  # nothing drains
+    monkeypatch.setattr(history_writer, "get_writer", lambda path=None: writer)
+    writer.submit(_rows(1)[0])
+
+    class Team:
+        async def handle_event(self, event):
+            return {"ok": True}
+
+    orch = SolutionOrchestrator({})
+    orch.teams["demo"] = Team()
+    orch.persist_history = True
+
+    async def main():
+        event = {"type": "x", "payload": {}}
+        await asyncio.wait_for(orch.handle_event("demo", event), timeout=2)
+
+    asyncio.run(main())
+    assert writer.dropped == 1
+    assert writer.pending == 1
+    assert _metric(writer, "history_rows_dropped") == 1
@@ -1,21 +1,23 @@
+import importlib
 from pathlib import Path
+from types import ModuleType
 
 import pytest
 
-from src.tools import memory_service_server
-from src.tools.memory_service_server import StorePayload
 from src.memory_service.file import FileMemoryService
 
 
-def setup_mem(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    mem = FileMemoryService(tmp_path / "data.jsonl")
-    monkeypatch.setattr(memory_service_server, "svc", mem)
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    # The server opens MEMORY_FILE_PATH on import; keep it out of the repo.
+    monkeypatch.setenv("MEMORY_FILE_PATH", str(tmp_path / "import.jsonl"))
+    module = importlib.import_module("src.tools.memory_service_server")
+    monkeypatch.setattr(module, "svc", FileMemoryService(tmp_path / "data.jsonl"))
+    return module
 
 
-def test_store_and_fetch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    setup_mem(tmp_path, monkeypatch)
-
-    payload = StorePayload(key="a", data={"foo": 1})
-    memory_service_server.store(payload)
-    assert memory_service_server.fetch("a", 1) == [{"foo": 1}]
-    assert memory_service_server.fetch("missing", 5) == []
+def test_store_and_fetch(server: ModuleType) -> None:
+    payload = server.StorePayload(key="a", data={"foo": 1})
+    server.store(payload)
+    assert server.fetch("a", 1) == [{"foo": 1}]
+    assert server.fetch("missing", 5) == []
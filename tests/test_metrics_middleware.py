@@ -24,10 +24,10 @@ def test_metrics_middleware_enabled(monkeypatch):
         assert response.status_code == 200
 
         labels = {"path": "/activity", "method": "GET"}
-        instance.push_metric.assert_any_call("api_request_count", 1, labels)
-        args, kwargs = instance.push_metric.call_args_list[1]
+        instance.inc.assert_any_call("api_request_count", 1, labels)
+        args, kwargs = instance.observe.call_args
         assert args[0] == "api_request_latency_seconds"
-        assert kwargs["labels"] == labels
+        assert args[2] == labels
 
 
 def test_metrics_middleware_disabled(monkeypatch):
@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.tools.metrics_tools import metrics_registry
+from src.tools.metrics_tools.metrics_registry import MetricsRegistry
+
+
+def test_counters_gauges_and_histograms_render():
+    registry = MetricsRegistry("test")
+    registry.inc("requests", labels={"path": "/a"})
+    registry.inc("requests", 2, {"path": "/a"})
+    registry.set("queue_depth", 7)
+    registry.observe("latency", 0.2, buckets=(0.1, 0.5))
+    registry.observe("latency", 3, buckets=(0.1, 0.5))
+
+    text = registry.render()
+
+    assert "# TYPE requests counter\n" in text
+    assert 'requests{path="/a"} 3.0\n' in text
+    assert "queue_depth 7.0\n" in text
+    assert 'latency_bucket{le="0.1"} 0\n' in text
+    assert 'latency_bucket{le="0.5"} 1\n' in text
+    assert 'latency_bucket{le="+Inf"} 2\n' in text
+    assert "latency_sum 3.2\n" in text
+    assert "latency_count 2\n" in text
+
+
+def test_metric_kind_is_fixed_and_counters_only_increase():
+    registry = MetricsRegistry("test")
+    registry.inc("calls")
+
+    with pytest.raises(ValueError):
+        registry.set("calls", 1)
+    with pytest.raises(ValueError):
+        registry.inc("calls", -1)
+
+
+def test_render_all_labels_series_with_job(monkeypatch):
+    monkeypatch.setattr(metrics_registry, "_registries", {})
+    monkeypatch.setattr(metrics_registry.settings, "PROMETHEUS_PUSHGATEWAY", None)
+    metrics_registry.get_registry("api").inc("hits", labels={"path": 'x"y'})
+    metrics_registry.get_registry("worker").inc("hits")
+
+    text = metrics_registry.render_all()
+
+    assert text.count("# TYPE hits counter") == 1
+    assert 'hits{job="api",path="x\\"y"} 1.0' in text
+    assert 'hits{job="worker"} 1.0' in text
+
+
+def test_flusher_pushes_in_background():
+    received = []
+    pushed = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_PUT(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, body.decode()))
+            self.send_response(200)
+            self.end_headers()
+            pushed.set()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    registry = MetricsRegistry("flush job")
+    try:
+        registry.inc("events")
+        registry.start_flusher(f"127.0.0.1:{server.server_port}", interval=0.05)
+        assert pushed.wait(5)
+    finally:
+        registry.stop_flusher(flush=False)
+        server.shutdown()
+
+    path, body = received[0]
+    assert path == "/metrics/job/flush%20job"
+    assert "events 1.0" in body
@@ -148,3 +148,18 @@ def test_unknown_event_type(monkeypatch):
     assert res == {"status": "ignored"}
     assert store_calls == {"key": "unknown", "payload": payload}
     assert called == []
+
+
+def test_planning_callbacks_publish_on_sync_bus(monkeypatch):
+    import asyncio
+    from agentic_core import EventBus
+
+    monkeypatch.setattr("src.tools.scheduler_tool.SchedulerTool", lambda: None)
+    orch = Orchestrator("http://memory")
+    orch.bus = EventBus()
+    seen = []
+    orch.bus.subscribe("Email.SendKickoff", seen.append)
+
+    asyncio.run(orch._on_materials_resolved({"project_id": "p1"}))
+
+    assert seen == [{"project_id": "p1"}]
@@ -69,3 +69,73 @@ def test_missing_goal(tmp_path):
 
     result = orch.execute_goal("missing")
     assert result["status"] == "unknown_goal"
+
+
+def test_async_goal_runs_parallel_groups_and_streams_progress(tmp_path):
+    import asyncio
+
+    _register_agents()
+    team_a = _write_team(tmp_path, "dummy_agent_a")
+    team_b = _write_team(tmp_path, "dummy_agent_b")
+    plans = {
+        "demo": [
+            {"team": "A", "event": {"type": "dummy_agent_a", "payload": {"n": 0}}},
+            {
+                "parallel": [
+                    {"team": "A", "event": {"type": "slow", "payload": {"n": 1}}},
+                    {"team": "B", "event": {"type": "slow", "payload": {"n": 2}}},
+                ]
+            },
+        ]
+    }
+    orch = SolutionOrchestrator(
+        {"A": str(team_a), "B": str(team_b)},
+        planner_plans=plans,
+        persist_history=False,
+    )
+    original = orch.handle_event
+    started = []
+    barrier = {}
+
+    async def handle_event(team, event):
+        if event["type"] == "slow":
+            # Only returns once both parallel steps are running; a sequential
+            # run times out here.
+            started.append(event["payload"]["n"])
+            if len(started) == 2:
+                barrier["both_started"].set()
+            await asyncio.wait_for(barrier["both_started"].wait(), timeout=5)
+            return {"status": "done", "n": event["payload"]["n"]}
+        return await original(team, event)
+
+    orch.handle_event = handle_event
+
+    async def _run():
+        barrier["both_started"] = asyncio.Event()
+        planner_q = orch.subscribe("planner")
+        team_b_q = orch.subscribe("B")
+        result = await orch.aexecute_goal("demo")
+        drained = []
+        while not planner_q.empty():
+            drained.append(planner_q.get_nowait())
+        return result, drained, team_b_q.qsize()
+
+    result, progress, team_b_messages = asyncio.run(_run())
+
+    assert result["status"] == "complete"
+    assert result["results"][0]["result"]["result"]["handled_by"] == "A"
+    assert [r["result"]["n"] for r in result["results"][1]["parallel"]] == [1, 2]
+    assert sorted(started) == [1, 2]
+    plan_msgs = [m for m in progress if m["type"] == "plan_progress"]
+    assert [(m["step"], m["status"]) for m in plan_msgs[:2]] == [
+        (1, "started"),
+        (1, "completed"),
+    ]
+    assert sorted(m["status"] for m in plan_msgs[2:]) == [
+        "completed",
+        "completed",
+        "started",
+        "started",
+    ]
+    assert {m.get("branch") for m in plan_msgs[2:]} == {0, 1}
+    assert team_b_messages == 2
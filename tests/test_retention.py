@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import cli, db, retention
+from src.config import settings
+
+NOW = datetime(2024, 5, 15, 12, 0)
+
+
+def _insert(moments):
+    conn = db.get_connection()
+    rows = []
+    for idx, moment in enumerate(moments):
+        ts = (moment - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+        rows.append(
+            ("demo", "x", json.dumps({"i": idx}), None, moment.isoformat(), ts, None)
+        )
+    with conn:
+        db.write_events(conn, rows)
+
+
+@pytest.fixture
+def history(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    _insert(
+        [
+            datetime(2024, 2, 20),
+            datetime(2024, 3, 1),
+            datetime(2024, 3, 31, 23, 59),
+            datetime(2024, 4, 20),
+            datetime(2024, 5, 10),
+        ]
+    )
+    return tmp_path
+
+
+def test_expired_rows_are_archived_by_month(history):
+    archive_dir = history / "archive"
+    report = retention.apply_retention(
+        ttl_days=61, archive_dir=archive_dir, now=NOW, batch_size=1
+    )
+
+    assert report.exported == {"2024-02": 1, "2024-03": 1}
+    assert report.deleted == 2
+    remaining = [row["payload"]["i"] for row in db.fetch_history()]
+    assert remaining == [4, 3, 2]
+
+    # A later run appends the rest of the month to the same archive.
+    report = retention.apply_retention(ttl_days=30, archive_dir=archive_dir, now=NOW)
+    assert report.exported == {"2024-03": 1}
+    march = retention.archive_path(archive_dir, "2024-03")
+    march = list(retention.iter_archive(march))
+    assert [event["payload"] for event in march] == [{"i": 1}, {"i": 2}]
+    assert march[0]["result"] is None
+    assert march[0]["timestamp"] == "2024-03-01T00:00:00"
+
+    report = retention.apply_retention(ttl_days=1, archive_dir=archive_dir, now=NOW)
+    assert report.exported == {"2024-04": 1, "2024-05": 1}
+    report = retention.apply_retention(
+        ttl_days=1, archive_dir=archive_dir, now=NOW + timedelta(days=30)
+    )
+    assert report.exported == {} and report.deleted == 0
+    assert db.fetch_history() == []
+    assert sorted(p.name for p in archive_dir.iterdir()) == [
+        "event_history-2024-02.jsonl.gz",
+        "event_history-2024-03.jsonl.gz",
+        "event_history-2024-04.jsonl.gz",
+        "event_history-2024-05.jsonl.gz",
+    ]
+
+
+def test_dry_run_and_archive_ttl(history):
+    archive_dir = history / "archive"
+    report = retention.apply_retention(
+        ttl_days=30, archive_dir=archive_dir, now=NOW, dry_run=True
+    )
+    assert report.exported == {"2024-02": 1, "2024-03": 2}
+    assert len(db.fetch_history()) == 5
+    assert not archive_dir.exists()
+
+    retention.apply_retention(ttl_days=30, archive_dir=archive_dir, now=NOW)
+    report = retention.apply_retention(
+        ttl_days=30, archive_dir=archive_dir, archive_ttl_days=60, now=NOW
+    )
+    assert report.pruned == ["event_history-2024-02.jsonl.gz"]
+
+
+def test_vacuum_after_large_delete(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    _insert([datetime(2024, 1, 1) + timedelta(seconds=i) for i in range(5000)])
+    _insert([NOW])
+    db.get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    size = (tmp_path / "t.db").stat().st_size
+
+    report = retention.apply_retention(ttl_days=7, archive=False, now=NOW)
+
+    assert report.deleted == 5000 and report.archives == []
+    assert report.vacuumed
+    assert (tmp_path / "t.db").stat().st_size < size
+    assert len(db.fetch_history()) == 1
+
+
+def test_cli_history_retention(history, capsys):
+    settings.HISTORY_TTL_DAYS = None
+    with pytest.raises(SystemExit):
+        cli.main(["history-retention"])
+
+    cli.main(
+        [
+            "history-retention",
+            "--ttl-days",
+            "0",
+            "--archive-dir",
+            str(history / "archive"),
+            "--dry-run",
+        ]
+    )
+    report = json.loads(capsys.readouterr().out)
+    assert report["dry_run"] is True
+    assert sum(report["exported"].values()) == 5
+
+
+def test_compressed_rows_are_archived_as_json(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/t.db"
+    db.init_db()
+    settings.HISTORY_COMPRESSION = "zlib"
+    try:
+        db.insert_event(
+            "demo", "x", {"text": "a" * 500}, {"ok": True}, duration_ms=12.5
+        )
+    finally:
+        settings.HISTORY_COMPRESSION = None
+
+    report = retention.apply_retention(
+        ttl_days=0, archive_dir=tmp_path / "archive", now=datetime.utcnow()
+    )
+
+    (path,) = report.archives
+    (event,) = retention.iter_archive(path)
+    assert event["payload"] == {"text": "a" * 500}
+    assert event["result"] == {"ok": True}
+    assert event["duration_ms"] == 12.5
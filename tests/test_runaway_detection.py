@@ -30,7 +30,8 @@ def test_token_budget_termination(monkeypatch):
     orch = BaseOrchestrator()
     orch.agents = {"budget": BudgetAgent()}
 
-    res = orch.handle_event_sync({"type": "budget", "payload": "x" * 20})
+    payload = "please draft a follow up email for every lead captured this week"
+    res = orch.handle_event_sync({"type": "budget", "payload": payload})
 
     assert res["status"] == "terminated"
     assert res["reason"] == "token_budget_exceeded"
@@ -58,6 +59,8 @@ def test_usage_metrics(monkeypatch):
         def push_metric(self, name, value, labels=None):
             pushed.append((name, value, labels))
 
+        inc = observe = push_metric
+
     monkeypatch.setattr("src.base_orchestrator.PrometheusPusher", DummyPusher)
     # Force metrics even without environment variable
     monkeypatch.setattr(
@@ -71,3 +74,4 @@ def test_usage_metrics(monkeypatch):
 
     assert any(m[0] == "agent_tokens_used" for m in pushed)
     assert any(m[0] == "agent_loop_count" for m in pushed)
+    assert any(m[0] == "agent_run_seconds" for m in pushed)
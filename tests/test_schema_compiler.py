@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.base_orchestrator import BaseOrchestrator
+from src.events import ChatbotEvent, LeadCaptureEvent, SegmentationEvent
+from src.schema_compiler import EventValidationError, compile_schema, get_validator
+
+
+def test_compiled_validator_builds_slotted_event():
+    validate = compile_schema(LeadCaptureEvent)
+    payload = {"form_data": {"email": "a@b.c"}, "source": "web"}
+
+    event = validate(payload)
+
+    assert event == LeadCaptureEvent(**payload)
+    assert not hasattr(event, "__dict__")
+
+
+def test_reports_every_invalid_field():
+    validate = compile_schema(SegmentationEvent)
+
+    with pytest.raises(EventValidationError) as info:
+        validate({"segments": [{}, 3], "budget_per_segment": "many", "x": 1})
+
+    assert info.value.errors == [
+        ("segments[1]", "expected object, got int"),
+        ("budget_per_segment", "expected int, got 'many'"),
+        ("x", "unexpected field"),
+    ]
+    assert isinstance(info.value, TypeError)
+
+
+def test_coerces_scalars_and_tuples():
+    validate = compile_schema(SegmentationEvent)
+
+    event = validate({"segments": ({"name": "a"},), "budget_per_segment": "5"})
+
+    assert event.segments == [{"name": "a"}]
+    assert event.budget_per_segment == 5
+
+
+def test_rejects_non_mapping_payload():
+    with pytest.raises(EventValidationError) as info:
+        compile_schema(ChatbotEvent)(["hi"])
+
+    assert info.value.errors == [("", "expected an object, got list")]
+
+
+def test_defaults_optional_fields_and_extra_policy():
+    @dataclass(frozen=True)
+    class Ping:
+        target: str
+        retries: Optional[int] = None
+        tags: List[str] = field(default_factory=list)
+
+    strict = compile_schema(Ping)
+    lenient = compile_schema(Ping, extra="ignore")
+
+    assert strict({"target": "a"}) == Ping("a")
+    assert strict({"target": "a", "retries": "2", "tags": [1]}) == Ping("a", 2, ["1"])
+    assert lenient({"target": "a", "other": True}) == Ping("a")
+    with pytest.raises(EventValidationError):
+        strict({"target": "a", "other": True})
+
+
+def test_validators_are_cached():
+    assert get_validator(ChatbotEvent) is get_validator(ChatbotEvent)
+
+
+def test_handle_event_returns_field_errors():
+    class Agent:
+        def run(self, payload):
+            return payload
+
+    orch = BaseOrchestrator()
+    orch.agents = {"lead_capture": Agent()}
+
+    res = orch.handle_event_sync(
+        {"type": "lead_capture", "payload": {"form_data": [], "source": "web"}}
+    )
+
+    assert res == {
+        "status": "invalid",
+        "errors": [{"field": "form_data", "message": "expected object, got list"}],
+    }
+
+
+@dataclass(frozen=True)
+class Address:
+    city: str
+
+
+@dataclass(frozen=True)
+class Shipment:
+    order_id: str
+    address: Address
+    billing: Optional[Address] = None
+    window: Tuple[int, int] = (0, 0)
+    placed_at: Optional[datetime] = None
+
+
+def test_unsupported_field_types_pass_through():
+    validate = compile_schema(Shipment)
+    home = Address("Oslo")
+
+    assert validate({"order_id": 7, "address": home, "billing": home}) == Shipment(
+        "7", home, home
+    )
+    with pytest.raises(EventValidationError):
+        validate({"address": home})
+
+
+def test_nested_dataclass_schema_handled_by_orchestrator():
+    class Agent:
+        def run(self, payload):
+            return {"city": payload.billing.city}
+
+    orch = BaseOrchestrator()
+    orch.event_schemas["shipment"] = Shipment
+    orch.agents = {"shipment": Agent()}
+
+    payload = {"order_id": "o1", "address": None, "billing": Address("Oslo")}
+    res = orch.handle_event_sync({"type": "shipment", "payload": payload})
+
+    assert res["status"] == "done"
+    assert res["result"] == {"city": "Oslo"}
+
+
+def test_unresolvable_annotations_fall_back_to_constructor():
+    @dataclass
+    class Note:
+        body: "Missing"  # noqa: F821
+
+    assert get_validator(Note)({"body": 1}) == Note(1)
@@ -67,3 +67,54 @@ def test_delegate_unknown_skill(tmp_path):
 
     res = orch.delegate_by_skill_sync("missing", {"v": 3})
     assert res["status"] == "unhandled"
+
+
+def test_skill_index_tracks_registration():
+    from src.base_orchestrator import BaseOrchestrator
+
+    orch = BaseOrchestrator()
+    orch.agents = {"foo": FooAgent()}
+    assert orch.agents.with_skill("common") == ["foo"]
+
+    orch.agents["bar"] = BarAgent()
+    assert orch.agents.with_skill("common") == ["foo", "bar"]
+
+    del orch.agents["foo"]
+    assert orch.agents.with_skill("common") == ["bar"]
+    assert orch.agents.with_skill("foo") == []
+    assert orch.get_agent_by_skill("foo") is None
+
+
+def test_round_robin_skill_policy():
+    from src.base_orchestrator import BaseOrchestrator
+
+    orch = BaseOrchestrator(skill_policy="round_robin")
+    orch.agents = {"foo": FooAgent(), "bar": BarAgent()}
+
+    picked = [
+        orch.delegate_by_skill_sync("common", {})["result"]["agent"] for _ in range(4)
+    ]
+    assert picked == ["foo", "bar", "foo", "bar"]
+
+
+def test_least_in_flight_skill_policy():
+    from src.base_orchestrator import BaseOrchestrator
+
+    orch = BaseOrchestrator(skill_policy="least_in_flight")
+    orch.agents = {"foo": FooAgent(), "bar": BarAgent()}
+    orch.skill_selector.started("foo")
+
+    assert orch.get_agent_by_skill("common").run({})["agent"] == "bar"
+
+
+def test_lowest_latency_skill_policy():
+    from src.base_orchestrator import BaseOrchestrator
+
+    orch = BaseOrchestrator(skill_policy="lowest_latency")
+    orch.agents = {"foo": FooAgent(), "bar": BarAgent()}
+    orch.skill_selector.finished("foo", 0.5)
+    orch.skill_selector.finished("bar", 0.1)
+
+    assert [
+        orch.delegate_by_skill_sync("common", {})["result"]["agent"] for _ in range(2)
+    ] == ["bar", "bar"]
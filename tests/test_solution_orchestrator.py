@@ -157,3 +157,25 @@ def test_async_context_closes_memory(tmp_path):
 
     asyncio.run(_run())
     assert mem.closed is True
+
+
+def test_sync_events_reach_subscribers_on_another_loop(tmp_path):
+    import asyncio
+
+    team = _write_team(tmp_path, "dummy_agent_a")
+    mod_a = types.ModuleType("src.agents.dummy_agent_a")
+    mod_a.DummyAgentA = DummyAgentA
+    sys.modules["src.agents.dummy_agent_a"] = mod_a
+    orch = SolutionOrchestrator({"A": str(team)}, persist_history=False)
+
+    async def main():
+        queue = orch.subscribe("A")
+        # The sync wrapper runs on the shared runtime loop in another thread.
+        await asyncio.to_thread(
+            orch.handle_event_sync, "A", {"type": "dummy_agent_a", "payload": {}}
+        )
+        return await asyncio.wait_for(queue.get(), 1.0)
+
+    message = asyncio.run(main())
+    assert message["type"] == "activity"
+    assert message["result"]["result"]["handled_by"] == "A"
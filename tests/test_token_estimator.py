@@ -0,0 +1,85 @@
+from src.base_orchestrator import BaseOrchestrator
+from src.events import ChatbotEvent
+from src.token_estimator import BPEApproxEstimator, LengthEstimator
+
+
+def test_estimates_words_not_characters():
+    est = BPEApproxEstimator()
+    text = "Hello world, this is a short sentence."
+
+    assert est.estimate(text) == 9
+    assert est.estimate(text) < LengthEstimator().estimate(text)
+
+
+def test_long_words_and_numbers_split():
+    est = BPEApproxEstimator()
+
+    assert est.estimate("internationalization") == 4
+    assert est.estimate("1234567") == 3
+
+
+def test_structured_payloads_are_walked():
+    est = BPEApproxEstimator()
+    event = ChatbotEvent(messages=[{"role": "user", "content": "hi there"}])
+
+    # field name + role/content pairs + separators
+    assert est.estimate(event) == est.estimate({"messages": event.messages})
+
+
+def test_message_lists_only_count_new_messages():
+    est = BPEApproxEstimator()
+    messages = [{"role": "user", "content": f"message number {n}"} for n in range(10)]
+
+    first = est.estimate(messages)
+    misses = est.misses
+    messages.append({"role": "assistant", "content": "a brand new reply"})
+    second = est.estimate(messages)
+
+    assert second > first
+    assert est.misses == misses + 1
+    assert est.hits >= 10
+
+
+def test_repeated_messages_skip_tokenising(monkeypatch):
+    from src import token_estimator
+
+    est = BPEApproxEstimator()
+    messages = [{"role": "user", "content": "word " * 200} for _ in range(5)]
+    messages.append({"role": "tool", "content": {"rows": [1, 2, 3]}})
+    first = est.estimate_items(messages)
+
+    def fail(*args):
+        raise AssertionError("content was processed again")
+
+    monkeypatch.setattr(est, "_count", fail)
+    assert est.estimate_items(messages) == first
+
+    # Flat messages are keyed without freezing; structured ones still are.
+    frozen = []
+    freeze = token_estimator._freeze
+    monkeypatch.setattr(
+        token_estimator, "_freeze", lambda value: frozen.append(value) or freeze(value)
+    )
+    assert est.estimate_items(messages) == first
+    assert [value for value in frozen if isinstance(value, dict)] == [
+        messages[-1],
+        messages[-1]["content"],
+    ]
+
+
+def test_cache_is_bounded():
+    est = BPEApproxEstimator(cache_size=2, min_cached_length=1)
+    for word in ("alpha", "beta", "gamma"):
+        est.estimate(word)
+
+    assert est.cache_info()["size"] == 2
+
+
+def test_orchestrator_uses_custom_estimator():
+    class FixedEstimator:
+        def estimate(self, payload):
+            return 42
+
+    orch = BaseOrchestrator(token_estimator=FixedEstimator())
+
+    assert orch._estimate_tokens({"anything": "here"}) == 42
@@ -1,6 +1,9 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
-from agentic_core import run_maybe_async, run_sync
+import pytest
+
+from agentic_core import get_runtime, run_maybe_async, run_sync
 
 
 async def _async_add(a, b):
@@ -29,3 +32,37 @@ def test_run_sync_executes_async_function():
 
     result = run_sync(coro())
     assert result == "done"
+
+
+def test_run_sync_reuses_one_loop_across_threads():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = run_sync(current_loop())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        loops = list(pool.map(lambda _: run_sync(current_loop()), range(32)))
+
+    assert all(loop is first for loop in loops)
+    assert first is get_runtime().loop
+
+
+def test_run_sync_works_inside_running_loop_and_propagates_errors():
+    async def boom():
+        raise ValueError("bad")
+
+    async def main():
+        # A sync helper called from async code no longer hits "asyncio.run()
+        # cannot be called from a running event loop".
+        return run_sync(_async_add(2, 3))
+
+    assert asyncio.run(main()) == 5
+    with pytest.raises(ValueError, match="bad"):
+        run_sync(boom())
+
+
+def test_run_sync_refuses_to_block_the_runtime_loop():
+    async def nested():
+        return run_sync(_async_add(1, 1))
+
+    with pytest.raises(RuntimeError, match="cannot block the runtime loop"):
+        run_sync(nested())
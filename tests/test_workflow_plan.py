@@ -0,0 +1,131 @@
+import json
+import os
+
+import pytest
+
+from src.events import EventEnvelope
+from src.workflows import graph
+from src.workflows.graph import (
+    EdgeDefinition,
+    GraphWorkflowDefinition,
+    GraphWorkflowEngine,
+    NodeDefinition,
+    compile_workflow,
+    load_plan,
+)
+
+
+def _diamond():
+    nodes = [
+        NodeDefinition(
+            id=node_id,
+            type="agent",
+            label=node_id,
+            config={"team": "T", "event": {"type": node_id, "payload": {"n": 1}}},
+        )
+        for node_id in ("a", "b", "c", "d")
+    ]
+    edges = [
+        EdgeDefinition(source="a", target="b"),
+        EdgeDefinition(source="a", target="c"),
+        EdgeDefinition(source="b", target="d"),
+        EdgeDefinition(source="c", target="d"),
+    ]
+    return GraphWorkflowDefinition(name="diamond", nodes=nodes, edges=edges)
+
+
+class RecordingOrchestrator:
+    def __init__(self):
+        self.events = []
+
+    def handle_event_sync(self, team, event):
+        self.events.append(event)
+        return {"status": "done"}
+
+
+def test_compiled_plan_is_immutable_and_reusable():
+    definition = _diamond()
+    plan = compile_workflow(definition)
+
+    assert plan.levels == (("a",), ("b", "c"), ("d",))
+    assert plan.successors["a"] == ("b", "c")
+    assert plan.roots == ("a",)
+    team, event = plan.calls["d"]
+    assert team == "T" and isinstance(event, EventEnvelope)
+    with pytest.raises(TypeError):
+        plan.indegree["d"] = 0
+
+    # Later edits to the definition do not leak into the plan.
+    definition.nodes[0].config["team"] = "changed"
+    assert plan.calls["a"][0] == "T"
+
+    orch = RecordingOrchestrator()
+    for _ in range(2):
+        result = GraphWorkflowEngine(plan).run(orch)
+        assert [r["node"] for r in result["results"]] == ["a", "b", "c", "d"]
+    # Every run gets its own payload, so handlers cannot leak state.
+    assert orch.events[0] == orch.events[4]
+    assert orch.events[0].raw_payload() is not orch.events[4].raw_payload()
+
+
+def test_cached_plan_payloads_are_not_shared_between_runs(tmp_path):
+    graph.clear_plan_cache()
+    definition = _diamond()
+    definition.nodes[0].config["event"]["payload"] = {"lead": {"tags": ["new"]}}
+    definition.nodes[1].config["event"]["payload"] = {
+        "lead": {"tags": ["new"]},
+        "source": "{{ nodes.a.status }}",
+    }
+    path = tmp_path / "wf.json"
+    path.write_text(json.dumps(definition.to_dict()))
+
+    class MutatingOrchestrator(RecordingOrchestrator):
+        def handle_event_sync(self, team, event):
+            if "lead" in event.raw_payload():
+                event.raw_payload()["lead"]["tags"].append("seen")
+            return super().handle_event_sync(team, event)
+
+    for _ in range(2):
+        orch = MutatingOrchestrator()
+        GraphWorkflowEngine(load_plan(path)).run(orch)
+        assert orch.events[0].raw_payload()["lead"]["tags"] == ["new", "seen"]
+        assert orch.events[1].raw_payload() == {
+            "lead": {"tags": ["new", "seen"]},
+            "source": "done",
+        }
+
+
+def test_load_plan_caches_by_mtime_and_content(tmp_path, monkeypatch):
+    graph.clear_plan_cache()
+    path = tmp_path / "wf.json"
+    path.write_text(json.dumps(_diamond().to_dict()))
+
+    parsed = []
+    original = GraphWorkflowDefinition.from_dict.__func__
+
+    def counting_from_dict(cls, data):
+        parsed.append(data["name"])
+        return original(cls, data)
+
+    monkeypatch.setattr(
+        GraphWorkflowDefinition, "from_dict", classmethod(counting_from_dict)
+    )
+
+    first = load_plan(path)
+    assert load_plan(str(path)) is first
+    assert parsed == ["diamond"]
+
+    # Touching the file without changing it only costs a hash.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_plan(path) is first
+    assert parsed == ["diamond"]
+
+    data = _diamond().to_dict()
+    data["name"] = "renamed"
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    second = load_plan(path)
+    assert second is not first
+    assert second.definition.name == "renamed"
+    assert parsed == ["diamond", "renamed"]
@@ -0,0 +1,101 @@
+import pytest
+
+from src import workflow_runs
+from src.config import settings
+from src.solution_orchestrator import SolutionOrchestrator
+from src.workflows.graph import (
+    EdgeDefinition,
+    GraphWorkflowDefinition,
+    NodeDefinition,
+)
+
+
+def _chain(*ids):
+    nodes = [
+        NodeDefinition(
+            id=node_id,
+            type="agent",
+            label=node_id,
+            config={"team": "crm", "event": {"type": node_id, "payload": {}}},
+        )
+        for node_id in ids
+    ]
+    edges = [EdgeDefinition(source=a, target=b) for a, b in zip(ids, ids[1:])]
+    return GraphWorkflowDefinition(name="chain", nodes=nodes, edges=edges)
+
+
+@pytest.fixture
+def orch(tmp_path):
+    settings.DB_CONNECTION_STRING = f"sqlite:///{tmp_path}/runs.db"
+    orch = SolutionOrchestrator({}, persist_history=False)
+    orch.calls = []
+    orch.fail_on = set()
+
+    def handle_event_sync(team, event):
+        orch.calls.append(event["type"])
+        if event["type"] in orch.fail_on:
+            raise RuntimeError(f"{event['type']} crashed")
+        return {"status": "done", "node": event["type"]}
+
+    orch.handle_event_sync = handle_event_sync
+    return orch
+
+
+def test_interrupted_run_resumes_without_repeating_completed_nodes(orch):
+    orch.fail_on = {"c"}
+    with pytest.raises(RuntimeError, match="c crashed"):
+        orch.execute_workflow(_chain("a", "b", "c", "d"), run_id="run-1")
+
+    run = workflow_runs.get_run("run-1")
+    assert run["status"] == "failed"
+    assert {n: s["status"] for n, s in run["nodes"].items()} == {
+        "a": "completed",
+        "b": "completed",
+        "c": "failed",
+    }
+
+    orch.fail_on = set()
+    orch.calls.clear()
+    result = orch.resume_workflow("run-1")
+
+    assert orch.calls == ["c", "d"]
+    assert result["run_id"] == "run-1"
+    assert [r["node"] for r in result["results"]] == ["a", "b", "c", "d"]
+    assert result["results"][0]["result"] == {"status": "done", "node": "a"}
+
+    run = workflow_runs.get_run("run-1")
+    assert run["status"] == "complete"
+    assert run["nodes"]["c"]["attempts"] == 2
+    assert run["nodes"]["a"]["attempts"] == 1
+
+
+def test_checkpoint_assigns_run_id_and_parallel_resume(orch):
+    result = orch.execute_workflow(_chain("a", "b"), checkpoint=True)
+    run_id = result["run_id"]
+
+    orch.calls.clear()
+    again = orch.execute_workflow(run_id=run_id, max_parallel=4)
+
+    assert orch.calls == []
+    assert again["results"] == result["results"]
+    assert workflow_runs.list_runs()[0]["id"] == run_id
+
+
+def test_resume_rejects_unknown_run_and_changed_definition(orch):
+    with pytest.raises(KeyError):
+        orch.resume_workflow("missing")
+
+    orch.execute_workflow(_chain("a", "b"), run_id="run-2")
+    with pytest.raises(ValueError, match="does not match"):
+        orch.execute_workflow(_chain("a", "b", "c"), run_id="run-2")
+
+
+def test_tables_are_created_once_per_connection(orch, monkeypatch):
+    run_id = workflow_runs.create_run(_chain("a"))
+
+    def create_tables(conn):
+        raise AssertionError("DDL ran again")
+
+    monkeypatch.setattr(workflow_runs, "_create_tables", create_tables)
+    assert workflow_runs.get_run(run_id)["status"] == "running"
+    assert workflow_runs.list_runs()[0]["id"] == run_id